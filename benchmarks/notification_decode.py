@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark for ``Notification.decode``.
+
+Reports the per-update decode cost of building models through their
+validating descriptors and constructors (``cls(...)``) against the trusted construction
+``decode`` uses, for notifications of increasing size::
+
+    python benchmarks/notification_decode.py [--number N]
+"""
+
+import argparse
+import timeit
+
+from gnmi.models.notification import Notification
+from gnmi.models.path import Path, PathElem
+from gnmi.models.update import Update
+from gnmi.models.value import value_factory
+from gnmi.proto import gnmi_pb2 as pb
+
+
+def path_decode(v: pb.Path) -> Path:
+    return Path([PathElem(e.name, e.key) for e in v.elem], v.origin, v.target)
+
+
+def descriptor_decode(v: pb.Notification) -> Notification:
+    # The pre-fast-path implementation, kept as the baseline.
+    if v.HasField("prefix"):
+        prefix = path_decode(v.prefix)
+    else:
+        prefix = None
+
+    return Notification(
+        timestamp=v.timestamp,
+        prefix=prefix,
+        updates=[
+            Update(
+                path=path_decode(u.path),
+                value=value_factory(u.val),
+                duplicates=u.duplicates,
+            )
+            for u in v.update
+        ],
+        deletes=[path_decode(d) for d in v.delete],
+    )
+
+
+def sample(size: int) -> pb.Notification:
+    return pb.Notification(
+        timestamp=1,
+        prefix=Path.from_str("/interfaces/interface[name=Ethernet1]").encode(),
+        update=[
+            pb.Update(
+                path=Path.from_str(f"state/counters/c{i}").encode(),
+                val=pb.TypedValue(uint_val=i),
+            )
+            for i in range(size)
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'updates':<10}{'descriptor ns':>16}{'trusted ns':>14}{'speedup':>10}")
+    for size in (1, 10, 100):
+        msg = sample(size)
+        count = args.number * size
+        before = min(
+            timeit.repeat(lambda msg=msg: descriptor_decode(msg), number=args.number)
+        )
+        after = min(
+            timeit.repeat(lambda msg=msg: Notification.decode(msg), number=args.number)
+        )
+        print(
+            f"{size:<10}{before / count * 1e9:>16.0f}{after / count * 1e9:>14.0f}"
+            f"{before / after:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark for building large ``SetRequest`` messages.
+
+Compares encoding a bulk update (e.g. a long ACL) through the
+``SetRequest`` model with :class:`SetRequestBuilder`, with absolute paths
+and relative to a shared parent::
+
+    python benchmarks/set_request_build.py [--entries N]
+"""
+
+import argparse
+import timeit
+
+from gnmi.models.set import SetRequest, SetRequestBuilder
+
+PARENT = "/acl/acl-sets/acl-set[name=EDGE][type=ACL_IPV4]/acl-entries"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=40_000)
+    args = parser.parse_args()
+
+    relative = [
+        (f"acl-entry[sequence-id={i}]/config/description", f"entry {i}")
+        for i in range(args.entries)
+    ]
+    absolute = [(f"{PARENT}/{p}", v) for p, v in relative]
+
+    def model():
+        return SetRequest(updates=absolute).encode()
+
+    def builder():
+        return SetRequestBuilder().update(absolute).build()
+
+    def scoped():
+        b = SetRequestBuilder()
+        b.under(PARENT).update(relative)
+        return b.build()
+
+    assert model() == builder() == scoped()
+
+    base = None
+    print(f"{'method':<10}{'total ms':>12}{'speedup':>10}")
+    for name, fn in (("model", model), ("builder", builder), ("under", scoped)):
+        t = min(timeit.repeat(fn, number=1, repeat=3))
+        base = base or t
+        print(f"{name:<10}{t * 1e3:>12.0f}{base / t:>9.2f}x")
+    print(f"request size: {SetRequestBuilder().update(absolute).size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark for ``Value.decode``.
+
+Compares the per-type decode cost of the ``WhichOneof`` dispatch table
+against the sequential ``HasField`` chain it replaced::
+
+    python benchmarks/value_decode.py [--number N]
+"""
+
+import argparse
+import json
+import timeit
+from decimal import Decimal
+
+from gnmi.models.value import Value, ValueType
+from gnmi.proto import gnmi_pb2 as pb
+
+
+def hasfield_decode(v: pb.TypedValue) -> Value:
+    # The pre-dispatch-table implementation, kept as the baseline.
+    if v.HasField("any_val"):
+        return Value(v.any_val, ValueType.ANY_VAL)
+    elif v.HasField("ascii_val"):
+        return Value(v.ascii_val, ValueType.ASCII_VAL)
+    elif v.HasField("bool_val"):
+        return Value(v.bool_val, ValueType.BOOL_VAL)
+    elif v.HasField("bytes_val"):
+        return Value(v.bytes_val, ValueType.BYTES_VAL)
+    elif v.HasField("decimal_val"):
+        val = Decimal(v.decimal_val.digits / 10**v.decimal_val.precision)
+        return Value(val, ValueType.DECIMAL_VAL)
+    elif v.HasField("double_val"):
+        return Value(v.double_val, ValueType.DOUBLE_VAL)
+    elif v.HasField("float_val"):
+        return Value(v.float_val, ValueType.FLOAT_VAL)
+    elif v.HasField("int_val"):
+        return Value(v.int_val, ValueType.INT_VAL)
+    elif v.HasField("json_ietf_val"):
+        return Value(json.loads(v.json_ietf_val), ValueType.JSON_IETF_VAL)
+    elif v.HasField("json_val"):
+        return Value(json.loads(v.json_val), ValueType.JSON_VAL)
+    elif v.HasField("leaflist_val"):
+        return Value(
+            [hasfield_decode(e) for e in v.leaflist_val.element],
+            ValueType.LEAFLIST_VAL,
+        )
+    elif v.HasField("proto_bytes"):
+        return Value(v.proto_bytes, ValueType.PROTO_BYTES)
+    elif v.HasField("string_val"):
+        return Value(v.string_val, ValueType.STRING_VAL)
+    elif v.HasField("uint_val"):
+        return Value(v.uint_val, ValueType.UINT_VAL)
+    raise ValueError("Unhandled typed value %s" % v)
+
+
+SAMPLES = {
+    "uint_val": pb.TypedValue(uint_val=123456789),
+    "int_val": pb.TypedValue(int_val=-42),
+    "double_val": pb.TypedValue(double_val=3.14),
+    "float_val": pb.TypedValue(float_val=2.5),
+    "bool_val": pb.TypedValue(bool_val=True),
+    "string_val": pb.TypedValue(string_val="Ethernet1"),
+    "ascii_val": pb.TypedValue(ascii_val="up"),
+    "bytes_val": pb.TypedValue(bytes_val=b"\x00\x01"),
+    "json_val": pb.TypedValue(json_val=b'{"a": 1}'),
+    "json_ietf_val": pb.TypedValue(json_ietf_val=b'{"a": 1}'),
+    "decimal_val": pb.TypedValue(decimal_val=pb.Decimal64(digits=314, precision=2)),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'type':<16}{'hasfield ns':>14}{'dispatch ns':>14}{'speedup':>10}")
+    for name, msg in SAMPLES.items():
+        before = timeit.timeit(lambda msg=msg: hasfield_decode(msg), number=args.number)
+        after = timeit.timeit(lambda msg=msg: Value.decode(msg), number=args.number)
+        print(
+            f"{name:<16}"
+            f"{before / args.number * 1e9:>14.0f}"
+            f"{after / args.number * 1e9:>14.0f}"
+            f"{before / after:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
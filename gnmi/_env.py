@@ -23,7 +23,14 @@ class Env:
     GNMIP_TLS_CERT: str = ""
     GNMIP_TLS_KEY: str = ""
     GNMIP_TLS_NO_VERIFY: bool = False
+    GNMIP_TLS_CERT_CACHE_TTL: float = 300.0
     GNMIP_FORMAT: str = "pretty"
+    GNMIP_PATH_CACHE_SIZE: int = 4096
+    GNMIP_PATH_INTERN: bool = False
+    GNMIP_JSON_BACKEND: str = "auto"
+    GNMIP_CHANNEL_POOL: bool = False
+    GNMIP_CHANNEL_POOL_SIZE: int = 64
+    GNMIP_CHANNEL_POOL_IDLE: float = 300.0
 
 
 def _coerce_bool(val):
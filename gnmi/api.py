@@ -1,14 +1,20 @@
 # -*- coding: utf-8 -*-
 
-from typing import Iterable, AsyncGenerator, AsyncIterable, Sequence
+from typing import Any, Iterable, AsyncGenerator, AsyncIterable, Sequence
 
 from gnmi.tls import TLSConfig
 from gnmi.session import Session, BasicAuth
 from gnmi.async_session import AsyncSession
+from gnmi.backpressure import BackpressureQueue, OverflowPolicy
 from gnmi.models import Notification, SetResponse, Subscription
 from gnmi.models.path import PathLike
+from gnmi.models.subscribe import peek_response
 from gnmi.models.update import UpdateList
 from gnmi.models.target import TargetLike
+from gnmi.get_planner import PlannerLike
+from gnmi.matcher import MatcherLike
+from gnmi.pool import PoolLike
+from gnmi.proto import gnmi_pb2 as pb
 
 __all__ = ["capabilities", "delete", "get", "replace", "subscribe", "update"]
 
@@ -23,6 +29,16 @@ def _metadata(auth: BasicAuth = ("", "")) -> dict[str, str]:
     return metadata
 
 
+def _notification(resp: Any, decode: str) -> Any:
+    # Strip a subscribe response down to what the api helpers yield, or
+    # None for sync responses. Raw bytes are passed through whole.
+    if decode == "none":
+        return None if peek_response(resp).sync_response else resp
+    if resp.sync_response:
+        return None
+    return resp.update
+
+
 def _grpc_options(override: str = "") -> dict:
     grpc_options: dict = {}
     if override:
@@ -37,6 +53,7 @@ def capabilities(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ):
     """
     Get supported models and encodings from target
@@ -55,6 +72,8 @@ def capabilities(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
 
     with Session(
@@ -63,6 +82,7 @@ def capabilities(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return sess.capabilities()
 
@@ -73,6 +93,7 @@ async def acapabilities(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ):
     """
     Async get supported models and encodings from target
@@ -92,6 +113,8 @@ async def acapabilities(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
 
     async with AsyncSession(
@@ -100,6 +123,7 @@ async def acapabilities(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return await sess.capabilities()
 
@@ -114,6 +138,8 @@ def get(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
+    planner: PlannerLike = None,
 ) -> Iterable[Notification]:
     """
     Get path(s) from target
@@ -146,6 +172,11 @@ def get(
     :type tls: gnmi.session.TLSConfig
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
+    :param planner: split large path lists into concurrent requests (see
+        :mod:`gnmi.get_planner`)
+    :type planner: gnmi.get_planner.GetPlanner | bool | None
 
     """
     with Session(
@@ -154,8 +185,15 @@ def get(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
-        rsp = sess.get(paths, prefix=prefix, encoding=encoding, data_type=data_type)
+        rsp = sess.get(
+            paths,
+            prefix=prefix,
+            encoding=encoding,
+            data_type=data_type,
+            planner=planner,
+        )
 
         for notif in rsp.notifications:
             yield notif
@@ -171,6 +209,8 @@ async def aget(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
+    planner: PlannerLike = None,
 ) -> AsyncGenerator[Notification, None]:
     """
     Async get path(s) from target
@@ -190,9 +230,14 @@ async def aget(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         rsp = await sess.get(
-            paths, prefix=prefix, encoding=encoding, data_type=data_type
+            paths,
+            prefix=prefix,
+            encoding=encoding,
+            data_type=data_type,
+            planner=planner,
         )
 
         for notif in rsp.notifications:
@@ -221,7 +266,10 @@ def subscribe(
     #
     qos: int = 0,
     override: str = "",
-) -> Iterable[Notification]:
+    pool: PoolLike = None,
+    decode: str = "model",
+    filter: MatcherLike = None,
+) -> Iterable[Notification | pb.Notification | bytes]:
     """
     Subscribe to updates from target
 
@@ -268,6 +316,15 @@ def subscribe(
     :type tls: gnmi.session.TLSConfig
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
+    :param decode: ``"model"`` yields ``Notification`` objects, ``"proto"``
+        the raw ``pb.Notification`` messages and ``"none"`` the serialized
+        ``SubscribeResponse`` bytes (sync responses are still dropped)
+    :type decode: str
+    :param filter: only yield updates and deletes matching these path
+        patterns (see :class:`gnmi.matcher.PathMatcher`)
+    :type filter: gnmi.matcher.PathMatcher | list
     """
     with Session(
         target,
@@ -275,6 +332,7 @@ def subscribe(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         subs = []
         for p in paths:
@@ -295,11 +353,13 @@ def subscribe(
             mode=mode,
             qos=qos,
             aggregate=aggregate,
-            timeout=timeout,
+            timeout=timeout or None,
+            decode=decode,
+            filter=filter,
         ):
-            if resp.sync_response:
-                continue
-            yield resp.update
+            notif = _notification(resp, decode)
+            if notif is not None:
+                yield notif
 
 
 async def asubscribe(
@@ -319,7 +379,12 @@ async def asubscribe(
     tls: TLSConfig | None = None,
     qos: int = 0,
     override: str = "",
-) -> AsyncIterable[Notification]:
+    pool: PoolLike = None,
+    decode: str = "model",
+    buffer: int | BackpressureQueue | None = None,
+    overflow: OverflowPolicy | str = OverflowPolicy.BLOCK,
+    filter: MatcherLike = None,
+) -> AsyncIterable[Notification | pb.Notification | bytes]:
     """
     Async subscribe to updates from target
 
@@ -332,6 +397,9 @@ async def asubscribe(
         ...         print(upd.path, upd.val)
         ...     for path in notif.deletes:
         ...         print(str(path))
+
+    See :func:`subscribe` for the ``decode`` modes and ``filter``, and
+    :meth:`AsyncSession.subscribe` for ``buffer`` and ``overflow``.
     """
     async with AsyncSession(
         target,
@@ -339,6 +407,7 @@ async def asubscribe(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         subs = []
         for p in paths:
@@ -359,11 +428,15 @@ async def asubscribe(
             mode=mode,
             qos=qos,
             aggregate=aggregate,
-            timeout=timeout,
+            timeout=timeout or None,
+            decode=decode,
+            buffer=buffer,
+            overflow=overflow,
+            filter=filter,
         ):
-            if resp.sync_response:
-                continue
-            yield resp.update
+            notif = _notification(resp, decode)
+            if notif is not None:
+                yield notif
 
 
 def delete(
@@ -374,6 +447,7 @@ def delete(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ) -> SetResponse:
     """
     Delete paths from the target
@@ -397,6 +471,8 @@ def delete(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
 
     with Session(
@@ -405,6 +481,7 @@ def delete(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return sess.set(deletes=paths, prefix=prefix)
 
@@ -417,6 +494,7 @@ async def adelete(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ) -> SetResponse:
     """
     Async delete paths from the target
@@ -441,6 +519,8 @@ async def adelete(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
 
     async with AsyncSession(
@@ -449,6 +529,7 @@ async def adelete(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return await sess.set(deletes=paths, prefix=prefix)
 
@@ -461,6 +542,7 @@ def replace(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ) -> SetResponse:
     """
     Replace paths on the target
@@ -486,6 +568,8 @@ def replace(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
     with Session(
         target,
@@ -493,6 +577,7 @@ def replace(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return sess.set(replacements=replacements, prefix=prefix)
 
@@ -505,6 +590,7 @@ async def areplace(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ) -> SetResponse:
     """
     Async replace paths on the target
@@ -523,6 +609,7 @@ async def areplace(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return await sess.set(replacements=replacements, prefix=prefix)
 
@@ -535,6 +622,7 @@ def update(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ) -> SetResponse:
     """
     Update paths on the target
@@ -559,6 +647,8 @@ def update(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
     with Session(
         target,
@@ -566,6 +656,7 @@ def update(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return sess.set(updates=updates, prefix=prefix)
 
@@ -578,6 +669,7 @@ async def aupdate(
     insecure: bool = False,
     tls: TLSConfig | None = None,
     override: str = "",
+    pool: PoolLike = None,
 ) -> SetResponse:
     """
     Async update paths on the target
@@ -603,6 +695,8 @@ async def aupdate(
     :type insecure: bool
     :param override: override hostname
     :type override: str
+    :param pool: reuse a pooled channel (see :mod:`gnmi.pool`)
+    :type pool: gnmi.pool.ChannelPool | bool | None
     """
     async with AsyncSession(
         target,
@@ -610,5 +704,6 @@ async def aupdate(
         insecure=insecure,
         tls=tls,
         grpc_options=_grpc_options(override),
+        pool=pool,
     ) as sess:
         return await sess.set(updates=updates, prefix=prefix)
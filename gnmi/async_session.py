@@ -1,20 +1,44 @@
+import asyncio
 from typing import Sequence, AsyncIterable
 
 from grpc.aio import Channel, insecure_channel, secure_channel
 from grpc import ssl_channel_credentials
 
 from gnmi.util import prepare_metadata
+from gnmi.proto import gnmi_pb2 as pb
 from gnmi.proto import gnmi_ext_pb2 as ext_pb
 from gnmi.proto import gnmi_pb2_grpc
-from gnmi.tls import get_server_certificate, TLSConfig
+from gnmi.tls import (
+    TLSConfig,
+    aget_server_certificate,
+    get_server_certificate,
+    server_cert_key,
+    server_certificates,
+)
+from gnmi.backpressure import BackpressureQueue, OverflowPolicy
+from gnmi.get_planner import PlannerLike, planner_factory
+from gnmi.matcher import MatcherLike, matcher_factory
+from gnmi.set_batch import AsyncSetBatch
+from gnmi.polling import AsyncPollSubscription
+from gnmi.pool import PoolLike, channel_key, pool_factory
 
 from gnmi.models.capabilities import CapabilityRequest, CapabilityResponse
 from gnmi.models.get import DataType, GetRequest, GetResponse
 from gnmi.models.encoding import Encoding
 from gnmi.models.model_data import ModelData
 from gnmi.models.path import PathLike, Path
-from gnmi.models.set import SetRequest, SetResponse
-from gnmi.models.subscribe import SubscribeRequest, SubscribeResponse
+from gnmi.models.set import (
+    SetRequest,
+    SetRequestLike,
+    SetResponse,
+    set_request_factory,
+)
+from gnmi.models.subscribe import (
+    SUBSCRIBE_RPC,
+    SubscribeRequest,
+    SubscribeResponse,
+    decode_mode_factory,
+)
 from gnmi.models.subscription import Subscription
 from gnmi.models.subscription_list import SubscriptionList
 from gnmi.models.target import TargetLike, target_factory
@@ -23,6 +47,13 @@ from gnmi.models.update import UpdateList
 BasicAuth = tuple[str, str]
 
 
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
 class AsyncSession:
     def __init__(
         self,
@@ -31,6 +62,7 @@ class AsyncSession:
         insecure: bool = False,
         tls: TLSConfig | None = None,
         grpc_options: dict | None = None,
+        pool: PoolLike = None,
     ):
         self._target = target_factory(target)
         self._metadata = prepare_metadata(metadata or {})
@@ -38,17 +70,68 @@ class AsyncSession:
         self._tls = tls
         self._grpc_options = (grpc_options or {}).items()
 
-        self._channel = self._new_channel()
+        self._pool = pool_factory(pool)
+        self._channel: Channel | None = None
+        self._stub: gnmi_pb2_grpc.gNMIStub | None = None
 
-        self._stub = gnmi_pb2_grpc.gNMIStub(self._channel)
+        server_cert = None
+        if self._fetches_server_cert():
+            server_cert = server_certificates.get(
+                server_cert_key(self._target, self._tls)  # type: ignore[arg-type]
+            )
+            if server_cert is None and _running_loop() is not None:
+                # don't block the loop on the TLS handshake, the certificate
+                # is fetched asynchronously on first use
+                return
+        self._connect(server_cert)
 
     async def __aenter__(self):
+        await self._ensure_channel()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self._channel.close(None)
+        if self._channel is None:
+            return
+        if self._pool is not None:
+            self._pool.release(self._channel)
+        else:
+            await self._channel.close(None)
+
+    def _fetches_server_cert(self) -> bool:
+        return not self._insecure and bool(self._tls and self._tls.get_server_cert)
+
+    def _connect(self, server_cert: bytes | None = None) -> None:
+        def factory() -> Channel:
+            return self._new_channel(server_cert)
+
+        if self._pool is not None:
+            self._channel = self._pool.acquire(
+                channel_key(
+                    self._target, self._insecure, self._tls, self._grpc_options
+                ),
+                factory,
+                loop=_running_loop(),
+                aio=True,
+            )
+        else:
+            self._channel = factory()
+
+        self._stub = gnmi_pb2_grpc.gNMIStub(self._channel)
+
+    async def _ensure_channel(self) -> None:
+        if self._stub is not None:
+            return
 
-    def _new_channel(self) -> Channel:
+        tls: TLSConfig = self._tls  # type: ignore[assignment]
+        server_cert = await server_certificates.afetch(
+            server_cert_key(self._target, tls),
+            lambda: aget_server_certificate(self._target, tls.context, pem=True),
+        )
+        # another task may have connected while we were waiting
+        if self._stub is None:
+            self._connect(server_cert)
+
+    def _new_channel(self, server_cert: bytes | None = None) -> Channel:
         if self._insecure:
             return insecure_channel(str(self._target))
 
@@ -60,8 +143,11 @@ class AsyncSession:
         private_key = self._tls.client_key or None
 
         if self._tls.get_server_cert:
-            trusted_cert = get_server_certificate(
-                self._target, self._tls.context, pem=True
+            trusted_cert = server_cert or server_certificates.fetch(
+                server_cert_key(self._target, self._tls),
+                lambda: get_server_certificate(
+                    self._target, self._tls.context, pem=True
+                ),
             )
 
         creds = ssl_channel_credentials(
@@ -103,6 +189,7 @@ class AsyncSession:
 
         _cr = CapabilityRequest()
 
+        await self._ensure_channel()
         response = await self._stub.Capabilities(_cr.encode(), metadata=self._metadata)
         return CapabilityResponse.decode(response)
 
@@ -114,6 +201,8 @@ class AsyncSession:
         data_type: DataType | str | int = DataType.ALL,
         models: list[ModelData] = [],
         extensions: list[ext_pb.Extension] = [],
+        lazy: bool = False,
+        planner: PlannerLike = None,
     ) -> GetResponse:
         r"""Get snapshot of state from the target
 
@@ -147,9 +236,30 @@ class AsyncSession:
         :type models: list[ModelData]
         :param extensions:
         :type extensions: list[ext_pb.Extension]
+        :param lazy: return notifications as lazily decoded views
+        :type lazy: bool
+        :param planner: split ``paths`` into chunks requested concurrently
+            and merge the responses, see :class:`gnmi.get_planner.GetPlanner`.
+            ``True`` uses a default planner
+        :type planner: GetPlanner | bool
         :rtype: gnmi.models.get.GetResponse
         """
 
+        _planner = planner_factory(planner)
+        if _planner is not None:
+            return await _planner.aexecute(
+                lambda chunk: self.get(
+                    chunk,
+                    prefix=prefix,
+                    encoding=encoding,
+                    data_type=data_type,
+                    models=models,
+                    extensions=extensions,
+                    lazy=lazy,
+                ),
+                paths,
+            )
+
         _gr = GetRequest(
             prefix=prefix,
             paths=paths,
@@ -159,8 +269,9 @@ class AsyncSession:
             extensions=extensions,
         )
 
+        await self._ensure_channel()
         response = await self._stub.Get(_gr.encode(), metadata=self._metadata)
-        return GetResponse.decode(response)
+        return GetResponse.decode(response, lazy=lazy)
 
     async def set(
         self,
@@ -169,6 +280,7 @@ class AsyncSession:
         replacements: UpdateList = [],
         updates: UpdateList = [],
         union_replacements: UpdateList = [],
+        request: SetRequestLike | None = None,
     ) -> SetResponse:
         r"""Set: set, update or delete value from specified path
 
@@ -189,20 +301,60 @@ class AsyncSession:
         :type deletes: list
         :param union_replacements: union replacements
         :type union_replacements: list
+        :param request: a prebuilt request, e.g. from
+            :class:`gnmi.models.set.SetRequestBuilder`, sent as is. Can't be
+            combined with the other arguments.
+        :type request: SetRequestBuilder | SetRequest | pb.SetRequest
         :rtype: gnmi.models.set.SetResponse
         """
 
-        _sr = SetRequest(
-            prefix=prefix,
-            deletes=deletes,
-            replacements=replacements,
-            updates=updates,
-            union_replacements=union_replacements,
-        )
+        if request is not None:
+            if prefix or deletes or replacements or updates or union_replacements:
+                raise ValueError("request can't be combined with other set arguments")
+            req = set_request_factory(request)
+        else:
+            req = SetRequest(
+                prefix=prefix,
+                deletes=deletes,
+                replacements=replacements,
+                updates=updates,
+                union_replacements=union_replacements,
+            ).encode()
 
-        response = await self._stub.Set(_sr.encode(), metadata=self._metadata)
+        await self._ensure_channel()
+        response = await self._stub.Set(req, metadata=self._metadata)
         return SetResponse.decode(response)
 
+    def batch(
+        self,
+        prefix: PathLike | None = None,
+        max_ops: int | None = None,
+        max_bytes: int | None = None,
+    ) -> AsyncSetBatch:
+        r"""Queue set operations and send them together
+
+        Usage::
+
+            In [5]: async with sess.batch() as batch:
+                ...:     batch.update("/system/config/hostname", "r1")
+                ...:     banner = batch.delete("/system/config/login-banner")
+                ...:
+            In [6]: banner.response.op
+            Out[6]: <Operation.DELETE: 1>
+
+        :param prefix: prefix of every request
+        :type prefix: str
+        :param max_ops: most operations in one ``SetRequest``
+        :type max_ops: int
+        :param max_bytes: rough upper bound of the encoded size of one
+            ``SetRequest``
+        :type max_bytes: int
+        :rtype: gnmi.set_batch.AsyncSetBatch
+        """
+        return AsyncSetBatch(
+            lambda request: self.set(request=request), prefix, max_ops, max_bytes
+        )
+
     async def subscribe(
         self,
         subscriptions: Sequence[str | Path | Subscription],
@@ -212,7 +364,12 @@ class AsyncSession:
         qos: int = 0,
         aggregate: bool = False,
         timeout: int | None = None,
-    ) -> AsyncIterable[SubscribeResponse]:
+        lazy: bool = False,
+        decode: str = "model",
+        buffer: int | BackpressureQueue | None = None,
+        overflow: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        filter: MatcherLike = None,
+    ) -> AsyncIterable[SubscribeResponse | pb.SubscribeResponse | bytes]:
         r"""Subscribe to state updates from the target
 
         Usage::
@@ -267,9 +424,53 @@ class AsyncSession:
         :type: bool
         :param timeout:
         :type: int
+        :param lazy: decode notifications on first access
+            (see :class:`gnmi.models.notification.LazyNotification`)
+        :type: bool
+        :param decode: ``"model"`` yields ``SubscribeResponse`` objects,
+            ``"proto"`` the raw ``pb.SubscribeResponse`` messages and
+            ``"none"`` the serialized bytes. Use
+            :func:`gnmi.models.subscribe.peek_response` to route raw
+            responses by target without decoding them.
+        :type: str
+        :param buffer: read the stream in a background task into a queue of
+            this size, so a slow consumer doesn't stall it. Pass a
+            :class:`gnmi.backpressure.BackpressureQueue` to choose its
+            coalescing key or read its ``stats``
+        :type: int | BackpressureQueue
+        :param overflow: what to do when an ``int`` sized buffer is full:
+            ``block``, ``drop_oldest``, ``drop_newest`` or ``coalesce``
+        :type: OverflowPolicy | str
+        :param filter: only pass on the updates and deletes matching these
+            path patterns, dropping responses left empty (see
+            :class:`gnmi.matcher.PathMatcher`). Filtering happens before
+            responses are buffered
+        :type: PathMatcher | list
         :rtype: gnmi.models.subscribe.SubscribeResponse
         """
 
+        decode = decode_mode_factory(decode)
+        matcher = matcher_factory(filter)
+
+        if isinstance(buffer, int) and buffer > 0:
+            buffer = BackpressureQueue(buffer, overflow)
+        if isinstance(buffer, BackpressureQueue):
+            source = self.subscribe(
+                subscriptions,
+                prefix=prefix,
+                encoding=encoding,
+                mode=mode,
+                qos=qos,
+                aggregate=aggregate,
+                timeout=timeout,
+                lazy=lazy,
+                decode=decode,
+                filter=matcher,
+            )
+            async for item in buffer.stream(source):
+                yield item
+            return
+
         def _sr():
             yield SubscribeRequest(
                 subscribe=SubscriptionList(
@@ -282,7 +483,84 @@ class AsyncSession:
                 )
             ).encode()
 
+        await self._ensure_channel()
+        if decode == "none":
+            # skip the generated stub so gRPC hands back the undecoded bytes
+            call = self._channel.stream_stream(
+                SUBSCRIBE_RPC,
+                request_serializer=pb.SubscribeRequest.SerializeToString,
+                response_deserializer=None,
+            )
+            async for raw in call(_sr(), timeout=timeout, metadata=self._metadata):
+                if matcher is not None:
+                    raw = matcher.filter_bytes(raw)
+                    if raw is None:
+                        continue
+                yield raw
+            return
+
         async for r in self._stub.Subscribe(
             _sr(), timeout=timeout, metadata=self._metadata
         ):
-            yield SubscribeResponse.decode(r)
+            if matcher is not None and not matcher.filter_response(r):
+                continue
+            if decode == "proto":
+                yield r
+            else:
+                yield SubscribeResponse.decode(r, lazy=lazy)
+
+    def subscribe_poll(
+        self,
+        subscriptions: Sequence[str | Path | Subscription],
+        prefix: PathLike | None = None,
+        encoding: Encoding | str | int = "json",
+        aggregate: bool = False,
+        timeout: int | None = None,
+        lazy: bool = False,
+        initial: bool = True,
+    ) -> AsyncPollSubscription:
+        r"""Open a POLL mode subscription
+
+        The subscription is sent when the returned handle is opened (or
+        entered with ``async with``) and every ``await poll()`` returns the
+        target's notifications up to the next ``sync_response``.
+
+        Usage::
+
+            In [61]: async with sess.subscribe_poll(paths) as sub:
+                ...:     async for notifs in sub.every(10, count=3):
+                ...:         print(len(notifs))
+
+        :param subscriptions: List of paths or Subscription objects
+        :type subscriptions: list
+        :param prefix:
+        :type: t.Optional[str]
+        :param encoding:
+        :type: str
+        :param aggregate:
+        :type: bool
+        :param timeout: deadline of the whole stream
+        :type: int
+        :param lazy: decode notifications on first access
+        :type: bool
+        :param initial: read the data the target sends after the
+            subscription, up to the first ``sync_response``, into
+            ``initial``. Pass ``False`` for targets that only answer polls
+        :type: bool
+        :rtype: gnmi.polling.AsyncPollSubscription
+        """
+        request = SubscribeRequest(
+            subscribe=SubscriptionList(
+                subscriptions=subscriptions,
+                prefix=prefix,
+                mode="poll",
+                allow_aggregation=aggregate,
+                encoding=encoding,
+            )
+        ).encode()
+
+        async def open_call():
+            await self._ensure_channel()
+            return self._stub.Subscribe(timeout=timeout, metadata=self._metadata)
+
+        return AsyncPollSubscription(open_call, request, lazy=lazy, initial=initial)
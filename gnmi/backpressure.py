@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+"""Decouple a subscribe stream from a slow consumer.
+
+Without a buffer, :meth:`AsyncSession.subscribe` only reads the next
+response from gRPC when the consumer asks for it, so a consumer stalled on
+a disk write or a GC pause stalls the stream, and the target eventually
+drops it. :class:`BackpressureQueue` puts a reader task and a bounded queue
+in between, with an :class:`OverflowPolicy` deciding what gives when the
+queue is full::
+
+    buf = BackpressureQueue(10_000, "coalesce")
+    async for resp in sess.subscribe(paths, buffer=buf):
+        ...
+    print(buf.stats.dropped, buf.stats.coalesced)
+"""
+
+import asyncio
+import enum
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Hashable
+
+from gnmi.models.notification import LazyNotification
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.util import constantize, wire_fields
+
+CoalesceKey = Callable[[Any], Hashable | None]
+
+_UNKEYED = object()
+
+
+class OverflowPolicy(enum.Enum):
+    #: wait for the consumer, the stream is throttled to its pace
+    BLOCK = "block"
+    #: discard the oldest queued response to make room
+    DROP_OLDEST = "drop_oldest"
+    #: discard the response that doesn't fit
+    DROP_NEWEST = "drop_newest"
+    #: replace a queued response for the same paths with the newer one,
+    #: wait like ``BLOCK`` when there is none
+    COALESCE = "coalesce"
+
+    @classmethod
+    def from_str(cls, s: str) -> "OverflowPolicy":
+        try:
+            return cls[constantize(s)]
+        except KeyError:
+            raise ValueError(f"invalid overflow policy: {s}") from None
+
+
+def overflow_policy_factory(policy: "OverflowPolicy | str") -> OverflowPolicy:
+    if isinstance(policy, OverflowPolicy):
+        return policy
+    return OverflowPolicy.from_str(policy)
+
+
+def coalesce_key(item: Any) -> Hashable | None:
+    """Key of the paths a subscribe response updates.
+
+    The key covers the whole notification, its prefix and the paths of all
+    its updates, so only a response updating exactly the same paths (as the
+    samples of a subscription do) replaces a queued one. A response that
+    overlaps on some paths only is queued on its own.
+
+    Works on models, ``pb.SubscribeResponse`` messages and serialized bytes,
+    the paths of which are read off the wire without decoding the values.
+    ``None`` (never coalesced) for sync responses and for notifications
+    carrying deletes, since dropping those would lose state.
+    """
+    if isinstance(item, SubscribeResponse):
+        if item.sync_response or item.update is None:
+            return None
+        notif = item.update
+        if isinstance(notif, LazyNotification):
+            return _proto_key(notif.encode())
+        if notif.deletes:
+            return None
+        return (notif.prefix, tuple(u.path for u in notif.updates))
+
+    if isinstance(item, bytes):
+        return _wire_key(item)
+    if not item.HasField("update"):
+        return None
+    return _proto_key(item.update)
+
+
+def _proto_key(notif: pb.Notification) -> Hashable | None:
+    if notif.delete:
+        return None
+    return (
+        notif.prefix.SerializeToString(deterministic=True),
+        tuple(u.path.SerializeToString(deterministic=True) for u in notif.update),
+    )
+
+
+def _wire_key(buf: bytes) -> Hashable | None:
+    notif = None
+    for num, val in wire_fields(buf, 0, len(buf)):
+        if num == 1 and isinstance(val, tuple):
+            notif = val
+    if notif is None:
+        return None
+
+    prefix = b""
+    paths = []
+    for num, val in wire_fields(buf, *notif):
+        if num == 5:
+            return None
+        if num == 2 and isinstance(val, tuple):
+            prefix = buf[val[0] : val[1]]
+        elif num == 4 and isinstance(val, tuple):
+            path = b""
+            for unum, uval in wire_fields(buf, *val):
+                if unum == 1 and isinstance(uval, tuple):
+                    path = buf[uval[0] : uval[1]]
+            paths.append(path)
+    return prefix, tuple(paths)
+
+
+@dataclass
+class QueueStats:
+    """Counters of a :class:`BackpressureQueue`.
+
+    ``high_water`` is the largest number of responses queued at once.
+    """
+
+    received: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    high_water: int = 0
+
+
+class BackpressureQueue:
+    """Bounded queue between a stream reader task and its consumer.
+
+    :param maxsize: number of responses held before ``policy`` applies
+    :param policy: an :class:`OverflowPolicy` or its name
+    :param key: coalescing key of a response, see :func:`coalesce_key`
+
+    Coalescing only kicks in once the queue is full, responses are keyed
+    then and not on every put. A queue feeds one stream at a time,
+    :attr:`stats` accumulate across streams.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: OverflowPolicy | str = OverflowPolicy.BLOCK,
+        key: CoalesceKey = coalesce_key,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = overflow_policy_factory(policy)
+        self.stats = QueueStats()
+        self._key = key
+        # cells are [key, item] so coalescing can swap the item in place
+        self._items: deque[list] = deque()
+        self._index: dict[Hashable, list] = {}
+        # trailing cells of _items not keyed yet, in the same order
+        self._unkeyed: deque[list] = deque()
+        self._cond = asyncio.Condition()
+        self._closed = False
+        self._error: BaseException | None = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: Any) -> None:
+        async with self._cond:
+            self.stats.received += 1
+            policy = self.policy
+
+            key: Any = None if policy is not OverflowPolicy.COALESCE else _UNKEYED
+            while len(self._items) >= self.maxsize:
+                if policy is OverflowPolicy.DROP_NEWEST:
+                    self.stats.dropped += 1
+                    return
+                if policy is OverflowPolicy.DROP_OLDEST:
+                    self._pop()
+                    self.stats.dropped += 1
+                    break
+                if policy is OverflowPolicy.COALESCE:
+                    if key is _UNKEYED:
+                        key = self._key(item)
+                    cell = self._lookup(key) if key is not None else None
+                    if cell is not None:
+                        cell[1] = item
+                        self.stats.coalesced += 1
+                        return
+                await self._cond.wait()
+
+            cell = [key, item]
+            self._items.append(cell)
+            if key is _UNKEYED:
+                self._unkeyed.append(cell)
+            elif key is not None:
+                self._index[key] = cell
+            self.stats.high_water = max(self.stats.high_water, len(self._items))
+            self._cond.notify_all()
+
+    def _lookup(self, key: Hashable) -> list | None:
+        while self._unkeyed:
+            cell = self._unkeyed.popleft()
+            cell[0] = self._key(cell[1])
+            if cell[0] is not None:
+                self._index[cell[0]] = cell
+        return self._index.get(key)
+
+    async def get(self) -> Any:
+        """Next response, raises ``StopAsyncIteration`` once closed and empty.
+
+        If the stream failed its error is raised after the queued responses
+        have been delivered.
+        """
+        async with self._cond:
+            while not self._items:
+                if self._closed:
+                    if self._error is not None:
+                        raise self._error
+                    raise StopAsyncIteration
+                await self._cond.wait()
+            item = self._pop()
+            self.stats.delivered += 1
+            self._cond.notify_all()
+            return item
+
+    async def close(self, error: BaseException | None = None) -> None:
+        async with self._cond:
+            self._closed = True
+            self._error = error
+            self._cond.notify_all()
+
+    def _pop(self) -> Any:
+        cell = self._items.popleft()
+        key = cell[0]
+        if self._unkeyed and self._unkeyed[0] is cell:
+            self._unkeyed.popleft()
+        elif key is not None and self._index.get(key) is cell:
+            del self._index[key]
+        return cell[1]
+
+    async def stream(self, source: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """Read ``source`` in a background task, yield from the queue.
+
+        Closing the iterator cancels the reader and so the stream.
+        """
+        self._items.clear()
+        self._index.clear()
+        self._unkeyed.clear()
+        self._closed = False
+        self._error = None
+
+        async def reader() -> None:
+            try:
+                async for item in source:
+                    await self.put(item)
+            except asyncio.CancelledError:
+                await self.close()
+                raise
+            except Exception as exc:
+                await self.close(exc)
+            else:
+                await self.close()
+
+        task = asyncio.create_task(reader())
+        try:
+            while True:
+                try:
+                    item = await self.get()
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
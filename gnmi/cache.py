@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+
+"""Latest value of every path, kept from subscribe streams.
+
+:class:`StateCache` applies the updates and deletes of subscribe responses
+from any number of targets, so dashboards and APIs can read current state
+without going back to the devices::
+
+    cache = StateCache()
+    for resp in sess.subscribe(["/interfaces"]):
+        cache.apply(resp, target="spine1")
+
+    cache.get("/interfaces/interface[name=Ethernet1]/state/oper-status",
+              target="spine1")
+    cache.snapshot("/interfaces", target="spine1")
+    cache.query("/interfaces/interface[name=*]/state/counters/in-octets")
+
+Paths are stored in a :class:`~gnmi.trie.PathTrie` per target and origin,
+so a delete of a whole subtree only touches that subtree, wildcard
+:meth:`~StateCache.query` only walks the branches that can match, and a
+leaf costs one small slotted object on top of its key and value.
+"""
+
+import threading
+from typing import Any, AsyncIterable, Iterable, NamedTuple
+
+from gnmi.models.notification import LazyNotification, Notification
+from gnmi.models.path import Path, PathElem, PathLike, path_factory
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.models.value import Value
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.resilient import EventKind, SubscriptionEvent
+from gnmi.trie import WILDCARD, PathTrie
+
+
+class CacheEntry(NamedTuple):
+    """A cached leaf: its full path, ``Value`` and notification timestamp."""
+
+    path: Path
+    value: Value
+    timestamp: int
+
+
+class _Leaf:
+    # the payload and type of the ``Value`` rather than the model itself,
+    # which would carry an instance dict per leaf
+    __slots__ = ("epoch", "timestamp", "val", "val_type")
+
+    def __init__(self, value: Value, timestamp: int, epoch: int):
+        self.val = value.val
+        self.val_type = value.val_type
+        self.timestamp = timestamp
+        self.epoch = epoch
+
+    def entry(self, path: Path) -> "CacheEntry":
+        return CacheEntry(path, Value(self.val, self.val_type), self.timestamp)
+
+
+class _TargetState:
+    __slots__ = ("epoch", "resync", "roots", "synced")
+
+    def __init__(self):
+        self.roots: dict[str, PathTrie[_Leaf]] = {}
+        self.synced = False
+        # bumped when the target goes stale, leaves remember the epoch that
+        # last wrote them so a resync can tell which ones weren't refreshed
+        self.epoch = 0
+        self.resync = False
+
+    @property
+    def leaves(self) -> int:
+        return sum(len(trie) for trie in self.roots.values())
+
+    def trie(self, origin: str) -> PathTrie[_Leaf]:
+        trie = self.roots.get(origin)
+        if trie is None:
+            trie = self.roots[origin] = PathTrie()
+        return trie
+
+
+class StateCache:
+    """In-memory state of many targets built from ``SubscribeResponse``.
+
+    :param purge_on_resync: when a target that went stale (see
+        :meth:`mark_stale`) sends ``sync_response`` again, drop its leaves
+        that the new stream didn't refresh, since they no longer exist on
+        the target. Disable this if more than one subscription feeds the
+        same target
+
+    A target is :meth:`synced` once its stream sent ``sync_response``.
+    Reads and writes are serialized by a lock, so streams may be applied
+    from several threads.
+    """
+
+    def __init__(self, purge_on_resync: bool = True):
+        self.purge_on_resync = purge_on_resync
+        self._targets: dict[str, _TargetState] = {}
+        self._lock = threading.RLock()
+        # target of the last notification applied without one, see apply
+        self._last_target = ""
+
+    def __len__(self) -> int:
+        """Number of cached leaves, across targets."""
+        return sum(t.leaves for t in self._targets.values())
+
+    def targets(self) -> list[str]:
+        return list(self._targets)
+
+    def count(self, target: str = "") -> int:
+        """Number of cached leaves of ``target``."""
+        state = self._targets.get(target)
+        return state.leaves if state is not None else 0
+
+    def synced(self, target: str = "") -> bool:
+        state = self._targets.get(target)
+        return state is not None and state.synced
+
+    def mark_stale(self, target: str = "") -> None:
+        """Flag ``target`` as out of date, e.g. after its stream dropped.
+
+        Its leaves stay readable until the next ``sync_response``.
+        """
+        with self._lock:
+            state = self._state(target)
+            state.synced = False
+            state.epoch += 1
+            state.resync = True
+
+    def remove(self, target: str) -> None:
+        """Forget ``target`` and its leaves."""
+        with self._lock:
+            self._targets.pop(target, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._targets.clear()
+            self._last_target = ""
+
+    def apply(
+        self,
+        item: SubscribeResponse | pb.SubscribeResponse | SubscriptionEvent,
+        target: str | None = None,
+    ) -> None:
+        """Apply a subscribe response to the cache.
+
+        ``target`` names the target the response came from. If not given,
+        the target of the notification's prefix is used, and a
+        ``sync_response`` goes to the target of the last notification
+        applied that way. Pass ``target`` when several streams feed the
+        cache, or use :meth:`consume`, which tracks it per stream. A
+        :class:`~gnmi.resilient.SubscriptionEvent` of kind ``DISCONNECTED``
+        marks the target stale, other events are ignored.
+        """
+        self._last_target = self._apply(item, target, self._last_target)
+
+    def _apply(self, item: Any, target: str | None, last: str) -> str:
+        # returns the target the next response without one defaults to
+        if isinstance(item, SubscriptionEvent):
+            if item.kind is EventKind.DISCONNECTED:
+                self.mark_stale(last if target is None else target)
+            return last
+        if isinstance(item, pb.SubscribeResponse):
+            item = SubscribeResponse.decode(item)
+        if item.sync_response:
+            self._sync(last if target is None else target)
+        elif item.update is not None:
+            if target is None:
+                prefix = item.update.prefix
+                last = prefix.target if prefix is not None else ""
+            self.apply_notification(item.update, target)
+        return last
+
+    def apply_notification(
+        self, notif: Notification | LazyNotification, target: str | None = None
+    ) -> None:
+        """Apply a notification's deletes, then its updates."""
+        prefix = notif.prefix
+        if target is None:
+            target = prefix.target if prefix is not None else ""
+        base: tuple[PathElem, ...] = tuple(prefix.elem) if prefix is not None else ()
+        base_origin = prefix.origin if prefix is not None else ""
+        timestamp = notif.timestamp
+
+        with self._lock:
+            state = self._state(target)
+            for path in notif.deletes:
+                trie = state.roots.get(path.origin or base_origin)
+                if trie is not None:
+                    trie.delete(base + tuple(path.elem))
+
+            epoch = state.epoch
+            # paths relative to the prefix go in together, walking it once
+            relative = []
+            for update in notif.updates:
+                path = update.path
+                origin = path.origin or base_origin
+                leaf = _Leaf(update.value, timestamp, epoch)
+                if path.elem and origin == base_origin:
+                    relative.append((path.elem, leaf))
+                elif base or path.elem:
+                    state.trie(origin).insert(base + tuple(path.elem), leaf)
+            if relative:
+                state.trie(base_origin).insert_many(relative, base)
+
+    def consume(self, responses: Iterable[Any], target: str | None = None) -> int:
+        """Apply every response of a stream, return how many were applied.
+
+        Without ``target``, sync responses go to the prefix target of the
+        stream's previous notification.
+        """
+        n = 0
+        last = ""
+        for item in responses:
+            last = self._apply(item, target, last)
+            n += 1
+        return n
+
+    async def aconsume(
+        self, responses: AsyncIterable[Any], target: str | None = None
+    ) -> int:
+        """Async :meth:`consume`."""
+        n = 0
+        last = ""
+        async for item in responses:
+            last = self._apply(item, target, last)
+            n += 1
+        return n
+
+    def get(self, path: PathLike, target: str | None = None) -> CacheEntry | None:
+        """Cached leaf at ``path``, or ``None``.
+
+        ``target`` defaults to the path's own target.
+        """
+        p = path_factory(path)
+        if target is None:
+            target = p.target
+        with self._lock:
+            state = self._targets.get(target)
+            trie = state.roots.get(p.origin) if state is not None else None
+            leaf = trie.get(p.elem) if trie is not None else None
+            if leaf is None:
+                return None
+            return leaf.entry(Path._make(tuple(p.elem), p.origin, target))
+
+    def snapshot(
+        self, prefix: PathLike | None = None, target: str | None = None
+    ) -> list[CacheEntry]:
+        """Every cached leaf at or below ``prefix``.
+
+        Without a ``target`` (and no target in ``prefix``) the leaves of all
+        targets are returned. Leaves are listed depth first, in the order
+        their paths were first seen.
+        """
+        p = path_factory(prefix) if prefix is not None else None
+        return self._collect(p, target, lambda trie: trie.items(p.elem if p else ()))
+
+    def query(self, pattern: PathLike, target: str | None = None) -> list[CacheEntry]:
+        """Every cached leaf matching the wildcard ``pattern``.
+
+        See :mod:`gnmi.trie` for the wildcards. ``target`` defaults to the
+        pattern's target, all targets if it has none or it is ``*``.
+        """
+        p = path_factory(pattern)
+        return self._collect(p, target, lambda trie: trie.match(p))
+
+    def _collect(self, p: Path | None, target: str | None, find) -> list[CacheEntry]:
+        if target is None and p is not None and p.target != WILDCARD:
+            target = p.target or None
+        with self._lock:
+            if target is None:
+                states = list(self._targets.items())
+            elif target in self._targets:
+                states = [(target, self._targets[target])]
+            else:
+                states = []
+
+            entries: list[CacheEntry] = []
+            for name, state in states:
+                for origin, trie in state.roots.items():
+                    if p is not None and origin != p.origin:
+                        continue
+                    for path, leaf in find(trie):
+                        entries.append(leaf.entry(Path._make(path.elem, origin, name)))
+            return entries
+
+    def _state(self, target: str) -> _TargetState:
+        state = self._targets.get(target)
+        if state is None:
+            state = self._targets[target] = _TargetState()
+        return state
+
+    def _sync(self, target: str) -> None:
+        with self._lock:
+            state = self._state(target)
+            if state.resync and self.purge_on_resync:
+                epoch = state.epoch
+                for trie in state.roots.values():
+                    trie.prune(lambda leaf: leaf.epoch < epoch)
+            state.resync = False
+            state.synced = True
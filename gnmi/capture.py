@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+"""Compact recordings of subscribe streams.
+
+A capture file holds serialized ``pb.SubscribeResponse`` messages as they
+came off the wire, each tagged with the time it was received and the
+target it came from. Records are collected into blocks, optionally
+compressed with ``zlib`` or ``gzip``, and appended to the file::
+
+    with CaptureWriter("leaf1.cap", compression="zlib") as cap:
+        for raw in sess.subscribe(paths, decode="none"):
+            cap.write(raw, target="leaf1")
+
+    for rec in CaptureReader("leaf1.cap"):
+        print(rec.target, rec.timestamp, rec.response.update)
+
+Layout, all integers big-endian::
+
+    file   := MAGIC block*
+    block  := codec:u8 size:u32 count:u32 payload[size]
+    record := timestamp:u64 target_len:u16 size:u32 target data
+
+``payload`` is the block's records, compressed as ``codec`` says
+(0 none, 1 zlib, 2 gzip). A block cut short, as a writer killed mid-write
+leaves it, ends the capture. Opening an existing capture appends blocks to
+it, after cutting off such a block.
+
+``gnmip subscribe --record FILE`` writes one.
+"""
+
+import gzip
+import io
+import os
+import struct
+import time
+import zlib
+from typing import IO, Iterator, NamedTuple
+
+from gnmi.models.subscribe import (
+    DecodeMode,
+    SubscribeResponse,
+    decode_mode_factory,
+)
+from gnmi.proto import gnmi_pb2 as pb
+
+MAGIC = b"GNMICAP\x01"
+
+_BLOCK = struct.Struct(">BII")
+_RECORD = struct.Struct(">QHI")
+
+_CODECS = {"none": 0, "zlib": 1, "gzip": 2}
+COMPRESSIONS = tuple(_CODECS)
+
+
+class CaptureRecord(NamedTuple):
+    """A recorded response, ``timestamp`` in nanoseconds since the epoch."""
+
+    timestamp: int
+    target: str
+    response: SubscribeResponse | pb.SubscribeResponse | bytes
+
+
+def _open(file: str | os.PathLike | IO[bytes], mode: str) -> tuple[IO[bytes], bool]:
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode), True
+    return file, False
+
+
+class CaptureWriter:
+    """Append responses to a capture file.
+
+    :param file: path, opened for appending, or a binary file object,
+        left open by :meth:`close`. A file that isn't empty must be a
+        capture and, unless it's a path, readable and seekable; a block
+        cut short at its end is truncated away
+    :param compression: ``none``, ``zlib`` or ``gzip``, per block
+    :param level: compression level
+    :param block_size: bytes of records buffered before a block is written
+    :param flush_interval: also write a block when a record arrives this
+        many seconds after the last block, so slow streams still reach the
+        file. ``None`` waits for ``block_size`` or :meth:`flush`
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike | IO[bytes],
+        compression: str | None = None,
+        level: int = 6,
+        block_size: int = 256 * 1024,
+        flush_interval: float | None = None,
+    ):
+        compression = compression or "none"
+        if compression not in _CODECS:
+            raise ValueError(f"invalid compression: {compression!r}")
+        self.compression = compression
+        self.level = level
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+        #: records written, buffered ones included
+        self.records = 0
+
+        self._codec = _CODECS[compression]
+        self._fh, self._owned = _open(file, "a+b")
+        self._buf = bytearray()
+        self._count = 0
+        self._targets: dict[str, bytes] = {}
+        self._flushed = time.monotonic()
+        if _is_empty(self._fh):
+            self._fh.write(MAGIC)
+        else:
+            try:
+                _truncate_partial_block(self._fh)
+            except (OSError, ValueError):
+                if self._owned:
+                    self._fh.close()
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(
+        self,
+        response: SubscribeResponse | pb.SubscribeResponse | bytes,
+        target: str = "",
+        timestamp: int | None = None,
+    ) -> None:
+        """Record a response, as serialized bytes (``decode="none"``), a
+        ``pb.SubscribeResponse`` or a model.
+
+        ``timestamp`` defaults to now, in nanoseconds.
+        """
+        if isinstance(response, SubscribeResponse):
+            response = response.encode()
+        if isinstance(response, pb.SubscribeResponse):
+            response = response.SerializeToString()
+
+        tag = self._targets.get(target)
+        if tag is None:
+            tag = target.encode("utf-8")
+            if len(tag) > 0xFFFF:
+                raise ValueError("target tag is too long")
+            self._targets[target] = tag
+
+        if timestamp is None:
+            timestamp = time.time_ns()
+        buf = self._buf
+        buf += _RECORD.pack(timestamp, len(tag), len(response))
+        buf += tag
+        buf += response
+        self._count += 1
+        self.records += 1
+
+        if len(buf) >= self.block_size or (
+            self.flush_interval is not None
+            and time.monotonic() - self._flushed >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records as a block."""
+        if self._count:
+            payload = bytes(self._buf)
+            if self._codec == 1:
+                payload = zlib.compress(payload, self.level)
+            elif self._codec == 2:
+                payload = gzip.compress(payload, self.level, mtime=0)
+            self._fh.write(_BLOCK.pack(self._codec, len(payload), self._count))
+            self._fh.write(payload)
+            self._buf.clear()
+            self._count = 0
+        self._fh.flush()
+        self._flushed = time.monotonic()
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self.flush()
+        if self._owned:
+            self._fh.close()
+
+
+def _is_empty(fh: IO[bytes]) -> bool:
+    try:
+        return fh.tell() == 0
+    except (OSError, AttributeError):
+        # pipes can't tell, a stream written from the start
+        return True
+
+
+def _truncate_partial_block(fh: IO[bytes]) -> None:
+    """Check ``fh`` is a capture and cut off a block cut short at its end,
+    leaving ``fh`` at the end of the last complete block.
+    """
+    try:
+        fh.seek(0)
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not a gNMI capture file, refusing to append")
+        end = fh.seek(0, os.SEEK_END)
+        pos = len(MAGIC)
+        fh.seek(pos)
+        while True:
+            header = fh.read(_BLOCK.size)
+            if len(header) < _BLOCK.size:
+                break
+            _, size, _ = _BLOCK.unpack(header)
+            if pos + _BLOCK.size + size > end:
+                break
+            pos = fh.seek(size, os.SEEK_CUR)
+        if pos < end:
+            fh.truncate(pos)
+        fh.seek(pos)
+    except io.UnsupportedOperation as e:
+        raise ValueError(
+            "can't check the capture to append to, open it readable and seekable"
+        ) from e
+
+
+class CaptureReader:
+    """Iterate over the records of a capture file.
+
+    :param file: path or binary file object
+    :param decode: ``model`` for ``SubscribeResponse`` models, ``proto``
+        for ``pb.SubscribeResponse`` messages, ``none`` for the recorded
+        bytes
+    """
+
+    def __init__(
+        self, file: str | os.PathLike | IO[bytes], decode: DecodeMode | str = "model"
+    ):
+        self.decode = decode_mode_factory(decode)
+        self._fh, self._owned = _open(file, "rb")
+        magic = self._fh.read(len(MAGIC))
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("not a gNMI capture file")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        decode = self.decode
+        targets: dict[bytes, str] = {}
+        for payload in self._blocks():
+            pos, end = 0, len(payload)
+            while pos < end:
+                timestamp, tag_len, size = _RECORD.unpack_from(payload, pos)
+                pos += _RECORD.size
+                tag = payload[pos : pos + tag_len]
+                target = targets.get(tag)
+                if target is None:
+                    target = targets[tag] = tag.decode("utf-8")
+                pos += tag_len
+                data = payload[pos : pos + size]
+                pos += size
+
+                response: SubscribeResponse | pb.SubscribeResponse | bytes = data
+                if decode != "none":
+                    response = pb.SubscribeResponse.FromString(data)
+                    if decode == "model":
+                        response = SubscribeResponse.decode(response)
+                yield CaptureRecord(timestamp, target, response)
+
+    def _blocks(self) -> Iterator[bytes]:
+        read = self._fh.read
+        while True:
+            header = read(_BLOCK.size)
+            if len(header) < _BLOCK.size:
+                return
+            codec, size, _ = _BLOCK.unpack(header)
+            payload = read(size)
+            if len(payload) < size:
+                return
+            if codec == 1:
+                payload = zlib.decompress(payload)
+            elif codec == 2:
+                payload = gzip.decompress(payload)
+            elif codec != 0:
+                raise ValueError(f"unknown capture block codec {codec}")
+            yield payload
+
+    def close(self) -> None:
+        if self._owned:
+            self._fh.close()
+
+
+__all__ = [
+    "COMPRESSIONS",
+    "MAGIC",
+    "CaptureReader",
+    "CaptureRecord",
+    "CaptureWriter",
+]
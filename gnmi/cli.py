@@ -8,6 +8,7 @@ The command group exposes:
     gnmip [GLOBAL OPTIONS] TARGET capabilities
     gnmip [GLOBAL OPTIONS] TARGET get [PATHS...]
     gnmip [GLOBAL OPTIONS] TARGET subscribe [PATHS...]
+    gnmip [GLOBAL OPTIONS] collector CONFIG_FILE
 
 Defaults can be loaded from a TOML config file (default ``~/.gnmirc``,
 overridable with ``--config``). Top-level keys feed group options;
@@ -16,18 +17,32 @@ sections like ``[subscribe]`` feed the matching subcommand.
 
 import asyncio
 import enum
+import signal
 from importlib.metadata import version
 from functools import wraps
 import click
 import click_config_file
 import grpc
 import toml
+from google.protobuf import json_format
 from grpc import __version__ as grpc_version
 
 from gnmi import util
 from gnmi.async_session import AsyncSession
+from gnmi.capture import COMPRESSIONS, CaptureWriter
+from gnmi.collector import (
+    Collector,
+    CollectorTarget,
+    JsonLinesSink,
+    configured_targets,
+    load_configuration,
+    sink_factory,
+)
+from gnmi.fleet import Fleet, FleetResult
+from gnmi.matcher import PathMatcher
 from gnmi.models import Subscription
 from gnmi.models.path import Path
+from gnmi.models.subscribe import peek_response
 from gnmi.models.target import target_factory
 from gnmi.formatters.pretty import PrettyCapabilities, PrettyNotification
 from gnmi.formatters.streams import StreamingNotification
@@ -101,11 +116,14 @@ def _build_tls_config(
     )
 
 
-def _new_session(ctx: click.Context, target: str) -> AsyncSession:
+def _new_session(
+    ctx: click.Context, target: str, metadata: dict[str, str] | None = None
+) -> AsyncSession:
     o = ctx.obj
-    metadata: dict[str, str] = {}
-    if o["username"]:
-        metadata = {"username": o["username"], "password": o["password"] or ""}
+    # --username and --password unless the target brings credentials
+    metadata = dict(metadata or {})
+    if o["username"] and "username" not in metadata:
+        metadata.update(username=o["username"], password=o["password"] or "")
 
     tls = _build_tls_config(
         o["tls_ca"],
@@ -133,7 +151,7 @@ def _build_prefix(prefix: str, target: str, without_target: bool) -> Path | None
         return None
     p = Path.from_str(prefix) if prefix else Path(elem=[])
     if not without_target:
-        p.target = target_factory(target).hostaddr
+        p = p.replace(target=target_factory(target).hostaddr)
     return p
 
 
@@ -150,6 +168,52 @@ def async_command(f):
     return wrapper
 
 
+def fleet_options(f):
+    f = click.option(
+        "--retries",
+        type=int,
+        default=0,
+        show_default=True,
+        help="retries per target on UNAVAILABLE or timeout",
+    )(f)
+    f = click.option(
+        "--timeout",
+        type=float,
+        default=30.0,
+        show_default=True,
+        help="per-target deadline in seconds (0 to disable)",
+    )(f)
+    f = click.option(
+        "--concurrency",
+        type=int,
+        default=100,
+        show_default=True,
+        help="maximum number of targets queried at once",
+    )(f)
+    return f
+
+
+def _new_fleet(ctx: click.Context, concurrency: int, timeout: float, retries: int):
+    return Fleet(
+        ctx.obj["target"],
+        concurrency=concurrency,
+        timeout=timeout or None,
+        retries=retries,
+        session_factory=lambda target: _new_session(ctx, target),
+    )
+
+
+def _report_error(res: FleetResult) -> None:
+    err = res.error
+    if isinstance(err, grpc.RpcError):
+        msg = f"{err.code().name}: {err.details()}"  # type: ignore[attr-defined]
+    elif isinstance(err, asyncio.TimeoutError):
+        msg = "timed out"
+    else:
+        msg = str(err) or type(err).__name__
+    click.echo(f"{res.target}: {msg}", err=True)
+
+
 class Encoding(enum.Enum):
     JSON = "json"
     BYTES = "bytes"
@@ -157,7 +221,7 @@ class Encoding(enum.Enum):
     ASCII = "ascii"
     JSON_IETF = "json-ietf"
 
- 
+
 class Formatter(enum.Enum):
     PRETTY = "pretty"
     JSON = "json"
@@ -263,23 +327,27 @@ def cli(ctx: click.Context, **kwargs) -> None:
 
 
 @cli.command()
+@fleet_options
 @click.pass_context
 @async_command
-async def capabilities(ctx: click.Context) -> None:
+async def capabilities(
+    ctx: click.Context, concurrency: int, timeout: float, retries: int
+) -> None:
     fmt = ctx.obj["format"]
 
-    async def _run(target: str) -> None:
-        async with _new_session(ctx, target) as sess:
-            cap = await sess.capabilities()
-            if fmt == Formatter.PRETTY:
-                PrettyCapabilities().send(cap)
-            else:
-                JsonCapabilities().send(cap)
+    failed = False
+    async for res in _new_fleet(ctx, concurrency, timeout, retries).capabilities():
+        if not res.ok:
+            failed = True
+            _report_error(res)
+            continue
+        if fmt == Formatter.PRETTY:
+            PrettyCapabilities().send(res.value)
+        else:
+            JsonCapabilities().send(res.value)
 
-    tasks = []
-    for target in ctx.obj["target"]:
-        tasks.append(_run(target))
-    await asyncio.gather(*tasks)
+    if failed:
+        ctx.exit(1)
 
 
 @cli.command()
@@ -304,37 +372,42 @@ async def capabilities(ctx: click.Context) -> None:
     default="all",
     show_default=True,
 )
+@fleet_options
 @click.pass_context
 @async_command
 async def get(
-    ctx: click.Context, paths, encoding, prefix, no_prefix_target, get_type
+    ctx: click.Context,
+    paths,
+    encoding,
+    prefix,
+    no_prefix_target,
+    get_type,
+    concurrency,
+    timeout,
+    retries,
 ) -> None:
-    
-    async def _run(target: str) -> None:
-        prefix_path = _build_prefix(
-            prefix,
-            target,
-            no_prefix_target,
-        )
-        fmt = ctx.obj["format"]
-        async with _new_session(ctx, target) as sess:
-            rsp = await sess.get(
-                paths=[p for p in paths],
-                prefix=prefix_path,
-                encoding=encoding.value,
-                data_type=get_type,
-            )
-            for notif in rsp.notifications:
-                if fmt == Formatter.PRETTY:
-                    PrettyNotification().send(notif)
-                else:
-                    JsonNotification().send(notif)
-
-    tasks = []
-    for target in ctx.obj["target"]:
-        tasks.append(_run(target))
+    fmt = ctx.obj["format"]
+    fleet = _new_fleet(ctx, concurrency, timeout, retries)
+
+    failed = False
+    async for res in fleet.get(
+        list(paths),
+        prefix=lambda target: _build_prefix(prefix, str(target), no_prefix_target),
+        encoding=encoding.value,
+        data_type=get_type,
+    ):
+        if not res.ok:
+            failed = True
+            _report_error(res)
+            continue
+        for notif in res.value.notifications:
+            if fmt == Formatter.PRETTY:
+                PrettyNotification().send(notif)
+            else:
+                JsonNotification().send(notif)
 
-    await asyncio.gather(*tasks)
+    if failed:
+        ctx.exit(1)
 
 
 @cli.command()
@@ -376,12 +449,32 @@ async def get(
     "--suppress", is_flag=True, default=False, help="suppress redundant updates"
 )
 @click.option("--qos", type=int, default=0, show_default=True, help="DSCP marking")
+@click.option(
+    "--filter",
+    "filters",
+    multiple=True,
+    help="only show updates matching this path pattern, wildcards allowed "
+    "(e.g. '/interfaces/interface[name=Ethernet*]/state/counters'); repeatable",
+)
 @click.option(
     "--detail",
     is_flag=True,
     default=False,
     help="display detailed notification messages",
 )
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="append the raw responses to a capture file instead of printing them",
+)
+@click.option(
+    "--record-compression",
+    type=click.Choice(COMPRESSIONS),
+    default="none",
+    show_default=True,
+    help="block compression of the capture file",
+)
 @click.pass_context
 @async_command
 async def subscribe(
@@ -397,9 +490,12 @@ async def subscribe(
     aggregate,
     suppress,
     qos,
+    filters,
     detail,
+    record,
+    record_compression,
 ) -> None:
-    
+
     fmt = ctx.obj["format"]
 
     def _ns(d: str) -> int:
@@ -415,19 +511,35 @@ async def subscribe(
         )
         for p in paths
     ]
+    matcher = PathMatcher(filters) if filters else None
+    capture = None
+    if record:
+        capture = CaptureWriter(record, record_compression, flush_interval=1.0)
+
+    async def _record(target: str, stream) -> None:
+        async for raw in stream:
+            capture.write(raw, target)
+            if mode == "once" and peek_response(raw).sync_response:
+                return
 
     async def _run(target: str) -> None:
         prefix_path = _build_prefix(prefix, target, no_prefix_target)
         async with _new_session(ctx, target) as sess:
             try:
-                async for resp in sess.subscribe(
+                stream = sess.subscribe(
                     subscriptions=subs,
                     prefix=prefix_path,
                     encoding=encoding.value,
                     mode=mode,
                     qos=qos,
                     aggregate=aggregate,
-                ):
+                    decode="none" if capture else "model",
+                    filter=matcher,
+                )
+                if capture is not None:
+                    await _record(target, stream)
+                    return
+                async for resp in stream:
                     if resp.sync_response:
                         if mode == "once":
                             return
@@ -444,15 +556,96 @@ async def subscribe(
                 if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
                     return
                 raise
-    
-    tasks = []
-    for target in ctx.obj["target"]:
-        tasks.append(_run(target))
-    
-    await asyncio.gather(*tasks)
+
+    targets = ctx.obj["target"]
+    try:
+        results = await asyncio.gather(
+            *(_run(target) for target in targets), return_exceptions=True
+        )
+    finally:
+        if capture is not None:
+            capture.close()
+    failed = False
+    for target, res in zip(targets, results, strict=True):
+        if isinstance(res, Exception):
+            failed = True
+            _report_error(FleetResult(target=target, error=res))
+    if failed:
+        ctx.exit(1)
+
 
 @cli.command()
+@click.argument("config_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--sink",
+    "sinks",
+    multiple=True,
+    help="where responses go: jsonl, jsonl:PATH, null or module:callable "
+    "(repeatable, defaults to jsonl)",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=50,
+    show_default=True,
+    help="maximum number of targets connecting at once",
+)
+@click.option(
+    "--stats-interval",
+    type=float,
+    default=10.0,
+    show_default=True,
+    help="seconds between throughput reports on stderr (0 to disable)",
+)
 @click.pass_context
 @async_command
-async def collector(ctx: click.Context) -> None:
-    raise NotImplementedError("collector command is not implemented yet")
+async def collector(
+    ctx: click.Context,
+    config_file: str,
+    sinks: tuple[str, ...],
+    concurrency: int,
+    stats_interval: float,
+) -> None:
+    """Stream every target of CONFIG_FILE into the sinks until SIGTERM.
+
+    CONFIG_FILE is a TOML, YAML or JSON ``Configuration`` of targets and
+    subscribe requests. Targets without credentials use --username and
+    --password.
+    """
+    try:
+        config = load_configuration(config_file)
+        targets = configured_targets(config)
+        sink_list = [sink_factory(s) for s in sinks] or [JsonLinesSink()]
+    except (ValueError, json_format.ParseError, ImportError) as e:
+        raise click.UsageError(str(e)) from e
+
+    failed = False
+
+    def _on_error(target: str, error: BaseException) -> None:
+        nonlocal failed
+        failed = True
+        _report_error(FleetResult(target=target, error=error))
+
+    def _session(target: CollectorTarget) -> AsyncSession:
+        return _new_session(ctx, target.address, target.metadata)
+
+    coll = Collector(
+        targets,
+        sink_list,
+        concurrency=concurrency,
+        stats_interval=stats_interval,
+        on_stats=lambda stats: click.echo(stats.format(), err=True),
+        on_error=_on_error,
+        session_factory=_session,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, coll.stop)
+    try:
+        await coll.run()
+    finally:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)
+    if failed:
+        ctx.exit(1)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""JSON codec used for values and formatters.
+
+Uses the fastest installed backend (``orjson``, then ``ujson``) and falls
+back to the standard library ``json`` module. ``GNMIP_JSON_BACKEND`` (or
+:func:`set_backend`) selects one explicitly: ``auto``, ``orjson``,
+``ujson`` or ``json``.
+
+The ``json`` backend writes what ``json.dumps(obj)`` writes. The fast
+backends write their own compact form instead, which parses to the same
+document but is spelled differently: no spaces after separators, UTF-8
+rather than ``\\u`` escapes, and some floats (``1e20`` for ``1e+20``).
+orjson also writes non-finite floats as ``null``. Select the ``json``
+backend where the exact stdlib output matters. Documents a fast backend
+refuses (integers wider than 64 bits, non string keys) are encoded by the
+standard library in the same compact form.
+"""
+
+import json
+import warnings
+from typing import Any, Callable, NamedTuple, Optional
+
+from gnmi._env import env
+
+BACKENDS = ("orjson", "ujson", "json")
+
+Default = Optional[Callable[[Any], Any]]
+
+
+class Backend(NamedTuple):
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumpb: Callable[[Any, Default], bytes]
+
+
+def _json_backend() -> Backend:
+    def dumpb(obj: Any, default: Default = None) -> bytes:
+        return json.dumps(obj, default=default).encode("utf-8")
+
+    return Backend("json", json.loads, dumpb)
+
+
+def _orjson_backend() -> Backend:
+    import orjson
+
+    # leave dataclasses and datetimes to ``default`` like the stdlib does
+    option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumpb(obj: Any, default: Default = None) -> bytes:
+        return orjson.dumps(obj, default=default, option=option)
+
+    return Backend("orjson", orjson.loads, dumpb)
+
+
+def _ujson_backend() -> Backend:
+    import ujson
+
+    def dumpb(obj: Any, default: Default = None) -> bytes:
+        kwargs = {"default": default} if default is not None else {}
+        out = ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False, **kwargs
+        )
+        return out.encode("utf-8")
+
+    return Backend("ujson", ujson.loads, dumpb)
+
+
+_FACTORIES: dict[str, Callable[[], Backend]] = {
+    "orjson": _orjson_backend,
+    "ujson": _ujson_backend,
+    "json": _json_backend,
+}
+
+_stdlib = _json_backend()
+_backend = _stdlib
+
+
+def _load_backend(name: str) -> Backend:
+    name = (name or "auto").lower()
+    if name == "auto":
+        for candidate in BACKENDS:
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+    if name not in _FACTORIES:
+        raise ValueError(
+            f"unknown JSON backend: {name!r}, expected one of "
+            f"{', '.join(('auto',) + BACKENDS)}"
+        )
+    return _FACTORIES[name]()
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the JSON backend, returns the name of the one in use.
+
+    Raises ``ValueError`` for unknown names and ``ImportError`` if the
+    requested backend is not installed.
+    """
+    global _backend
+    _backend = _load_backend(name)
+    return _backend.name
+
+
+def get_backend() -> str:
+    """Name of the JSON backend in use."""
+    return _backend.name
+
+
+def loads(data: bytes | str) -> Any:
+    try:
+        return _backend.loads(data)
+    except ValueError:
+        if _backend is _stdlib:
+            raise
+        return json.loads(data)
+
+
+def dumpb(obj: Any, default: Default = None) -> bytes:
+    """Serialize ``obj`` to UTF-8 encoded JSON.
+
+    ``default`` is called for objects the backend can't serialize and
+    should return a serializable replacement or raise ``TypeError``.
+    """
+    if _backend is _stdlib:
+        return _stdlib.dumpb(obj, default)
+    try:
+        return _backend.dumpb(obj, default)
+    except (TypeError, OverflowError, ValueError):
+        return _compact(obj, default)
+
+
+def _compact(obj: Any, default: Default) -> bytes:
+    # the stdlib, spelled like the fast backends
+    out = json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False)
+    return out.encode("utf-8")
+
+
+def dumps(obj: Any, default: Default = None) -> str:
+    """Like :func:`dumpb` but returns ``str``."""
+    return dumpb(obj, default).decode("utf-8")
+
+
+try:
+    set_backend(env.GNMIP_JSON_BACKEND)
+except (ImportError, ValueError) as exc:
+    warnings.warn(
+        f"GNMIP_JSON_BACKEND: {exc}, using auto", RuntimeWarning, stacklevel=2
+    )
+    set_backend("auto")
@@ -0,0 +1,561 @@
+# -*- coding: utf-8 -*-
+
+"""Long-running multi-target streaming collector.
+
+A :class:`Collector` subscribes to every target of a
+``target_pb2.Configuration`` and keeps those subscriptions up, each one an
+:class:`~gnmi.resilient.AsyncResilientSubscription`. All streams are
+merged into one queue and handed to :class:`Sink`\\ s::
+
+    config = load_configuration("collector.yaml")
+    collector = Collector(config, [JsonLinesSink()], insecure=True)
+    await collector.run()      # until collector.stop()
+
+The configuration maps request names to ``SubscribeRequest``\\ s and target
+names to targets using them, in the protobuf JSON mapping. Paths may be
+given as strings and intervals as durations::
+
+    request:
+      counters:
+        subscribe:
+          prefix: /interfaces
+          subscription:
+            - path: interface/state/counters
+              mode: SAMPLE
+              sampleInterval: 10s
+    target:
+      spine1:
+        addresses: ["10.0.0.1:6030"]
+        request: counters
+        credentials: {username: admin, password: admin}
+
+``gnmip collector CONFIG`` runs one from the command line.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import IO, Any, Callable, Iterable, NamedTuple
+
+from google.protobuf import json_format
+
+from gnmi import util
+from gnmi.async_session import AsyncSession
+from gnmi.cache import StateCache
+from gnmi.formatters.json import dumps, json_value
+from gnmi.models.path import Path
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.proto import target_pb2
+from gnmi.resilient import (
+    AsyncResilientSubscription,
+    EventKind,
+    ReconnectPolicy,
+    SubscriptionEvent,
+)
+
+# keys whose string values are read as paths or durations
+_PATH_KEYS = frozenset({"path", "prefix"})
+_DURATION_KEYS = frozenset(
+    {"sampleInterval", "sample_interval", "heartbeatInterval", "heartbeat_interval"}
+)
+
+
+def _expand(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        out = {}
+        for k, v in obj.items():
+            if k in _PATH_KEYS and isinstance(v, str):
+                v = json_format.MessageToDict(Path.from_str(v).encode())
+            elif k in _DURATION_KEYS and isinstance(v, str) and not v.isdigit():
+                v = str(util.parse_duration(v))
+            else:
+                v = _expand(v)
+            out[k] = v
+        return out
+    if isinstance(obj, list):
+        return [_expand(v) for v in obj]
+    return obj
+
+
+def parse_configuration(data: dict) -> target_pb2.Configuration:
+    """Build a ``Configuration`` from its (relaxed) JSON mapping."""
+    return json_format.ParseDict(_expand(data), target_pb2.Configuration())
+
+
+def load_configuration(path: str) -> target_pb2.Configuration:
+    """Read a collector configuration from a TOML, YAML or JSON file."""
+    with open(path, "r") as fh:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # type: ignore[import]
+
+            data = yaml.safe_load(fh) or {}
+        elif path.endswith(".json"):
+            data = json.load(fh)
+        else:
+            import toml
+
+            data = toml.load(fh)
+    return parse_configuration(data)
+
+
+class CollectorTarget(NamedTuple):
+    """A target of the configuration with its subscription resolved."""
+
+    name: str
+    address: str
+    metadata: dict[str, str]
+    request: pb.SubscribeRequest
+
+
+def configured_targets(config: target_pb2.Configuration) -> list[CollectorTarget]:
+    """Resolve the request of every target.
+
+    A target without a ``request`` uses the configuration's only request.
+    Targets must have exactly one address. Requests setting fields the
+    collector can't send (``updates_only``, ``use_models``, extensions) are
+    rejected rather than subscribed to without them.
+    """
+    targets = []
+    for name, t in sorted(config.target.items()):
+        if not t.addresses:
+            raise ValueError(f"target {name!r} has no address")
+        if len(t.addresses) > 1:
+            raise ValueError(f"target {name!r} has more than one address")
+        req_name = t.request
+        if not req_name:
+            if len(config.request) != 1:
+                raise ValueError(f"target {name!r} must name one of the requests")
+            req_name = next(iter(config.request))
+        if req_name not in config.request:
+            raise ValueError(f"target {name!r} uses unknown request {req_name!r}")
+        request = config.request[req_name]
+        if not request.HasField("subscribe"):
+            raise ValueError(f"request {req_name!r} has no subscription list")
+        unsupported = _unsupported_fields(request)
+        if unsupported:
+            raise ValueError(
+                f"request {req_name!r} sets unsupported {', '.join(unsupported)}"
+            )
+
+        metadata = dict(t.meta)
+        if t.credentials.username:
+            metadata["username"] = t.credentials.username
+            metadata["password"] = t.credentials.password
+        targets.append(CollectorTarget(name, t.addresses[0], metadata, request))
+    return targets
+
+
+def _unsupported_fields(request: pb.SubscribeRequest) -> list[str]:
+    """Fields of ``request`` :func:`_subscribe_kwargs` can't pass on."""
+    sl = request.subscribe
+    names = []
+    if sl.updates_only:
+        names.append("updates_only")
+    if sl.use_models:
+        names.append("use_models")
+    if request.extension:
+        names.append("extension")
+    return names
+
+
+def _subscribe_kwargs(request: pb.SubscribeRequest) -> dict[str, Any]:
+    sl = request.subscribe
+    return {
+        "prefix": sl.prefix if sl.HasField("prefix") else None,
+        "encoding": sl.encoding,
+        "mode": pb.SubscriptionList.Mode.Name(sl.mode).lower(),
+        "qos": sl.qos.marking,
+        "aggregate": sl.allow_aggregation,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------------
+
+
+class Sink:
+    """Where collected responses go.
+
+    ``send`` gets the configured name of the target and either a decoded
+    ``SubscribeResponse`` or a :class:`~gnmi.resilient.SubscriptionEvent`.
+    Sinks are called one at a time from the collector's dispatch task, a
+    slow sink backs the streams up.
+    """
+
+    async def send(
+        self, target: str, item: SubscribeResponse | SubscriptionEvent
+    ) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class JsonLinesSink(Sink):
+    """Write notifications as ``gnmip --json`` does, one per line, with
+    ``target`` set to the configured name of the target.
+
+    ``stream`` is a text file object, left open by :meth:`close`, or a path
+    opened for appending and closed with the sink. Defaults to stdout.
+    """
+
+    def __init__(self, stream: IO[str] | str | os.PathLike | None = None):
+        self.stream, self._owned = _open(stream or sys.stdout)
+
+    async def send(
+        self, target: str, item: SubscribeResponse | SubscriptionEvent
+    ) -> None:
+        if (
+            isinstance(item, SubscriptionEvent)
+            or item.sync_response
+            or item.update is None
+        ):
+            return
+        notif = item.update
+        raw: list[str] = []
+        out = {
+            "timestamp": notif.timestamp,
+            "prefix": str(notif.prefix),
+            "target": target,
+            "atomic": notif.atomic,
+            "updates": [
+                {"path": str(u.path), "val": json_value(u.value, raw)}
+                for u in notif.updates
+            ],
+            "deletes": [{"path": str(d)} for d in notif.deletes],
+        }
+        self.stream.write(dumps(out, raw) + "\n")
+
+    async def close(self) -> None:
+        if self.stream.closed:
+            return
+        self.stream.flush()
+        if self._owned:
+            self.stream.close()
+
+
+def _open(stream: IO[str] | str | os.PathLike) -> tuple[IO[str], bool]:
+    if isinstance(stream, (str, os.PathLike)):
+        return open(stream, "a"), True
+    return stream, False
+
+
+class CacheSink(Sink):
+    """Feed a :class:`~gnmi.cache.StateCache`, stale targets included."""
+
+    def __init__(self, cache: StateCache | None = None):
+        self.cache = cache if cache is not None else StateCache()
+
+    async def send(
+        self, target: str, item: SubscribeResponse | SubscriptionEvent
+    ) -> None:
+        self.cache.apply(item, target)
+
+
+class CallbackSink(Sink):
+    """Call ``fn(target, item)`` for every item, awaiting it if needed."""
+
+    def __init__(self, fn: Callable[[str, Any], Any]):
+        self.fn = fn
+
+    async def send(
+        self, target: str, item: SubscribeResponse | SubscriptionEvent
+    ) -> None:
+        res = self.fn(target, item)
+        if asyncio.iscoroutine(res):
+            await res
+
+
+class NullSink(Sink):
+    """Discard everything, for measuring throughput."""
+
+    async def send(
+        self, target: str, item: SubscribeResponse | SubscriptionEvent
+    ) -> None:
+        pass
+
+
+def sink_factory(spec: str) -> Sink:
+    """Build a sink from its command line form.
+
+    ``jsonl`` (stdout), ``jsonl:PATH``, ``null``, or ``module:callable`` for
+    a sink of your own, the callable is called without arguments.
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "jsonl":
+        return JsonLinesSink(arg or None)
+    if kind == "null" and not arg:
+        return NullSink()
+    if arg:
+        return getattr(import_module(kind), arg)()
+    raise ValueError(f"invalid sink: {spec}")
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TargetStats:
+    """Counters of one target.
+
+    ``lag`` is the seconds between the timestamp of the latest
+    notification and the time it was received.
+    """
+
+    connected: bool = False
+    synced: bool = False
+    responses: int = 0
+    updates: int = 0
+    bytes: int = 0
+    reconnects: int = 0
+    lag: float | None = None
+    error: BaseException | None = None
+
+
+@dataclass
+class CollectorStats:
+    """Throughput over the last interval, totals per target.
+
+    Rates are per second over ``interval`` seconds.
+    """
+
+    interval: float = 0.0
+    updates_per_sec: float = 0.0
+    bytes_per_sec: float = 0.0
+    responses: int = 0
+    updates: int = 0
+    bytes: int = 0
+    targets: dict[str, TargetStats] = field(default_factory=dict)
+
+    def format(self) -> str:
+        connected = sum(1 for t in self.targets.values() if t.connected)
+        lags = [t.lag for t in self.targets.values() if t.lag is not None]
+        lag = f"{max(lags):.3f}s" if lags else "-"
+        return (
+            f"{connected}/{len(self.targets)} targets, "
+            f"{self.updates_per_sec:.1f} updates/s, "
+            f"{self.bytes_per_sec / 1024:.1f} KiB/s, max lag {lag}"
+        )
+
+
+SessionFactory = Callable[[CollectorTarget], AsyncSession]
+
+
+class Collector:
+    """Subscribe to every configured target and fan the streams into sinks.
+
+    :param config: a ``target_pb2.Configuration`` or a list of
+        :class:`CollectorTarget`
+    :param sinks: receive every response and subscription event
+    :param concurrency: targets connecting at once at startup; a target
+        holds its slot until its stream delivers a first response or fails
+    :param policy: reconnect policy of every subscription
+    :param queue_size: responses buffered between the streams and the sinks
+    :param stats_interval: seconds between calls of ``on_stats``
+    :param on_stats: called with a :class:`CollectorStats` every interval
+    :param on_error: called with a target name and the error that ended its
+        subscription for good (not retryable, or out of retries)
+    :param session_factory: builds the :class:`AsyncSession` of a target,
+        defaults to ``AsyncSession(address, metadata, **session_kwargs)``
+    """
+
+    def __init__(
+        self,
+        config: target_pb2.Configuration | Iterable[CollectorTarget],
+        sinks: Iterable[Sink] = (),
+        *,
+        concurrency: int = 50,
+        policy: ReconnectPolicy | None = None,
+        queue_size: int = 10_000,
+        stats_interval: float = 10.0,
+        on_stats: Callable[[CollectorStats], Any] | None = None,
+        on_error: Callable[[str, BaseException], Any] | None = None,
+        session_factory: SessionFactory | None = None,
+        **session_kwargs: Any,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if isinstance(config, target_pb2.Configuration):
+            config = configured_targets(config)
+        self.targets = list(config)
+        self.sinks = list(sinks)
+        self.concurrency = concurrency
+        self.policy = policy or ReconnectPolicy()
+        self.queue_size = queue_size
+        self.stats_interval = stats_interval
+        self.on_stats = on_stats
+        self.on_error = on_error
+        self.stats = {t.name: TargetStats() for t in self.targets}
+
+        if session_factory is None:
+
+            def session_factory(target: CollectorTarget) -> AsyncSession:
+                return AsyncSession(
+                    target.address, metadata=target.metadata, **session_kwargs
+                )
+
+        self._session_factory = session_factory
+        self._stop: asyncio.Event | None = None
+
+    def stop(self) -> None:
+        """Ask :meth:`run` to shut down, safe to call from a signal handler."""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self) -> None:
+        """Collect until :meth:`stop` is called or every subscription ended.
+
+        On the way out the subscriptions are cancelled, the responses already
+        queued are delivered and the sinks are closed. An error raised by a
+        sink stops the collector and is raised from here.
+        """
+        self._stop = asyncio.Event()
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        startup = asyncio.Semaphore(self.concurrency)
+
+        streams = [
+            asyncio.create_task(self._collect(t, queue, startup)) for t in self.targets
+        ]
+        dispatcher = asyncio.create_task(self._dispatch(queue))
+        reporter = asyncio.create_task(self._report())
+        stopper = asyncio.create_task(self._stop.wait())
+        ended = asyncio.gather(*streams, return_exceptions=True)
+        try:
+            if streams:
+                await asyncio.wait(
+                    [stopper, dispatcher, ended], return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in (*streams, stopper, reporter):
+                task.cancel()
+            await asyncio.gather(ended, stopper, reporter, return_exceptions=True)
+            try:
+                if not dispatcher.done():
+                    await queue.put(None)
+                await dispatcher
+            finally:
+                for sink in self.sinks:
+                    await sink.close()
+
+    async def _collect(
+        self,
+        target: CollectorTarget,
+        queue: asyncio.Queue,
+        startup: asyncio.Semaphore,
+    ) -> None:
+        stats = self.stats[target.name]
+        await startup.acquire()
+        starting = True
+        try:
+            async with self._session_factory(target) as sess:
+                sub = AsyncResilientSubscription(
+                    sess,
+                    list(target.request.subscribe.subscription),
+                    self.policy,
+                    decode="proto",
+                    **_subscribe_kwargs(target.request),
+                )
+                async for item in sub:
+                    if starting:
+                        starting = False
+                        startup.release()
+                    if isinstance(item, SubscriptionEvent):
+                        _on_event(stats, item)
+                    else:
+                        _on_response(stats, item)
+                    await queue.put((target.name, item))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            stats.connected = False
+            stats.error = exc
+            if self.on_error is not None:
+                self.on_error(target.name, exc)
+        finally:
+            if starting:
+                startup.release()
+
+    async def _dispatch(self, queue: asyncio.Queue) -> None:
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return
+            name, item = entry
+            if isinstance(item, pb.SubscribeResponse):
+                item = SubscribeResponse.decode(item)
+            for sink in self.sinks:
+                await sink.send(name, item)
+
+    async def _report(self) -> None:
+        if self.on_stats is None or self.stats_interval <= 0:
+            return
+        last = self.snapshot()
+        last_at = time.monotonic()
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            now = time.monotonic()
+            current = self.snapshot()
+            elapsed = now - last_at or 1e-9
+            current.interval = elapsed
+            current.updates_per_sec = (current.updates - last.updates) / elapsed
+            current.bytes_per_sec = (current.bytes - last.bytes) / elapsed
+            self.on_stats(current)
+            last, last_at = current, now
+
+    def snapshot(self) -> CollectorStats:
+        """Totals so far, without rates."""
+        stats = CollectorStats(
+            targets={k: TargetStats(**vars(v)) for k, v in self.stats.items()}
+        )
+        for t in self.stats.values():
+            stats.responses += t.responses
+            stats.updates += t.updates
+            stats.bytes += t.bytes
+        return stats
+
+
+def _on_event(stats: TargetStats, event: SubscriptionEvent) -> None:
+    if event.kind is EventKind.DISCONNECTED:
+        stats.connected = False
+        stats.synced = False
+        stats.error = event.error
+    elif event.kind is EventKind.RECONNECTED:
+        stats.reconnects += 1
+    elif event.kind is EventKind.SYNCED:
+        stats.synced = True
+
+
+def _on_response(stats: TargetStats, resp: pb.SubscribeResponse) -> None:
+    stats.connected = True
+    stats.responses += 1
+    stats.bytes += resp.ByteSize()
+    if resp.HasField("update"):
+        notif = resp.update
+        stats.updates += len(notif.update) + len(notif.delete)
+        if notif.timestamp:
+            stats.lag = max(0.0, time.time() - notif.timestamp / 1e9)
+
+
+__all__ = [
+    "CacheSink",
+    "CallbackSink",
+    "Collector",
+    "CollectorStats",
+    "CollectorTarget",
+    "JsonLinesSink",
+    "NullSink",
+    "Sink",
+    "TargetStats",
+    "configured_targets",
+    "load_configuration",
+    "parse_configuration",
+    "sink_factory",
+]
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""Columnar decoding of subscribe streams into NumPy arrays.
+
+Requires the optional ``numpy`` dependency (``pip install gnmi[numpy]``).
+"""
+
+from dataclasses import dataclass
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "gnmi.columnar requires numpy, install it with 'pip install gnmi[numpy]'"
+    ) from exc
+
+from gnmi.models.path import Path, PathTable
+from gnmi.models.value import Value
+from gnmi.proto import gnmi_pb2 as pb
+
+_INT64_MAX = 2**63 - 1
+
+# TypedValue fields that go into the numeric column, and their kind:
+# "u" unsigned, "i" signed, "f" floating point
+_NUMERIC = {
+    "uint_val": "u",
+    "int_val": "i",
+    "double_val": "f",
+    "float_val": "f",
+}
+
+
+@dataclass
+class ColumnarBatch:
+    """Updates of a window of responses, one row per update.
+
+    ``value`` holds the numeric (``uint_val``, ``int_val``, ``double_val``,
+    ``float_val``) updates where ``numeric`` is set. Its dtype is the
+    narrowest that holds every number in the batch exactly where possible:
+    ``uint64`` or ``int64`` for integers only, ``float64`` once a float is
+    seen or when signed and unsigned integers don't both fit ``int64``.
+    Other rows are ``0`` (``NaN`` for ``float64``) and their decoded
+    :class:`Value` is in ``objects`` instead, which is ``None`` for numeric
+    rows. ``path_id`` indexes into ``table``. Deletes are not included.
+    """
+
+    timestamp: "np.ndarray"
+    path_id: "np.ndarray"
+    value: "np.ndarray"
+    numeric: "np.ndarray"
+    objects: "np.ndarray"
+    table: PathTable
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def path(self, row: int) -> Path:
+        """Return the full path of ``row``."""
+        return self.table.lookup(int(self.path_id[row]))
+
+
+class ColumnarDecoder:
+    """Decode windows of ``SubscribeResponse`` messages column by column.
+
+    Paths (prefix included) are interned in ``table`` so the IDs stay
+    stable across batches decoded by the same decoder, or by decoders
+    sharing a table.
+    """
+
+    def __init__(self, table: PathTable | None = None):
+        self.table = table if table is not None else PathTable()
+        self._ids: dict[tuple[bytes, bytes], int] = {}
+
+    def _path_id(self, prefix: pb.Path, prefix_wire: bytes, path: pb.Path) -> int:
+        key = (prefix_wire, path.SerializeToString(deterministic=True))
+        pid = self._ids.get(key)
+        if pid is None:
+            full = pb.Path(
+                origin=prefix.origin or path.origin,
+                target=prefix.target or path.target,
+                elem=list(prefix.elem) + list(path.elem),
+            )
+            pid = self._ids[key] = self.table.decode_id(full)
+        return pid
+
+    def decode(
+        self, responses: Iterable[pb.SubscribeResponse | bytes]
+    ) -> ColumnarBatch:
+        """Decode ``responses``, raw serialized ones included.
+
+        ``sync_response`` messages are skipped.
+        """
+        timestamps: list[int] = []
+        path_ids: list[int] = []
+        numbers: list[int | float] = []
+        numeric: list[bool] = []
+        objects: list[Value | None] = []
+        kinds: set[str] = set()
+        max_uint = 0
+
+        for resp in responses:
+            if isinstance(resp, bytes):
+                resp = pb.SubscribeResponse.FromString(resp)
+            if not resp.HasField("update"):
+                continue
+
+            notif = resp.update
+            ts = notif.timestamp
+            prefix = notif.prefix
+            prefix_wire = prefix.SerializeToString(deterministic=True)
+            for upd in notif.update:
+                timestamps.append(ts)
+                path_ids.append(self._path_id(prefix, prefix_wire, upd.path))
+
+                val = upd.val
+                which = val.WhichOneof("value")
+                kind = _NUMERIC.get(which)  # type: ignore[arg-type]
+                if kind is None:
+                    numbers.append(0)
+                    numeric.append(False)
+                    objects.append(Value.decode(val))
+                    continue
+
+                num = getattr(val, which)  # type: ignore[arg-type]
+                if kind == "u" and num > max_uint:
+                    max_uint = num
+                kinds.add(kind)
+                numbers.append(num)
+                numeric.append(True)
+                objects.append(None)
+
+        mask = np.array(numeric, dtype=bool)
+        value = np.array(numbers, dtype=_value_dtype(kinds, max_uint))
+        if value.dtype.kind == "f":
+            value[~mask] = np.nan
+
+        obj = np.empty(len(objects), dtype=object)
+        obj[:] = objects
+
+        return ColumnarBatch(
+            timestamp=np.array(timestamps, dtype=np.int64),
+            path_id=np.array(path_ids, dtype=np.int64),
+            value=value,
+            numeric=mask,
+            objects=obj,
+            table=self.table,
+        )
+
+
+def _value_dtype(kinds: set[str], max_uint: int) -> "np.dtype":
+    if "f" in kinds:
+        return np.dtype(np.float64)
+    if kinds == {"u"}:
+        return np.dtype(np.uint64)
+    if "u" in kinds and max_uint > _INT64_MAX:
+        return np.dtype(np.float64)
+    return np.dtype(np.int64)
+
+
+def decode_columnar(
+    responses: Iterable[pb.SubscribeResponse | bytes], table: PathTable | None = None
+) -> ColumnarBatch:
+    """Decode ``responses`` into a :class:`ColumnarBatch`.
+
+    Shortcut for ``ColumnarDecoder(table).decode(responses)``.
+    """
+    return ColumnarDecoder(table).decode(responses)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+"""Spread subscribe response decoding over a process pool.
+
+Decoding responses into models is CPU bound and holds the GIL, so a single
+collector process tops out at one core. :class:`DecodePool` keeps the I/O
+in the event loop, reading raw responses (``decode="none"``), and decodes
+them in worker processes, batch by batch::
+
+    with DecodePool(processes=8) as pool:
+        raw = sess.subscribe(paths, decode="none")
+        async for resp in pool.decode(raw):
+            for path, value in resp.updates:
+                ...
+
+Shipping models back from the workers would cost about as much to unpickle
+as decoding them in place did, so workers return :class:`DecodedResponse`
+tuples of plain strings and values instead. Each stream's responses come
+back in the order they were received.
+"""
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+from typing import Any, AsyncIterable, AsyncIterator, NamedTuple, Sequence
+
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+
+
+class DecodedResponse(NamedTuple):
+    """Compact, picklable form of a decoded ``SubscribeResponse``.
+
+    ``updates`` pairs each update's path (relative to ``prefix``) with its
+    decoded value, ``deletes`` are paths too.
+    """
+
+    timestamp: int
+    target: str
+    prefix: str
+    updates: list[tuple[str, Any]]
+    deletes: list[str]
+    sync_response: bool
+
+
+def decode_response(raw: bytes) -> DecodedResponse:
+    """Decode one serialized ``SubscribeResponse``, in this process."""
+    resp = SubscribeResponse.decode(pb.SubscribeResponse.FromString(raw))
+    notif = resp.update
+    prefix = notif.prefix
+    return DecodedResponse(
+        timestamp=notif.timestamp,
+        target=prefix.target if prefix else "",
+        prefix=str(prefix) if prefix else "",
+        updates=[(str(u.path), u.value.value) for u in notif.updates],
+        deletes=[str(d) for d in notif.deletes],
+        sync_response=resp.sync_response,
+    )
+
+
+def decode_batch(raws: Sequence[bytes]) -> list[DecodedResponse]:
+    return [decode_response(raw) for raw in raws]
+
+
+class DecodePool:
+    """Process pool decoding raw subscribe responses.
+
+    :param processes: worker processes, defaults to the number of CPUs
+    :param batch_size: responses sent to a worker at a time
+    :param max_delay: seconds a partial batch may wait for more responses
+        before it is sent anyway, bounding the latency a quiet stream adds
+    :param max_pending: batches of one stream in flight before reading
+        pauses, defaults to twice ``processes``
+    :param start_method: ``multiprocessing`` start method of the workers.
+        ``spawn`` by default, since forking a process with live gRPC
+        channels is not safe
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        batch_size: int = 256,
+        max_delay: float = 0.05,
+        max_pending: int | None = None,
+        start_method: str = "spawn",
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending or 2 * self.processes
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context(start_method)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def decode_batch(self, raws: Sequence[bytes]) -> list[DecodedResponse]:
+        """Decode ``raws`` in a worker."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, decode_batch, list(raws))
+
+    async def decode(
+        self, source: AsyncIterable[bytes]
+    ) -> AsyncIterator[DecodedResponse]:
+        """Decode a stream of serialized responses, preserving its order.
+
+        Batches are decoded concurrently but yielded in the order they were
+        read. Closing the iterator stops reading ``source``.
+        """
+        loop = asyncio.get_running_loop()
+        # decoded batches in stream order, ``None`` marks the end
+        batches: asyncio.Queue[asyncio.Future | None] = asyncio.Queue(self.max_pending)
+
+        async def read() -> None:
+            it = source.__aiter__()
+            batch: list[bytes] = []
+            nxt: asyncio.Future | None = None
+
+            async def flush() -> None:
+                nonlocal batch
+                if batch:
+                    await batches.put(
+                        loop.run_in_executor(self._executor, decode_batch, batch)
+                    )
+                    batch = []
+
+            try:
+                while True:
+                    if nxt is None:
+                        nxt = asyncio.ensure_future(it.__anext__())
+                    done, _ = await asyncio.wait(
+                        {nxt}, timeout=self.max_delay if batch else None
+                    )
+                    if not done:
+                        await flush()
+                        continue
+                    try:
+                        raw = nxt.result()
+                    except StopAsyncIteration:
+                        break
+                    except Exception:
+                        # responses read before the failure go out first
+                        await flush()
+                        raise
+                    nxt = None
+                    batch.append(raw)
+                    if len(batch) >= self.batch_size:
+                        await flush()
+                await flush()
+            except Exception as exc:
+                failed = loop.create_future()
+                failed.set_exception(exc)
+                await batches.put(failed)
+            finally:
+                if nxt is not None and not nxt.done():
+                    nxt.cancel()
+            await batches.put(None)
+
+        reader = asyncio.create_task(read())
+        try:
+            while True:
+                fut = await batches.get()
+                if fut is None:
+                    break
+                for resp in await fut:
+                    yield resp
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
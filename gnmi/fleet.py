@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""Run the same RPC against many targets.
+
+:class:`Fleet` fans an async operation out over a list of targets with
+bounded concurrency, a per-target deadline and retries with jittered
+exponential backoff. Failures are isolated: every target yields exactly
+one :class:`FleetResult`, streamed back as it completes::
+
+    fleet = Fleet(targets, concurrency=200, timeout=20, insecure=True)
+    async for res in fleet.get(["/system/state/hostname"]):
+        if res.ok:
+            ...
+
+:meth:`Fleet.run_sync` does the same from synchronous code on a background
+event loop thread.
+"""
+
+import asyncio
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
+
+import grpc
+
+from gnmi.async_session import AsyncSession
+from gnmi.models.capabilities import CapabilityResponse
+from gnmi.models.get import GetResponse
+from gnmi.models.set import SetResponse
+from gnmi.models.target import TargetLike
+
+T = TypeVar("T")
+
+SessionFactory = Callable[[TargetLike], AsyncSession]
+
+# status codes worth trying again: the target (or the path to it) is
+# temporarily unable to serve, the request itself is fine
+RETRYABLE_CODES = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+    }
+)
+
+
+@dataclass
+class FleetResult(Generic[T]):
+    """Outcome of an operation against one target.
+
+    Exactly one of ``value`` / ``error`` is set. ``attempts`` counts tries
+    (1 when the first one settled it) and ``elapsed`` is the wall time in
+    seconds spent on the target, backoff included.
+    """
+
+    target: str
+    value: T | None = None
+    error: BaseException | None = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Fleet:
+    """Fan operations out over ``targets``.
+
+    :param targets: targets to run against
+    :param concurrency: maximum number of targets in flight (and so of
+        open channels) at any time
+    :param timeout: deadline in seconds for each attempt against a target,
+        session setup included. ``None`` waits forever
+    :param retries: extra attempts after a retryable failure: a timeout or
+        a gRPC error whose code is in ``retry_codes``
+    :param backoff: base delay in seconds before the first retry, doubled
+        for every further one up to ``max_backoff``. The actual delay is
+        drawn uniformly between zero and that value (full jitter), so
+        targets failing together don't retry in lockstep
+    :param session_factory: callable building the :class:`AsyncSession`
+        for a target, defaults to ``AsyncSession(target, **session_kwargs)``
+    """
+
+    def __init__(
+        self,
+        targets: Iterable[TargetLike],
+        *,
+        concurrency: int = 100,
+        timeout: float | None = 30.0,
+        retries: int = 0,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        retry_codes: Iterable[grpc.StatusCode] = RETRYABLE_CODES,
+        session_factory: SessionFactory | None = None,
+        **session_kwargs: Any,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.targets = list(targets)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_codes = frozenset(retry_codes)
+
+        if session_factory is None:
+
+            def session_factory(target: TargetLike) -> AsyncSession:
+                return AsyncSession(target, **session_kwargs)
+
+        self._session_factory = session_factory
+
+    async def run(
+        self, op: Callable[[AsyncSession], Awaitable[T]]
+    ) -> AsyncIterator[FleetResult[T]]:
+        """Run ``op`` against every target, yield results as they complete.
+
+        Targets are started in order by ``concurrency`` workers, so at most
+        that many sessions are open and at most that many results are
+        buffered when the consumer falls behind. Closing the iterator early
+        cancels the outstanding work.
+        """
+        pending = iter(self.targets)
+        results: asyncio.Queue[FleetResult[T] | None] = asyncio.Queue(
+            maxsize=self.concurrency
+        )
+
+        async def worker() -> None:
+            for target in pending:
+                await results.put(await self._run_one(target, op))
+            await results.put(None)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.concurrency, len(self.targets)))
+        ]
+        try:
+            running = len(workers)
+            while running:
+                res = await results.get()
+                if res is None:
+                    running -= 1
+                    continue
+                yield res
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _run_one(
+        self, target: TargetLike, op: Callable[[AsyncSession], Awaitable[T]]
+    ) -> FleetResult[T]:
+        result: FleetResult[T] = FleetResult(target=str(target))
+        start = time.monotonic()
+        while True:
+            result.attempts += 1
+            try:
+                result.value = await asyncio.wait_for(
+                    self._attempt(target, op), self.timeout
+                )
+                result.error = None
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                result.error = exc
+                if result.attempts > self.retries or not self._retryable(exc):
+                    break
+            await asyncio.sleep(self._delay(result.attempts))
+
+        result.elapsed = time.monotonic() - start
+        return result
+
+    async def _attempt(
+        self, target: TargetLike, op: Callable[[AsyncSession], Awaitable[T]]
+    ) -> T:
+        async with self._session_factory(target) as sess:
+            return await op(sess)
+
+    def _retryable(self, exc: BaseException) -> bool:
+        if isinstance(exc, asyncio.TimeoutError):
+            return True
+        if isinstance(exc, grpc.RpcError):
+            return exc.code() in self.retry_codes  # type: ignore[attr-defined]
+        return False
+
+    def _delay(self, attempt: int) -> float:
+        cap = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def capabilities(self) -> AsyncIterator[FleetResult[CapabilityResponse]]:
+        """Capabilities of every target, see :meth:`AsyncSession.capabilities`."""
+        return self.run(lambda sess: sess.capabilities())
+
+    def get(self, paths, **kwargs: Any) -> AsyncIterator[FleetResult[GetResponse]]:
+        """Get ``paths`` from every target, see :meth:`AsyncSession.get`.
+
+        ``prefix`` may be a callable taking the target and returning the
+        prefix, e.g. to set the prefix target per device.
+        """
+        prefix = kwargs.pop("prefix", None)
+
+        async def op(sess: AsyncSession) -> GetResponse:
+            pfx = prefix(sess._target) if callable(prefix) else prefix
+            return await sess.get(paths, prefix=pfx, **kwargs)
+
+        return self.run(op)
+
+    def set(self, **kwargs: Any) -> AsyncIterator[FleetResult[SetResponse]]:
+        """Apply the same set to every target, see :meth:`AsyncSession.set`."""
+        return self.run(lambda sess: sess.set(**kwargs))
+
+    def run_sync(
+        self, op: Callable[[AsyncSession], Awaitable[T]]
+    ) -> Iterator[FleetResult[T]]:
+        """Blocking version of :meth:`run` for synchronous callers.
+
+        The fleet runs on a background event loop thread shared by all sync
+        runs. Results are yielded as they complete, at most ``concurrency``
+        of them are buffered for a slow consumer like in :meth:`run`.
+        Closing the iterator early cancels the remaining work.
+        """
+        loop = _background_loop()
+        out: queue.Queue = queue.Queue(maxsize=self.concurrency)
+        done = object()
+        # a free slot in ``out``, released by the consumer after each get so
+        # the pump waits on the loop rather than blocking it in ``put``
+        slots: asyncio.Semaphore
+
+        async def pump() -> None:
+            nonlocal slots
+            slots = asyncio.Semaphore(self.concurrency)
+            try:
+                async for res in self.run(op):
+                    await slots.acquire()
+                    out.put_nowait(res)
+            except asyncio.CancelledError:
+                raise  # the consumer is gone
+            except BaseException:
+                await slots.acquire()
+                out.put_nowait(done)
+                raise
+            await slots.acquire()
+            out.put_nowait(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                item = out.get()
+                loop.call_soon_threadsafe(slots.release)
+                if item is done:
+                    break
+                yield item
+            future.result()
+        finally:
+            future.cancel()
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="gnmi-fleet", daemon=True
+            ).start()
+        return _loop
@@ -1,10 +1,45 @@
-import json
+import re
+from typing import Any
+
+from gnmi import codec
 from gnmi.models.capabilities import CapabilityResponse
 from gnmi.models.notification import Notification
+from gnmi.models.value import JsonValue, Value
+
+# Stand-in for a pre-serialized JSON payload inside the output object.
+# Every codec backend escapes the NULs, so a real string would need embedded NULs
+# and this exact text to collide with it.
+_RAW_MARK = "\x00gnmi-raw:{}\x00"
+_RAW_RE = re.compile(r'"\\u0000gnmi-raw:(\d+)\\u0000"')
+
+
+def json_value(value: Value, raw: list[str]) -> Any:
+    """Return ``value`` ready for :func:`dumps`.
+
+    Deferred JSON payloads (:class:`JsonValue`) are not parsed; their raw
+    text is collected in ``raw`` and spliced back in by :func:`dumps`.
+    """
+    if isinstance(value, JsonValue):
+        # JSON strings can't hold raw line breaks, so this only touches
+        # insignificant whitespace and keeps the output on one line.
+        text = value.raw_json.decode("utf-8").replace("\n", " ").replace("\r", " ")
+        raw.append(text)
+        return _RAW_MARK.format(len(raw) - 1)
+    return value.to_json()
+
+
+def dumps(obj: Any, raw: list[str]) -> str:
+    """:func:`gnmi.codec.dumps` that splices in payloads collected by
+    :func:`json_value`."""
+    out = codec.dumps(obj)
+    if not raw:
+        return out
+    return _RAW_RE.sub(lambda m: raw[int(m.group(1))], out)
 
 
 class JsonNotification:
     def send(self, data: Notification) -> None:
+        raw: list[str] = []
         target = str(data.prefix.target) if data.prefix and data.prefix.target else ""
         out = {
             "timestamp": data.timestamp,
@@ -18,18 +53,18 @@ class JsonNotification:
             out["updates"].append(
                 {
                     "path": str(update.path),
-                    "val": update.value.to_json(),
+                    "val": json_value(update.value, raw),
                 }
             )
         for delete in data.deletes:
             out["deletes"].append({"path": str(delete)})
-        print(json.dumps(out))
+        print(dumps(out, raw))
 
 
 class JsonCapabilities:
     def send(self, data: CapabilityResponse) -> None:
         print(
-            json.dumps(
+            codec.dumps(
                 {
                     "gnmi_version": data.gnmi_version,
                     "supported_encodings": [e.name for e in data.supported_encodings],
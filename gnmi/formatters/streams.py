@@ -1,5 +1,6 @@
-import json
+from gnmi import codec
 from gnmi.models.notification import Notification
+from gnmi.formatters.json import dumps, json_value
 from gnmi.util import datetime_from_int64
 from rich.console import Console
 from rich.markup import escape
@@ -29,14 +30,15 @@ class JsonLinesNotification:
         prefix = str(data.prefix)
         atomic = data.atomic
         for update in data.updates:
+            raw: list[str] = []
             out = {
                 "timestamp": timestamp,
                 "prefix": prefix,
                 "atomic": atomic,
                 "path": str(update.path),
-                "val": update.value.to_json(),
+                "val": json_value(update.value, raw),
             }
-            print(json.dumps(out))
+            print(dumps(out, raw))
         for delete in data.deletes:
             out = {
                 "timestamp": timestamp,
@@ -45,4 +47,4 @@ class JsonLinesNotification:
                 "path": str(delete),
                 "deleted": True,
             }
-            console.print_json(json.dumps(out), indent=0)
+            console.print_json(codec.dumps(out), indent=0)
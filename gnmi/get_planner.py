@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""Split large Get requests into concurrent chunks.
+
+A ``Get`` for thousands of paths comes back as one ``GetResponse`` that
+easily outgrows gRPC's 4 MB default receive limit, and is built and sent
+by the target in one go. :class:`GetPlanner` splits the paths into chunks,
+runs them concurrently over the session's channel and merges the
+notifications back into a single :class:`GetResponse`::
+
+    resp = sess.get(paths, planner=GetPlanner(max_paths=50, concurrency=8))
+"""
+
+import asyncio
+import concurrent.futures
+from typing import Awaitable, Callable, Sequence
+
+import grpc
+
+from gnmi.models.get import GetResponse
+from gnmi.models.path import PathLike, path_factory
+
+GetChunk = Callable[[Sequence[PathLike]], GetResponse]
+AsyncGetChunk = Callable[[Sequence[PathLike]], Awaitable[GetResponse]]
+
+
+class GetPlanner:
+    """Plan and run chunked Get requests.
+
+    :param max_paths: most paths in one request
+    :param concurrency: most requests in flight at once
+    :param by_subtree: order paths by their string form before chunking, so
+        paths under the same subtree land in the same request. Otherwise
+        chunks follow the order the paths were given in
+    :param split_on_exhausted: when a chunk fails with
+        ``RESOURCE_EXHAUSTED`` (usually a response over the receive limit),
+        split it in halves and retry those, down to single paths
+    :param max_bytes: most bytes of encoded paths in one request, a single
+        larger path still goes in a request of its own
+
+    The notifications of the merged response are in chunk order. The first
+    failing chunk's error is raised and the chunks still pending are
+    cancelled.
+    """
+
+    def __init__(
+        self,
+        max_paths: int = 64,
+        concurrency: int = 8,
+        by_subtree: bool = True,
+        split_on_exhausted: bool = True,
+        max_bytes: int | None = None,
+    ):
+        if max_paths < 1:
+            raise ValueError("max_paths must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.max_paths = max_paths
+        self.concurrency = concurrency
+        self.by_subtree = by_subtree
+        self.split_on_exhausted = split_on_exhausted
+        self.max_bytes = max_bytes
+
+    def plan(self, paths: Sequence[PathLike]) -> list[list[PathLike]]:
+        """Split ``paths`` into the chunks that will be requested."""
+        ordered = list(paths)
+        if self.by_subtree:
+            ordered.sort(key=lambda p: str(path_factory(p)))
+        n = self.max_paths
+        if self.max_bytes is None:
+            return [ordered[i : i + n] for i in range(0, len(ordered), n)]
+
+        chunks: list[list[PathLike]] = []
+        chunk: list[PathLike] = []
+        size = 0
+        for path in ordered:
+            # a path's size plus its tag and length prefix, roughly
+            path_size = path_factory(path).encode().ByteSize() + 4
+            if chunk and (len(chunk) >= n or size + path_size > self.max_bytes):
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(path)
+            size += path_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _splittable(self, exc: grpc.RpcError, chunk: Sequence[PathLike]) -> bool:
+        return (
+            self.split_on_exhausted
+            and len(chunk) > 1
+            and exc.code() == grpc.StatusCode.RESOURCE_EXHAUSTED  # type: ignore[attr-defined]
+        )
+
+    def execute(self, get: GetChunk, paths: Sequence[PathLike]) -> GetResponse:
+        """Run the plan for ``paths`` with ``get`` on a thread pool."""
+        chunks = self.plan(paths)
+        if len(chunks) <= 1:
+            return self._run(get, chunks[0] if chunks else [])
+
+        with concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+            futures = [executor.submit(self._run, get, c) for c in chunks]
+            try:
+                return _merge([f.result() for f in futures])
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _run(self, get: GetChunk, chunk: Sequence[PathLike]) -> GetResponse:
+        try:
+            return get(chunk)
+        except grpc.RpcError as exc:
+            if not self._splittable(exc, chunk):
+                raise
+        half = len(chunk) // 2
+        return _merge([self._run(get, chunk[:half]), self._run(get, chunk[half:])])
+
+    async def aexecute(
+        self, get: AsyncGetChunk, paths: Sequence[PathLike]
+    ) -> GetResponse:
+        """Async :meth:`execute`, running the chunks as tasks."""
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def run(chunk: Sequence[PathLike]) -> GetResponse:
+            async with sem:
+                try:
+                    return await get(chunk)
+                except grpc.RpcError as exc:
+                    if not self._splittable(exc, chunk):
+                        raise
+            half = len(chunk) // 2
+            return _merge(await _gather([run(chunk[:half]), run(chunk[half:])]))
+
+        chunks = self.plan(paths) or [[]]
+        return _merge(await _gather([run(c) for c in chunks]))
+
+
+async def _gather(coros: list[Awaitable[GetResponse]]) -> list[GetResponse]:
+    # like a TaskGroup (3.11+): the first error cancels the other tasks
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _merge(responses: list[GetResponse]) -> GetResponse:
+    if len(responses) == 1:
+        return responses[0]
+    notifications: list = []
+    for resp in responses:
+        notifications.extend(resp.notifications)
+    return GetResponse(notifications=notifications)
+
+
+PlannerLike = GetPlanner | bool | None
+
+
+def planner_factory(planner: PlannerLike) -> GetPlanner | None:
+    """Resolve a ``planner`` argument, ``True`` is a default planner."""
+    if isinstance(planner, GetPlanner):
+        return planner
+    return GetPlanner() if planner else None
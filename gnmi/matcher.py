@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+"""Match paths against a compiled set of path patterns.
+
+Subscribing to a broad subtree and keeping only some of it used to mean
+comparing strings per update. :class:`PathMatcher` compiles its patterns
+once into a tree shared by all of them, and tests ``Path`` models or raw
+``pb.Path`` messages element by element, without stringifying them::
+
+    matcher = PathMatcher([
+        "/interfaces/interface[name=Ethernet*]/state/counters",
+        "/system/state/hostname",
+    ])
+    for resp in sess.subscribe(["/"], filter=matcher):
+        ...
+
+A pattern matches a path at or below it, like a subscription path.
+Patterns may use ``*`` for an element name, ``...`` for any number of
+levels and, for key values, ``*`` (any value, the key must be present) or
+a glob such as ``Ethernet*`` or ``Ethernet?/1``. Keys a pattern doesn't
+name may take any value.
+
+:meth:`match` and :meth:`matches` look at the path alone. When filtering
+notifications, an update holding a JSON subtree or a delete at a path
+above a pattern is kept as is, since its value may hold matching leaves.
+With ``...`` patterns that keeps every such update below the pattern's
+fixed part.
+
+Patterns sharing an element share a branch, and exact names and key values
+are dict lookups, so the cost of a match follows the path's length and the
+wildcards it meets rather than the number of patterns.
+"""
+
+import fnmatch
+import re
+from typing import Any, Callable, Iterable, Sequence
+
+from gnmi.models.path import Path, PathElem, PathLike, path_factory
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.trie import MULTI_LEVEL, WILDCARD
+
+_GLOB_CHARS = frozenset("*?")
+
+# values that may hold a whole subtree below the update's path
+_TREE_VALUES = frozenset(("json_val", "json_ietf_val"))
+
+KeyPredicate = Callable[[str | None], bool]
+
+
+def _key_predicate(value: str) -> KeyPredicate:
+    if value == WILDCARD:
+        return lambda v: v is not None
+    match = re.compile(fnmatch.translate(value)).match
+    return lambda v: v is not None and match(v) is not None
+
+
+def _key_get(key: Any, name: str) -> str | None:
+    """``name``'s value in a ``pb.PathElem`` key map or in the sorted
+    ``(key, value)`` pairs of a ``PathElem`` model.
+    """
+    if type(key) is tuple:
+        for k, v in key:
+            if k == name:
+                return v
+        return None
+    return key.get(name)
+
+
+class _State:
+    __slots__ = ("children", "ends", "loop", "multi", "wild")
+
+    def __init__(self, loop: bool = False):
+        # exact element name -> branch
+        self.children: dict[str, _Branch] = {}
+        # ``*`` element name
+        self.wild: _Branch | None = None
+        # state after a ``...``, it consumes any element and stays active
+        self.multi: _State | None = None
+        self.loop = loop
+        # indices of the patterns ending here
+        self.ends: list[int] = []
+
+
+class _Branch:
+    """The states after one element name, by the element's key constraints."""
+
+    __slots__ = ("any", "exact", "preds")
+
+    def __init__(self):
+        # no keys in the pattern
+        self.any: _State | None = None
+        # key names -> key values -> state
+        self.exact: dict[tuple[str, ...], dict[tuple[str, ...], _State]] = {}
+        # wildcard or glob key values, tested one by one
+        self.preds: list[tuple[tuple[tuple[str, KeyPredicate], ...], _State]] = []
+
+    def add(self, keys: tuple[tuple[str, str], ...]) -> _State:
+        if not keys:
+            if self.any is None:
+                self.any = _State()
+            return self.any
+
+        if not any(_GLOB_CHARS.intersection(v) for _, v in keys):
+            names = tuple(k for k, _ in keys)
+            values = tuple(v for _, v in keys)
+            table = self.exact.setdefault(names, {})
+            state = table.get(values)
+            if state is None:
+                state = table[values] = _State()
+            return state
+
+        state = _State()
+        self.preds.append((tuple((k, _key_predicate(v)) for k, v in keys), state))
+        return state
+
+    def step(self, e: Any, out: list) -> None:
+        if self.any is not None:
+            out.append(self.any)
+        if not self.exact and not self.preds:
+            return
+        key = e.keys if isinstance(e, PathElem) else e.key
+        for names, table in self.exact.items():
+            values = tuple(_key_get(key, k) for k in names)
+            state = table.get(values)  # type: ignore[arg-type]
+            if state is not None:
+                out.append(state)
+        for preds, state in self.preds:
+            if all(pred(_key_get(key, k)) for k, pred in preds):
+                out.append(state)
+
+
+class PathMatcher:
+    """A compiled set of path patterns.
+
+    :param patterns: paths in any form ``path_factory`` accepts. Origin and
+        target are not matched
+
+    :meth:`match` reports which patterns a path matches,
+    :meth:`matches` only whether any does.
+    """
+
+    def __init__(self, patterns: Iterable[PathLike]):
+        self.patterns: list[Path] = [path_factory(p) for p in patterns]
+        self._root = _State()
+        for i, pattern in enumerate(self.patterns):
+            self._compile(i, pattern.elem)
+        self._start = _closure([self._root])
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __repr__(self) -> str:
+        return f"PathMatcher({[str(p) for p in self.patterns]!r})"
+
+    def _compile(self, index: int, elem: Sequence[PathElem]) -> None:
+        state = self._root
+        for e in elem:
+            if e.name == MULTI_LEVEL:
+                if state.multi is None:
+                    state.multi = _State(loop=True)
+                state = state.multi
+                continue
+            if e.name == WILDCARD:
+                if state.wild is None:
+                    state.wild = _Branch()
+                branch = state.wild
+            else:
+                branch = state.children.get(e.name)
+                if branch is None:
+                    branch = state.children[e.name] = _Branch()
+            state = branch.add(e.keys)
+        state.ends.append(index)
+
+    def match(
+        self, path: Path | pb.Path, prefix: Path | pb.Path | None = None
+    ) -> list[int]:
+        """Indices into :attr:`patterns` of the patterns ``path`` matches.
+
+        ``path`` is relative to ``prefix``, if given.
+        """
+        states = self._start
+        matched: set[int] = set()
+        for s in states:
+            matched.update(s.ends)
+        for elems in (prefix.elem if prefix is not None else (), path.elem):
+            for e in elems:
+                if not states:
+                    break
+                states = _step(states, e)
+                for s in states:
+                    matched.update(s.ends)
+        return sorted(matched)
+
+    def matches(
+        self, path: Path | pb.Path, prefix: Path | pb.Path | None = None
+    ) -> bool:
+        """Whether ``path`` (relative to ``prefix``) matches any pattern."""
+        states = self._start
+        if prefix is not None:
+            states = self._walk(states, prefix.elem)
+            if states is True:
+                return True
+        return self._walk(states, path.elem) is True
+
+    def _walk(self, states: list, elems: Iterable[Any]) -> list | bool:
+        """Advance ``states`` over ``elems``, ``True`` once a pattern ends."""
+        for s in states:
+            if s.ends:
+                return True
+        for e in elems:
+            if not states:
+                break
+            states = _step(states, e)
+            for s in states:
+                if s.ends:
+                    return True
+        return states
+
+    def _covers(self, states: list, elems: Iterable[Any], subtree: bool) -> bool:
+        """Whether a pattern matches ``elems`` or, if ``subtree``, anything
+        below them.
+        """
+        states = self._walk(states, elems)
+        return states is True or (subtree and bool(states))
+
+    def filter_notification(self, notif: pb.Notification) -> bool:
+        """Drop the updates and deletes of ``notif`` that match no pattern.
+
+        An update with a JSON or JSON_IETF value, or a delete, at a path
+        above a pattern may carry or remove data the pattern matches, so it
+        is kept whole; its value isn't pruned. ``notif`` is changed in
+        place. Returns whether anything is left.
+        """
+        states = self._start
+        if notif.HasField("prefix"):
+            states = self._walk(states, notif.prefix.elem)
+            if states is True:
+                return True
+        if not states:
+            del notif.update[:]
+            del notif.delete[:]
+            return False
+
+        keep = [
+            u
+            for u in notif.update
+            if self._covers(
+                states, u.path.elem, u.val.WhichOneof("value") in _TREE_VALUES
+            )
+        ]
+        if len(keep) != len(notif.update):
+            del notif.update[:]
+            notif.update.extend(keep)
+        keep = [d for d in notif.delete if self._covers(states, d.elem, True)]
+        if len(keep) != len(notif.delete):
+            del notif.delete[:]
+            notif.delete.extend(keep)
+        return bool(notif.update or notif.delete)
+
+    def filter_response(self, resp: pb.SubscribeResponse) -> bool:
+        """Filter a response's notification in place, see
+        :meth:`filter_notification`. ``False`` if it should be dropped;
+        sync responses and errors are always kept.
+        """
+        if not resp.HasField("update"):
+            return True
+        return self.filter_notification(resp.update)
+
+    def filter_bytes(self, raw: bytes) -> bytes | None:
+        """:meth:`filter_response` for a serialized response.
+
+        Returns ``raw`` itself when nothing was filtered out, ``None`` if
+        the response should be dropped.
+        """
+        resp = pb.SubscribeResponse.FromString(raw)
+        if not resp.HasField("update"):
+            return raw
+        notif = resp.update
+        n = len(notif.update) + len(notif.delete)
+        if not self.filter_notification(notif):
+            return None
+        if len(notif.update) + len(notif.delete) == n:
+            return raw
+        return resp.SerializeToString()
+
+
+def _closure(states: list[_State]) -> list[_State]:
+    """``states`` plus the ``...`` states reachable from them."""
+    out: list[_State] = []
+    seen: set[int] = set()
+    stack = list(states)
+    while stack:
+        s = stack.pop()
+        if id(s) in seen:
+            continue
+        seen.add(id(s))
+        out.append(s)
+        if s.multi is not None:
+            stack.append(s.multi)
+    return out
+
+
+def _step(states: list[_State], e: Any) -> list[_State]:
+    nxt: list[_State] = []
+    name = e.name
+    for s in states:
+        if s.loop:
+            nxt.append(s)
+        branch = s.children.get(name)
+        if branch is not None:
+            branch.step(e, nxt)
+        if s.wild is not None:
+            s.wild.step(e, nxt)
+    return _closure(nxt) if nxt else nxt
+
+
+MatcherLike = PathMatcher | Sequence[PathLike] | None
+
+
+def matcher_factory(patterns: MatcherLike) -> PathMatcher | None:
+    """Resolve a ``filter`` argument: a matcher, patterns or ``None``."""
+    if patterns is None or isinstance(patterns, PathMatcher):
+        return patterns
+    if isinstance(patterns, (str, Path, pb.Path)):
+        patterns = [patterns]
+    return PathMatcher(patterns) if patterns else None
@@ -6,14 +6,14 @@ from gnmi.models.encoding import Encoding
 from gnmi.models.error import Error
 from gnmi.models.get import GetRequest, GetResponse, DataType
 from gnmi.models.model_data import ModelData
-from gnmi.models.notification import Notification
+from gnmi.models.notification import LazyNotification, Notification
 from gnmi.models.path import PathElem, Path
-from gnmi.models.set import SetRequest, SetResponse
+from gnmi.models.set import SetRequest, SetRequestBuilder, SetResponse
 from gnmi.models.subscribe import SubscribeRequest, SubscribeResponse
 from gnmi.models.subscription import Subscription, SubscriptionMode
 from gnmi.models.subscription_list import SubscriptionList, SubscriptionListMode
 from gnmi.models.target import Target
-from gnmi.models.update import Update
+from gnmi.models.update import LazyUpdate, Update
 from gnmi.models.update_result import UpdateResult
 from gnmi.models.value import Value, ValueType
 from gnmi.models.status import Status
@@ -26,11 +26,14 @@ __all__ = [
     "DataType",
     "GetRequest",
     "GetResponse",
+    "LazyNotification",
+    "LazyUpdate",
     "ModelData",
     "Notification",
     "Path",
     "PathElem",
     "SetRequest",
+    "SetRequestBuilder",
     "SetResponse",
     "Status",
     "SubscribeRequest",
@@ -10,7 +10,7 @@ from gnmi.proto import gnmi_ext_pb2 as ext_pb2
 from gnmi.models.encoding import EncodingDescriptor
 from gnmi.models.model import BaseModel
 from gnmi.models.model_data import ModelData
-from gnmi.models.notification import Notification
+from gnmi.models.notification import LazyNotification, Notification
 from gnmi.models.error import Error
 
 
@@ -78,7 +78,7 @@ class GetRequest(BaseModel[pb.GetRequest]):
 
 @dataclass
 class GetResponse(BaseModel[pb.GetResponse]):
-    notifications: list[Notification]
+    notifications: list[Notification] | list[LazyNotification]
     error: Error | None = None
     extension: list[ext_pb2.Extension] = field(default_factory=list)
 
@@ -86,7 +86,10 @@ class GetResponse(BaseModel[pb.GetResponse]):
         return pb.GetResponse(notification=[n.encode() for n in self.notifications])
 
     @classmethod
-    def decode(cls, v: pb.GetResponse) -> "GetResponse":
+    def decode(cls, v: pb.GetResponse, lazy: bool = False) -> "GetResponse":
+        if lazy:
+            return cls(notifications=[LazyNotification(n) for n in v.notification])
+
         return cls(
             notifications=[Notification.decode(n) for n in v.notification],
         )
@@ -9,6 +9,9 @@ T = TypeVar("T")
 
 @dataclass
 class BaseModel(Protocol, Generic[T]):
+    # keep slotted models (e.g. Path) free of a per-instance __dict__
+    __slots__ = ()
+
     @abstractmethod
     def encode(self) -> T: ...
 
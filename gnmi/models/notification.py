@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from gnmi.proto import gnmi_pb2 as pb
 from gnmi.models.model import BaseModel
 from gnmi.models.path import Path, Paths, PathDescriptor, path_factory
-from gnmi.models.update import Update, Updates
+from gnmi.models.update import LazyUpdate, Update, Updates
 
 
 @dataclass
@@ -39,12 +39,15 @@ class Notification(BaseModel[pb.Notification]):
         else:
             prefix = None
 
-        return cls(
-            timestamp=v.timestamp,
-            prefix=prefix,
-            updates=[Update.decode(u) for u in v.update],
-            deletes=[Path.decode(d) for d in v.delete],
-        )
+        # Trusted construction, see Update.decode
+        obj = object.__new__(cls)
+        attrs = obj.__dict__
+        attrs["timestamp"] = v.timestamp
+        attrs["_prefix"] = prefix
+        attrs["_updates"] = [Update.decode(u) for u in v.update]
+        attrs["_deletes"] = [Path.decode(d) for d in v.delete]
+        attrs["atomic"] = v.atomic
+        return obj
 
     def encode(self) -> pb.Notification:
         upds = []
@@ -58,6 +61,7 @@ class Notification(BaseModel[pb.Notification]):
             timestamp=self.timestamp,
             update=upds,
             delete=dlts,
+            atomic=self.atomic,
         )
 
         # don't set prefix at all if it is None
@@ -65,3 +69,71 @@ class Notification(BaseModel[pb.Notification]):
             notif.MergeFrom(pb.Notification(prefix=self.prefix.encode()))
 
         return notif
+
+
+class LazyNotification(BaseModel[pb.Notification]):
+    """A read-only :class:`Notification` view backed by a ``pb.Notification``.
+
+    Nothing is decoded up front: ``prefix``, ``updates`` and ``deletes``
+    are built on first access and cached, and each update is a
+    :class:`~gnmi.models.update.LazyUpdate` that defers its own path and
+    value decoding. Select it with ``lazy=True`` on ``Session.subscribe``,
+    ``Session.get`` or ``GetResponse.decode``.
+    """
+
+    __slots__ = ("_deletes", "_pb", "_prefix", "_updates")
+
+    def __init__(self, v: pb.Notification):
+        self._pb = v
+        self._prefix: Path | None = None
+        self._updates: list[LazyUpdate] | None = None
+        self._deletes: list[Path] | None = None
+
+    @property
+    def timestamp(self) -> int:
+        return self._pb.timestamp
+
+    @property
+    def atomic(self) -> bool:
+        return self._pb.atomic
+
+    @property
+    def prefix(self) -> Path | None:
+        if self._prefix is None and self._pb.HasField("prefix"):
+            self._prefix = Path.decode(self._pb.prefix)
+        return self._prefix
+
+    @property
+    def updates(self) -> list[LazyUpdate]:
+        if self._updates is None:
+            self._updates = [LazyUpdate(u) for u in self._pb.update]
+        return self._updates
+
+    @property
+    def deletes(self) -> list[Path]:
+        if self._deletes is None:
+            self._deletes = [Path.decode(d) for d in self._pb.delete]
+        return self._deletes
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyNotification(timestamp={self.timestamp!r}, prefix={self.prefix!r}, "
+            f"deletes={self.deletes!r}, updates={self.updates!r}, "
+            f"atomic={self.atomic!r})"
+        )
+
+    def to_notification(self) -> Notification:
+        return Notification(
+            timestamp=self.timestamp,
+            prefix=self.prefix,
+            updates=[u.to_update() for u in self.updates],
+            deletes=self.deletes,
+            atomic=self.atomic,
+        )
+
+    def encode(self) -> pb.Notification:
+        return self._pb
+
+    @classmethod
+    def decode(cls, v: pb.Notification) -> "LazyNotification":
+        return cls(v)
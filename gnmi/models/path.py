@@ -1,42 +1,102 @@
 # -*- coding: utf-8 -*-
 
-from typing import TypeAlias, Sequence
-
-from dataclasses import dataclass, field
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Iterable, Mapping, NamedTuple, TypeAlias, Sequence
 
 from gnmi.proto import gnmi_pb2 as pb
 from gnmi.util import escape_string
 from gnmi.models.model import BaseModel
+from gnmi._env import env
+
+KeyItems: TypeAlias = tuple[tuple[str, str], ...]
+
+_setattr = object.__setattr__
 
 
-@dataclass
 class PathElem(BaseModel[pb.PathElem]):
+    """A single path element: a name plus an optional key map.
+
+    Immutable and hashable. Keys are stored as a sorted tuple of
+    ``(key, value)`` pairs in ``keys``; ``key`` is a read-only mapping
+    view of the same pairs.
+    """
+
+    __slots__ = ("_hash", "keys", "name")
+
     name: str
-    key: dict[str, str] = field(default_factory=dict)
+    keys: KeyItems
+
+    def __init__(
+        self,
+        name: str,
+        key: Mapping[str, str] | Iterable[tuple[str, str]] | None = None,
+    ):
+        if not key:
+            keys: KeyItems = ()
+        elif isinstance(key, Mapping):
+            keys = tuple(sorted(key.items()))
+        else:
+            keys = tuple(sorted(key))
+
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "keys", keys)
+        object.__setattr__(self, "_hash", hash((name, keys)))
+
+    @property
+    def key(self) -> Mapping[str, str]:
+        return MappingProxyType(dict(self.keys))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.name == other.name
+            and self.keys == other.keys
+        )
+
+    def __repr__(self) -> str:
+        return f"PathElem(name={self.name!r}, key={dict(self.keys)!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.keys))
 
     def __str__(self) -> str:
         elem = escape_string(self.name, "/")
-        for key, val in self.key.items():
+        for key, val in self.keys:
             val = escape_string(val, "]")
             elem += "[" + key + "=" + val + "]"
         return elem
 
     def encode(self) -> pb.PathElem:
-        return pb.PathElem(name=self.name, key=self.key)
+        return pb.PathElem(name=self.name, key=dict(self.keys))
 
     @classmethod
-    def decode(cls, v: pb.PathElem) -> "PathElem":
-        keys = {}
-        for k, val in v.key.items():
-            keys[k] = val
+    def _make(cls, name: str, keys: KeyItems) -> "PathElem":
+        # trusted decode path: ``keys`` is already a sorted tuple of pairs
+        obj = object.__new__(cls)
+        _setattr(obj, "name", name)
+        _setattr(obj, "keys", keys)
+        _setattr(obj, "_hash", hash((name, keys)))
+        return obj
 
-        return cls(
-            name=v.name,
-            key=keys,
-        )
+    @classmethod
+    def decode(cls, v: pb.PathElem) -> "PathElem":
+        key = v.key
+        return cls._make(v.name, tuple(sorted(key.items())) if key else ())
 
 
-@dataclass
 class Path(BaseModel[pb.Path]):
     """A gNMI path.
 
@@ -45,11 +105,54 @@ class Path(BaseModel[pb.Path]):
     Construct from a string with :meth:`Path.from_str` or by passing one
     to ``path_factory`` / any descriptor field that accepts ``PathLike``.
     Stringification is lossless: ``Path.from_str(str(p)) == p``.
+
+    Paths are immutable and hashable (``elem`` is a tuple), so they can be
+    used as dict keys and set members. Use :meth:`replace` to derive a
+    modified copy.
     """
 
-    elem: Sequence[PathElem]
-    origin: str = ""
-    target: str = ""
+    __slots__ = ("_hash", "elem", "origin", "target")
+
+    elem: tuple[PathElem, ...]
+    origin: str
+    target: str
+
+    def __init__(
+        self, elem: Iterable[PathElem] = (), origin: str = "", target: str = ""
+    ):
+        elem = tuple(elem)
+        object.__setattr__(self, "elem", elem)
+        object.__setattr__(self, "origin", origin)
+        object.__setattr__(self, "target", target)
+        object.__setattr__(self, "_hash", hash((elem, origin, target)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.elem == other.elem
+            and self.origin == other.origin
+            and self.target == other.target
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Path(elem={list(self.elem)!r}, origin={self.origin!r}, "
+            f"target={self.target!r})"
+        )
+
+    def __reduce__(self):
+        return (self.__class__, (self.elem, self.origin, self.target))
 
     def __str__(self) -> str:
         elems = []
@@ -76,19 +179,36 @@ class Path(BaseModel[pb.Path]):
     def is_empty(self):
         return len(self.elem) == 0 and not self.origin and not self.target
 
+    def replace(
+        self,
+        *,
+        elem: Iterable[PathElem] | None = None,
+        origin: str | None = None,
+        target: str | None = None,
+    ) -> "Path":
+        """Return a copy of the path with the given fields replaced."""
+        return Path(
+            elem=self.elem if elem is None else elem,
+            origin=self.origin if origin is None else origin,
+            target=self.target if target is None else target,
+        )
+
     @classmethod
     def from_str(cls, p: str) -> "Path":
-        elems = []
         if not p:
-            return cls(elem=[])
+            return cls(elem=())
+
+        path = path_cache.get(p)
+        if path is None:
+            origin, spl = split_path(p)
+            elems = []
+            for el in spl:
+                name, key = parse_elem(el)
+                elems.append(PathElem(name=name, key=key))
+            path = cls(origin=origin, elem=elems)
+            path_cache.put(p, path)
 
-        origin, spl = split_path(p)
-
-        for el in spl:
-            name, key = parse_elem(el)
-            elems.append(PathElem(name=name, key=key))
-
-        return cls(origin=origin, elem=elems)
+        return path
 
     def append(self, other: "str | Path | pb.Path", force: bool = False) -> "Path":
         other = path_factory(other)
@@ -101,7 +221,7 @@ class Path(BaseModel[pb.Path]):
                 raise ValueError("Cannot append path with a different targets")
 
         return Path(
-            elem=list(self.elem) + list(other.elem),
+            elem=self.elem + other.elem,
             origin=self.origin,
             target=self.target,
         )
@@ -114,14 +234,22 @@ class Path(BaseModel[pb.Path]):
 
     @classmethod
     def decode(cls, v: pb.Path) -> "Path":
-        p: list[PathElem] = []
-        for elem in v.elem:
-            p.append(PathElem.decode(elem))
+        if _path_table is not None:
+            return _path_table.decode(v)
 
-        if not v.origin and not v.target:
-            return cls(elem=p)
+        return cls._make(
+            tuple([PathElem.decode(elem) for elem in v.elem]), v.origin, v.target
+        )
 
-        return cls(p, v.origin, v.target)
+    @classmethod
+    def _make(cls, elem: tuple[PathElem, ...], origin: str, target: str) -> "Path":
+        # trusted decode path: ``elem`` is already a tuple of PathElem
+        obj = object.__new__(cls)
+        _setattr(obj, "elem", elem)
+        _setattr(obj, "origin", origin)
+        _setattr(obj, "target", target)
+        _setattr(obj, "_hash", hash((elem, origin, target)))
+        return obj
 
 
 PathLike: TypeAlias = str | Path | pb.Path
@@ -176,6 +304,178 @@ def path_factory(path: PathLike) -> Path:
     raise TypeError(f"Invalid path type {type(path)}")
 
 
+class PathCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class PathCache:
+    """Bounded LRU cache of parsed path strings used by :meth:`Path.from_str`.
+
+    :class:`Path` is immutable, so cached instances are handed out as-is
+    and shared between callers. The size defaults to
+    ``GNMIP_PATH_CACHE_SIZE``; ``0`` disables caching.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._data: OrderedDict[str, Path] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Path | None:
+        with self._lock:
+            path = self._data.get(key)
+            if path is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return path
+
+    def put(self, key: str, path: Path) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = path
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> PathCacheInfo:
+        with self._lock:
+            return PathCacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._data)
+            )
+
+
+path_cache = PathCache(env.GNMIP_PATH_CACHE_SIZE)
+
+
+class PathTable:
+    """Interning table that canonicalizes paths and numbers them.
+
+    Identical paths -- keyed on the deterministic ``pb.Path`` wire bytes
+    when decoding, or on the (hashable) :class:`Path` itself -- resolve to
+    one shared :class:`Path` instance, and the elements of distinct paths
+    are shared too. Every interned path gets a stable, dense integer ID
+    (``0, 1, 2, ...``) that is cheaper to store and compare than the path.
+
+    A table is safe to share across targets, streams and threads. Enable
+    it process-wide for :meth:`Path.decode` with :func:`enable_path_interning`
+    or ``GNMIP_PATH_INTERN=1``.
+    """
+
+    def __init__(self):
+        self._by_wire: dict[bytes, int] = {}
+        self._by_path: dict[Path, int] = {}
+        self._elems: dict[PathElem, PathElem] = {}
+        self._paths: list[Path] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._by_path
+
+    def decode(self, v: pb.Path) -> Path:
+        return self._paths[self.decode_id(v)]
+
+    def decode_id(self, v: pb.Path) -> int:
+        """Return the ID of a ``pb.Path``, interning it on first sight."""
+        wire = v.SerializeToString(deterministic=True)
+        pid = self._by_wire.get(wire)
+        if pid is not None:
+            return pid
+
+        elems = [PathElem.decode(e) for e in v.elem]
+        pid = self._add(Path(elems, v.origin, v.target))
+        self._by_wire.setdefault(wire, pid)
+        return pid
+
+    def intern(self, path: PathLike) -> Path:
+        """Return the canonical instance of ``path``."""
+        return self._paths[self.path_id(path)]
+
+    def path_id(self, path: PathLike) -> int:
+        """Return the ID of ``path``, interning it on first sight."""
+        if isinstance(path, pb.Path):
+            return self.decode_id(path)
+
+        path = path_factory(path)
+        pid = self._by_path.get(path)
+        if pid is not None:
+            return pid
+        return self._add(path)
+
+    def lookup(self, pid: int) -> Path:
+        """Return the path registered under ``pid``."""
+        return self._paths[pid]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_wire.clear()
+            self._by_path.clear()
+            self._elems.clear()
+            self._paths.clear()
+
+    def _add(self, path: Path) -> int:
+        with self._lock:
+            pid = self._by_path.get(path)
+            if pid is not None:
+                return pid
+
+            elems = [self._elems.setdefault(e, e) for e in path.elem]
+            path = Path(elems, path.origin, path.target)
+            pid = len(self._paths)
+            self._paths.append(path)
+            self._by_path[path] = pid
+            return pid
+
+
+_path_table: PathTable | None = None
+
+
+def enable_path_interning(table: PathTable | None = None) -> PathTable:
+    """Make :meth:`Path.decode` return interned paths from ``table``.
+
+    A new table is created when none is given. Returns the active table.
+    """
+    global _path_table
+    _path_table = table if table is not None else PathTable()
+    return _path_table
+
+
+def disable_path_interning() -> None:
+    global _path_table
+    _path_table = None
+
+
+def get_path_table() -> PathTable | None:
+    """Return the table used by :meth:`Path.decode`, if interning is on."""
+    return _path_table
+
+
+if env.GNMIP_PATH_INTERN:
+    enable_path_interning()
+
+
 def split_path(path: str) -> tuple[str, list[str]]:
     """Slice an escaped path into (target, origin, [elements]).
 
@@ -1,8 +1,18 @@
 # -*- coding: utf-8 -*-
 
 from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, TypeAlias
 
-from gnmi.models.path import Path, Paths, PathDescriptor, path_factory
+from gnmi.models.path import (
+    Path,
+    PathElem,
+    PathLike,
+    Paths,
+    PathDescriptor,
+    parse_elem,
+    path_factory,
+    split_path,
+)
 from gnmi.proto import gnmi_pb2 as pb
 from gnmi.proto import gnmi_ext_pb2 as ext_pb2
 from gnmi.models.model import BaseModel
@@ -10,6 +20,7 @@ from gnmi.models.update import Update
 from gnmi.models.update_result import UpdateResult
 from gnmi.models.error import Error
 from gnmi.models.update import Updates
+from gnmi.models.value import Value, ValueType, value_type_factory
 
 
 @dataclass
@@ -124,3 +135,221 @@ class SetResponse(BaseModel[pb.SetResponse]):
             timestamp=v.timestamp,
             extensions=list(v.extension),
         )
+
+
+# value types whose payload is assigned to the TypedValue field as is
+_SCALAR_FIELDS = {
+    t: t.name.lower()
+    for t in (
+        ValueType.ASCII_VAL,
+        ValueType.BOOL_VAL,
+        ValueType.BYTES_VAL,
+        ValueType.DOUBLE_VAL,
+        ValueType.FLOAT_VAL,
+        ValueType.INT_VAL,
+        ValueType.PROTO_BYTES,
+        ValueType.STRING_VAL,
+        ValueType.UINT_VAL,
+    )
+}
+
+SetItem: TypeAlias = (
+    tuple[PathLike, Any] | tuple[PathLike, Any, int] | Update | pb.Update
+)
+SetItems: TypeAlias = Iterable[SetItem] | Mapping[PathLike, Any]
+
+
+class SetRequestBuilder:
+    """Build a ``pb.SetRequest`` straight from paths and values.
+
+    Unlike :class:`SetRequest` no ``Update``/``Value`` models are created:
+    each item is encoded into the request as it is added. Items are
+    ``(path, value)`` tuples, a mapping of path to value, or ready made
+    ``Update``/``pb.Update`` messages. Values follow the same rules as
+    :func:`gnmi.models.value.value_factory` (``(val, type)`` tuples,
+    :class:`Value`, ``pb.TypedValue`` or a bare value whose type is
+    inferred) and encode to the same wire format.
+
+    Encoded paths and path elements are cached, so leaves sharing a parent
+    (and paths repeated across operations) are only encoded once. Use
+    :meth:`under` to add paths relative to an already encoded parent::
+
+        b = SetRequestBuilder(prefix="/acl/acl-sets")
+        acl = b.under("acl-set[name=EDGE][type=ACL_IPV4]/acl-entries")
+        for seq, action in entries:
+            acl.update([(f"acl-entry[sequence-id={seq}]/config/action", action)])
+        sess.set(request=b)
+
+    Operations are applied by the target in the order defined by the
+    specification (deletes, replaces, updates, union replaces) regardless
+    of the order they are added in.
+    """
+
+    def __init__(self, prefix: PathLike | None = None):
+        self._request = pb.SetRequest()
+        self._paths: dict[Any, pb.Path] = {}
+        self._elems: dict[PathElem, pb.PathElem] = {}
+        self._elem_strs: dict[str, pb.PathElem] = {}
+        self._parent: pb.Path | None = None
+        if prefix is not None:
+            pfx = path_factory(prefix)
+            if not pfx.is_empty():
+                self._request.prefix.CopyFrom(self._encode_path(pfx))
+
+    def __len__(self) -> int:
+        """Number of operations added so far."""
+        req = self._request
+        return (
+            len(req.delete)
+            + len(req.replace)
+            + len(req.update)
+            + len(req.union_replace)
+        )
+
+    @property
+    def size(self) -> int:
+        """Encoded size of the request in bytes."""
+        return self._request.ByteSize()
+
+    def build(self) -> pb.SetRequest:
+        """Return the request built so far (not a copy)."""
+        return self._request
+
+    def encode(self) -> pb.SetRequest:
+        return self._request
+
+    def under(self, parent: PathLike) -> "SetRequestBuilder":
+        """Return a builder adding paths relative to ``parent``.
+
+        The returned builder writes to the same request.
+        """
+        scoped = object.__new__(SetRequestBuilder)
+        scoped._request = self._request
+        scoped._paths = self._paths
+        scoped._elems = self._elems
+        scoped._elem_strs = self._elem_strs
+        scoped._parent = self._scoped(self._path(parent))
+        return scoped
+
+    def delete(self, paths: Iterable[PathLike]) -> "SetRequestBuilder":
+        add = self._request.delete.add
+        for path in paths:
+            add().CopyFrom(self._scoped(self._path(path)))
+        return self
+
+    def replace(self, items: SetItems) -> "SetRequestBuilder":
+        self._add(self._request.replace, items)
+        return self
+
+    def update(self, items: SetItems) -> "SetRequestBuilder":
+        self._add(self._request.update, items)
+        return self
+
+    def union_replace(self, items: SetItems) -> "SetRequestBuilder":
+        self._add(self._request.union_replace, items)
+        return self
+
+    def _add(self, field, items: SetItems) -> None:
+        if isinstance(items, Mapping):
+            items = items.items()  # type: ignore[assignment]
+
+        add = field.add
+        parent = self._parent
+        for item in items:
+            if isinstance(item, (pb.Update, Update)):
+                upd = add()
+                upd.CopyFrom(item if isinstance(item, pb.Update) else item.encode())
+                if parent is not None:
+                    upd.path.CopyFrom(self._scoped(upd.path))
+                continue
+            if not isinstance(item, tuple) or len(item) not in (2, 3):
+                raise ValueError("Invalid update format")
+
+            upd = add()
+            path = self._path(item[0])
+            if parent is not None:
+                upd.path.CopyFrom(parent)
+                upd.path.elem.extend(path.elem)
+            else:
+                upd.path.CopyFrom(path)
+            _encode_value(upd.val, item[1])
+            if len(item) == 3:
+                upd.duplicates = item[2]
+
+    def _scoped(self, path: pb.Path) -> pb.Path:
+        if self._parent is None:
+            return path
+        scoped = pb.Path()
+        scoped.CopyFrom(self._parent)
+        scoped.elem.extend(path.elem)
+        return scoped
+
+    def _path(self, path: PathLike) -> pb.Path:
+        if isinstance(path, pb.Path):
+            return path
+
+        encoded = self._paths.get(path)
+        if encoded is None:
+            if isinstance(path, str):
+                encoded = self._encode_str(path)
+            else:
+                encoded = self._encode_path(path_factory(path))
+            self._paths[path] = encoded
+        return encoded
+
+    def _encode_str(self, path: str) -> pb.Path:
+        # Split only, elements are parsed once per distinct element string
+        # which is what leaves under a common parent mostly share.
+        origin, parts = split_path(path)
+        elems = self._elem_strs
+        encoded = pb.Path(origin=origin)
+        for part in parts:
+            pe = elems.get(part)
+            if pe is None:
+                name, key = parse_elem(part)
+                pe = elems[part] = pb.PathElem(name=name, key=key)
+            encoded.elem.append(pe)
+        return encoded
+
+    def _encode_path(self, path: Path) -> pb.Path:
+        elems = self._elems
+        encoded = pb.Path(origin=path.origin, target=path.target)
+        for elem in path.elem:
+            pe = elems.get(elem)
+            if pe is None:
+                pe = elems[elem] = elem.encode()
+            encoded.elem.append(pe)
+        return encoded
+
+
+def _encode_value(tv: pb.TypedValue, value: Any) -> None:
+    if isinstance(value, pb.TypedValue):
+        tv.CopyFrom(value)
+        return
+    if isinstance(value, Value):
+        tv.CopyFrom(value.encode())
+        return
+
+    if isinstance(value, tuple):
+        if len(value) != 2:
+            raise ValueError("Unhandled value %s" % (value,))
+        val, typ = value[0], value_type_factory(value[1])
+    else:
+        val, typ = value, ValueType.from_val(value)
+
+    name = _SCALAR_FIELDS.get(typ)
+    if name is not None:
+        setattr(tv, name, val)
+    else:
+        tv.CopyFrom(Value(val, typ).encode())
+
+
+SetRequestLike: TypeAlias = SetRequest | SetRequestBuilder | pb.SetRequest
+
+
+def set_request_factory(request: SetRequestLike) -> pb.SetRequest:
+    if isinstance(request, pb.SetRequest):
+        return request
+    if isinstance(request, (SetRequest, SetRequestBuilder)):
+        return request.encode()
+    raise ValueError("Invalid set request %s" % (request,))
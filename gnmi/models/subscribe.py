@@ -2,15 +2,31 @@
 
 
 from dataclasses import dataclass, field
+from typing import Literal, NamedTuple
 
 from gnmi.proto import gnmi_pb2 as pb
 from gnmi.proto import gnmi_ext_pb2 as ext_pb2
 
 from gnmi.models.model import BaseModel
 from gnmi.models.error import Error
-from gnmi.models.notification import Notification
+from gnmi.models.notification import LazyNotification, Notification
 from gnmi.models.subscription_list import SubscriptionList
-from gnmi.util import oneof
+from gnmi.util import oneof, wire_fields
+
+SUBSCRIBE_RPC = "/gnmi.gNMI/Subscribe"
+
+# How ``Session.subscribe`` hands responses back to the caller:
+#   model -- ``SubscribeResponse`` model objects (optionally lazy)
+#   proto -- the ``pb.SubscribeResponse`` messages as received
+#   none  -- the serialized response bytes, never parsed by the client
+DecodeMode = Literal["model", "proto", "none"]
+DECODE_MODES: tuple[str, ...] = ("model", "proto", "none")
+
+
+def decode_mode_factory(mode: str) -> DecodeMode:
+    if mode not in DECODE_MODES:
+        raise ValueError(f"invalid decode mode: {mode!r}")
+    return mode  # type: ignore[return-value]
 
 
 @dataclass
@@ -68,7 +84,7 @@ class SubscribeRequest(BaseModel[pb.SubscribeRequest]):
 
 @dataclass
 class SubscribeResponse(BaseModel[pb.SubscribeResponse]):
-    update: Notification
+    update: Notification | LazyNotification
     sync_response: bool
     error: Error | None = None
     extension: list[ext_pb2.Extension] = field(default_factory=list)
@@ -95,12 +111,65 @@ class SubscribeResponse(BaseModel[pb.SubscribeResponse]):
         )
 
     @classmethod
-    def decode(cls, v: pb.SubscribeResponse) -> "SubscribeResponse":
+    def decode(cls, v: pb.SubscribeResponse, lazy: bool = False) -> "SubscribeResponse":
         err = None
         if v.error and v.error.code != 0:
             err = Error.decode(v.error)
+
+        update: Notification | LazyNotification
+        if lazy:
+            update = LazyNotification(v.update)
+        else:
+            update = Notification.decode(v.update)
+
         return cls(
-            update=Notification.decode(v.update),
+            update=update,
             sync_response=v.sync_response,
             error=err,
         )
+
+
+class ResponseMeta(NamedTuple):
+    """Routing metadata read from a subscribe response without decoding it."""
+
+    timestamp: int
+    target: str
+    origin: str
+    sync_response: bool
+
+
+def peek_response(v: bytes | pb.SubscribeResponse) -> ResponseMeta:
+    """Read the timestamp, prefix target/origin and sync flag of a response.
+
+    For a ``pb.SubscribeResponse`` this is plain attribute access. For
+    serialized bytes (``decode="none"``) the wire format is scanned and
+    every field other than the notification timestamp and prefix is
+    skipped by length, so the updates are never parsed.
+    """
+    if isinstance(v, pb.SubscribeResponse):
+        return ResponseMeta(
+            timestamp=v.update.timestamp,
+            target=v.update.prefix.target,
+            origin=v.update.prefix.origin,
+            sync_response=v.sync_response,
+        )
+
+    timestamp = 0
+    target = origin = ""
+    sync_response = False
+
+    for num, val in wire_fields(v, 0, len(v)):
+        if num == 3 and isinstance(val, int):
+            sync_response = bool(val)
+        elif num == 1 and isinstance(val, tuple):
+            for nnum, nval in wire_fields(v, *val):
+                if nnum == 1 and isinstance(nval, int):
+                    timestamp = nval - (1 << 64) if nval >= (1 << 63) else nval
+                elif nnum == 2 and isinstance(nval, tuple):
+                    for pnum, pval in wire_fields(v, *nval):
+                        if pnum == 2 and isinstance(pval, tuple):
+                            origin = v[pval[0] : pval[1]].decode()
+                        elif pnum == 4 and isinstance(pval, tuple):
+                            target = v[pval[0] : pval[1]].decode()
+
+    return ResponseMeta(timestamp, target, origin, sync_response)
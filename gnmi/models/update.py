@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from gnmi.proto import gnmi_pb2 as pb
 from gnmi.models.model import BaseModel
 from gnmi.models.path import Path, PathDescriptor, path_factory
-from gnmi.models.value import ValueDescriptor, value_factory
+from gnmi.models.value import Value, ValueDescriptor, value_factory
 
 T = TypeVar("T")
 
@@ -38,12 +38,74 @@ class Update(BaseModel[pb.Update]):
 
     @classmethod
     def decode(cls, v: pb.Update) -> "Update":
-        return cls(
-            path=Path.decode(v.path),
-            value=value_factory(v.val),
-            duplicates=v.duplicates,
+        # Trusted construction: the decoded path and value already are what
+        # the descriptors would produce, so write their backing attributes
+        # instead of going through ``__init__`` and ``__set__``.
+        obj = object.__new__(cls)
+        attrs = obj.__dict__
+        attrs["_path"] = Path.decode(v.path)
+        attrs["_value"] = Value.decode(v.val)
+        attrs["duplicates"] = v.duplicates
+        return obj
+
+
+class LazyUpdate(BaseModel[pb.Update]):
+    """A read-only :class:`Update` view backed by a ``pb.Update``.
+
+    ``path`` and ``value`` are decoded on first access and cached, so
+    consumers that only look at a few leaves (or just forward the
+    message) don't pay for building model objects they never read.
+    ``encode`` hands back the underlying message untouched.
+    """
+
+    __slots__ = ("_path", "_pb", "_value")
+
+    def __init__(self, v: pb.Update):
+        self._pb = v
+        self._path: Path | None = None
+        self._value: Value | None = None
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = Path.decode(self._pb.path)
+        return self._path
+
+    @property
+    def value(self) -> Value:
+        if self._value is None:
+            self._value = Value.decode(self._pb.val)
+        return self._value
+
+    @property
+    def duplicates(self) -> int:
+        return self._pb.duplicates
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyUpdate(path={self.path!r}, value={self.value!r}, "
+            f"duplicates={self.duplicates!r})"
         )
 
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Update, LazyUpdate)):
+            return (self.path, self.value, self.duplicates) == (
+                other.path,
+                other.value,
+                other.duplicates,
+            )
+        return NotImplemented
+
+    def to_update(self) -> Update:
+        return Update(path=self.path, value=self.value, duplicates=self.duplicates)
+
+    def encode(self) -> pb.Update:
+        return self._pb
+
+    @classmethod
+    def decode(cls, v: pb.Update) -> "LazyUpdate":
+        return cls(v)
+
 
 UpdateTuple_ = tuple[str, Any] | tuple[str, Any, int]
 UpdateItem_ = Update | pb.Update | UpdateTuple_
@@ -7,12 +7,13 @@ import json
 
 from decimal import Decimal
 from functools import reduce
-from typing import Any, TypeVar, Generic
+from typing import Any, Callable, TypeVar, Generic
 from google.protobuf import any_pb2
 
 from gnmi.proto import gnmi_pb2 as pb
 from dataclasses import dataclass
 
+from gnmi import codec
 from gnmi.decorator import deprecated
 from gnmi.models.model import BaseModel
 from gnmi.models.encoding import EncodingDescriptor
@@ -152,9 +153,9 @@ class Value(Generic[T], BaseModel[pb.TypedValue]):
         if isinstance(v, bytes):
             return v.decode()
         elif isinstance(v, list):
-            return [i.to_json() for i in v]
+            return [_to_json(i) for i in v]
         elif isinstance(v, dict):
-            return {k: x.to_json() for k, x in v.items()}
+            return {k: _to_json(x) for k, x in v.items()}
         elif isinstance(v, (str, int, float, bool)) or v is None:
             return v
         elif isinstance(v, Decimal):
@@ -162,6 +163,11 @@ class Value(Generic[T], BaseModel[pb.TypedValue]):
         else:
             raise TypeError(f"Unsupported type for JSON serialization: {type(v)}")
 
+    @property
+    def raw_json(self) -> bytes:
+        """The value serialized as JSON text."""
+        return codec.dumpb(self.to_json())
+
     def encode(self) -> pb.TypedValue:
         params = {}
         val_type = self.val_type
@@ -175,9 +181,7 @@ class Value(Generic[T], BaseModel[pb.TypedValue]):
             else:
                 params["any_val"] = any_pb2.Any(value=str(self.val).encode("utf-8"))
         elif val_type in (ValueType.JSON_IETF_VAL, ValueType.JSON_VAL):
-            params["json_val"] = json.dumps(self.val, cls=ValueJsonEncoder).encode(
-                "utf-8"
-            )
+            params["json_val"] = codec.dumpb(self.val, default=_json_default)
         elif val_type == ValueType.LEAFLIST_VAL and isinstance(self.val, list):
             sl = []
             for v in list(self.val):
@@ -194,41 +198,97 @@ class Value(Generic[T], BaseModel[pb.TypedValue]):
 
     @classmethod
     def decode(cls, v: pb.TypedValue) -> "Value":
-        if v.HasField("any_val"):
-            return Value(v.any_val, ValueType.ANY_VAL)
-        elif v.HasField("ascii_val"):
-            return Value(v.ascii_val, ValueType.ASCII_VAL)
-        elif v.HasField("bool_val"):
-            return Value(v.bool_val, ValueType.BOOL_VAL)
-        elif v.HasField("bytes_val"):
-            return Value(v.bytes_val, ValueType.BYTES_VAL)
-        elif v.HasField("decimal_val"):
-            val = Decimal(v.decimal_val.digits / 10**v.decimal_val.precision)
-            return Value(val, ValueType.DECIMAL_VAL)
-        elif v.HasField("double_val"):
-            return Value(v.double_val, ValueType.DOUBLE_VAL)
-        elif v.HasField("float_val"):
-            return Value(v.float_val, ValueType.FLOAT_VAL)
-        elif v.HasField("int_val"):
-            return Value(v.int_val, ValueType.INT_VAL)
-        elif v.HasField("json_ietf_val"):
-            return Value(json.loads(v.json_ietf_val), ValueType.JSON_IETF_VAL)
-        elif v.HasField("json_val"):
-            return Value(json.loads(v.json_val), ValueType.JSON_VAL)
-        elif v.HasField("leaflist_val"):
-            val = []
-            for elem in v.leaflist_val.element:
-                val.append(cls.decode(elem))
-            return Value(val, ValueType.LEAFLIST_VAL)
-        elif v.HasField("proto_bytes"):
-            return Value(v.proto_bytes, ValueType.PROTO_BYTES)
-        elif v.HasField("string_val"):
-            return Value(v.string_val, ValueType.STRING_VAL)
-        elif v.HasField("uint_val"):
-            return Value(v.uint_val, ValueType.UINT_VAL)
-        else:
+        which = v.WhichOneof("value")
+        try:
+            val_type, build = _DECODERS[which]  # type: ignore[index]
+        except KeyError:
             raise ValueError("Unhandled typed value %s" % v)
 
+        return build(getattr(v, which), val_type)  # type: ignore[arg-type]
+
+
+class JsonValue(Value):
+    """A ``json_val`` / ``json_ietf_val`` value that defers parsing.
+
+    The raw payload is kept as received and only parsed (with
+    :func:`gnmi.codec.loads`) the first time ``val``/``value``/``to_json()``
+    is accessed. Use
+    ``raw_json`` to get at the bytes without parsing them at all, e.g. to
+    write the payload straight to a sink. Compares equal to a
+    :class:`Value` holding the same parsed payload and type.
+    """
+
+    def __init__(self, raw: bytes, val_type: ValueType = ValueType.JSON_VAL):
+        self._raw = raw
+        self._val: Any = None
+        self._parsed = False
+        self.val_type = val_type
+
+    @property  # type: ignore[override]
+    def val(self) -> Any:
+        if not self._parsed:
+            self._val = codec.loads(self._raw)
+            self._parsed = True
+        return self._val
+
+    @val.setter
+    def val(self, value: Any) -> None:
+        self._val = value
+        self._parsed = True
+        self._raw = codec.dumpb(value, default=_json_default)
+
+    @property
+    def parsed(self) -> bool:
+        return self._parsed
+
+    @property
+    def raw_json(self) -> bytes:
+        return self._raw
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Value):
+            return (self.val, self.val_type) == (other.val, other.val_type)
+        return NotImplemented
+
+    def to_json(self) -> Any:
+        return self.val
+
+    def encode(self) -> pb.TypedValue:
+        if self.val_type == ValueType.JSON_IETF_VAL:
+            return pb.TypedValue(json_ietf_val=self._raw)
+        return pb.TypedValue(json_val=self._raw)
+
+
+def _to_json(v: Any) -> Any:
+    return v.to_json() if isinstance(v, Value) else v
+
+
+def _decimal_value(v: pb.Decimal64, val_type: ValueType) -> Value:
+    return Value(Decimal(v.digits / 10**v.precision), val_type)
+
+
+def _leaflist_value(v: pb.ScalarArray, val_type: ValueType) -> Value:
+    return Value([Value.decode(elem) for elem in v.element], val_type)
+
+
+# TypedValue oneof field -> (ValueType, builder taking the raw field and type)
+_DECODERS: dict[str, tuple[ValueType, Callable[[Any, ValueType], Value]]] = {
+    "any_val": (ValueType.ANY_VAL, Value),
+    "ascii_val": (ValueType.ASCII_VAL, Value),
+    "bool_val": (ValueType.BOOL_VAL, Value),
+    "bytes_val": (ValueType.BYTES_VAL, Value),
+    "decimal_val": (ValueType.DECIMAL_VAL, _decimal_value),
+    "double_val": (ValueType.DOUBLE_VAL, Value),
+    "float_val": (ValueType.FLOAT_VAL, Value),
+    "int_val": (ValueType.INT_VAL, Value),
+    "json_ietf_val": (ValueType.JSON_IETF_VAL, JsonValue),
+    "json_val": (ValueType.JSON_VAL, JsonValue),
+    "leaflist_val": (ValueType.LEAFLIST_VAL, _leaflist_value),
+    "proto_bytes": (ValueType.PROTO_BYTES, Value),
+    "string_val": (ValueType.STRING_VAL, Value),
+    "uint_val": (ValueType.UINT_VAL, Value),
+}
+
 
 class ValueJsonEncoder(json.JSONEncoder):
     def default(self, o):
@@ -237,6 +297,12 @@ class ValueJsonEncoder(json.JSONEncoder):
         return o
 
 
+def _json_default(o: Any) -> Any:
+    if isinstance(o, Value):
+        return o.value
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
 class ValueDescriptor:
     def __init__(self, *, default: None = None):
         self._default = default
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+"""POLL mode subscriptions.
+
+A poll subscription keeps one ``Subscribe`` stream open and asks the target
+for a fresh snapshot of the subscribed paths on demand, instead of paying
+for a new ``Get`` RPC each time::
+
+    with sess.subscribe_poll(["/interfaces/interface/state/counters"]) as sub:
+        for notifications in sub.every(10):
+            ...
+
+Handles are created with :meth:`gnmi.session.Session.subscribe_poll` and
+:meth:`gnmi.async_session.AsyncSession.subscribe_poll`.
+"""
+
+import asyncio
+import queue
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
+
+import grpc.aio
+
+from gnmi.models.notification import LazyNotification, Notification
+from gnmi.proto import gnmi_pb2 as pb
+
+Batch = list[Notification | LazyNotification]
+
+_POLL = pb.SubscribeRequest(poll=pb.Poll())
+
+
+def _notification(
+    r: pb.SubscribeResponse, lazy: bool
+) -> Notification | LazyNotification:
+    if lazy:
+        return LazyNotification(r.update)
+    return Notification.decode(r.update)
+
+
+def _next_tick(next_at: float, interval: float) -> tuple[float, float]:
+    """Return the next tick and the seconds left until it.
+
+    Fixed rate: ticks stay on the original schedule, missed ones are skipped.
+    """
+    next_at += interval
+    now = time.monotonic()
+    if next_at < now:
+        if interval <= 0:
+            return now, 0.0
+        next_at += ((now - next_at) // interval + 1) * interval
+    return next_at, next_at - now
+
+
+class PollSubscription:
+    """Handle of a POLL mode subscription on a :class:`Session`.
+
+    The subscription is sent when the handle is created. With ``initial``
+    the data the target sends right after it, up to the first
+    ``sync_response``, is read into :attr:`initial`; pass ``initial=False``
+    for targets that only answer ``Poll`` messages.
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[
+            [Iterable[pb.SubscribeRequest]], Iterator[pb.SubscribeResponse]
+        ],
+        request: pb.SubscribeRequest,
+        lazy: bool = False,
+        initial: bool = True,
+    ):
+        self._lazy = lazy
+        self._requests: queue.Queue[pb.SubscribeRequest | None] = queue.Queue()
+        self._requests.put(request)
+        self._responses = open_stream(self._request_iter())
+        self.closed = False
+        self.initial: Batch = self._read_batch() if initial else []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _request_iter(self) -> Iterator[pb.SubscribeRequest]:
+        while True:
+            req = self._requests.get()
+            if req is None:
+                return
+            yield req
+
+    def _read_batch(self) -> Batch:
+        batch: Batch = []
+        for r in self._responses:
+            if r.sync_response:
+                return batch
+            if r.HasField("update"):
+                batch.append(_notification(r, self._lazy))
+        # the target ended the stream
+        self.closed = True
+        return batch
+
+    def poll(self) -> Batch:
+        """Poll the target, return its notifications up to ``sync_response``."""
+        if self.closed:
+            raise ValueError("poll subscription is closed")
+        self._requests.put(_POLL)
+        return self._read_batch()
+
+    def every(self, interval: float, count: int | None = None) -> Iterator[Batch]:
+        """Poll every ``interval`` seconds, ``count`` times or until closed.
+
+        Polls are scheduled at a fixed rate: time spent polling and handling
+        the batch is not added to the interval, ticks that were missed
+        because that took longer are skipped.
+        """
+        next_at = time.monotonic()
+        polled = 0
+        while not self.closed and (count is None or polled < count):
+            yield self.poll()
+            polled += 1
+            if count is not None and polled >= count:
+                return
+            next_at, delay = _next_tick(next_at, interval)
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """End the request stream and cancel the RPC."""
+        if self.closed:
+            return
+        self.closed = True
+        self._requests.put(None)
+        self._responses.cancel()  # type: ignore[attr-defined]
+
+
+class AsyncPollSubscription:
+    """Handle of a POLL mode subscription on an :class:`AsyncSession`.
+
+    The subscription is sent by :meth:`open` (or entering the handle with
+    ``async with``), see :class:`PollSubscription` for ``initial``.
+    """
+
+    def __init__(
+        self,
+        open_call: Callable[[], Awaitable[grpc.aio.StreamStreamCall]],
+        request: pb.SubscribeRequest,
+        lazy: bool = False,
+        initial: bool = True,
+    ):
+        self._open_call = open_call
+        self._request = request
+        self._lazy = lazy
+        self._initial = initial
+        self._call: grpc.aio.StreamStreamCall | None = None
+        self.closed = False
+        self.initial: Batch = []
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self) -> "AsyncPollSubscription":
+        if self._call is None:
+            self._call = await self._open_call()
+            await self._call.write(self._request)
+            if self._initial:
+                self.initial = await self._read_batch()
+        return self
+
+    async def _read_batch(self) -> Batch:
+        batch: Batch = []
+        while True:
+            r = await self._call.read()  # type: ignore[union-attr]
+            if r is grpc.aio.EOF:
+                self.closed = True
+                return batch
+            if r.sync_response:
+                return batch
+            if r.HasField("update"):
+                batch.append(_notification(r, self._lazy))
+
+    async def poll(self) -> Batch:
+        """Poll the target, return its notifications up to ``sync_response``."""
+        if self.closed:
+            raise ValueError("poll subscription is closed")
+        await self.open()
+        await self._call.write(_POLL)  # type: ignore[union-attr]
+        return await self._read_batch()
+
+    async def every(
+        self, interval: float, count: int | None = None
+    ) -> AsyncIterator[Batch]:
+        """Async :meth:`PollSubscription.every`."""
+        next_at = time.monotonic()
+        polled = 0
+        while not self.closed and (count is None or polled < count):
+            yield await self.poll()
+            polled += 1
+            if count is not None and polled >= count:
+                return
+            next_at, delay = _next_tick(next_at, interval)
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        """End the request stream and cancel the RPC."""
+        if self.closed or self._call is None:
+            self.closed = True
+            return
+        self.closed = True
+        self._call.cancel()
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+"""Process-wide pool of warm gRPC channels.
+
+Opening a channel costs a TCP and TLS handshake. Sessions (and the
+:mod:`gnmi.api` helpers) created with ``pool=True`` or a
+:class:`ChannelPool`, or with ``GNMIP_CHANNEL_POOL=1`` set, borrow their
+channel from the pool and hand it back on exit instead of closing it, so
+later sessions for the same target and credentials reuse it.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Hashable, NamedTuple
+
+import grpc
+import grpc.aio
+
+from gnmi._env import env
+
+Channel = grpc.Channel | grpc.aio.Channel
+
+# a channel to close, whether it is a ``grpc.aio`` one and its loop
+_Stale = tuple[Channel, bool, Any]
+
+
+class PoolInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+    in_use: int
+
+
+class _Entry:
+    __slots__ = ("aio", "channel", "idle_since", "key", "loop", "refs")
+
+    def __init__(self, key: Hashable, channel: Channel, aio: bool, loop):
+        self.key = key
+        self.channel = channel
+        self.aio = aio
+        self.loop = loop
+        self.refs = 0
+        self.idle_since = 0.0
+
+
+class ChannelPool:
+    """Reference counted channels keyed by target, credentials and options.
+
+    :meth:`acquire` returns the pooled channel for ``key`` (creating it
+    with ``factory`` on a miss) and :meth:`release` hands it back. A channel
+    nobody holds is closed once it has been idle for ``idle_timeout``
+    seconds, or earlier when room is needed for a new one: the pool keeps
+    at most ``maxsize`` channels. When every pooled channel is in use, new
+    channels are handed out unpooled and closed on release.
+
+    ``grpc.aio`` channels are bound to the event loop they were created on,
+    so async callers pass ``aio=True`` and their running ``loop`` (``None``
+    outside of one), and both become part of the key. Sync and aio channels
+    are never shared, and aio channels are closed on their own loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = env.GNMIP_CHANNEL_POOL_SIZE,
+        idle_timeout: float = env.GNMIP_CHANNEL_POOL_IDLE,
+    ):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._entries: dict[Hashable, _Entry] = {}
+        self._by_channel: dict[int, _Entry] = {}
+        self._unpooled: dict[int, Any] = {}
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], Channel],
+        loop=None,
+        aio: bool = False,
+    ) -> Channel:
+        """Return the channel for ``key``, creating it with ``factory``.
+
+        ``aio`` says ``factory`` makes ``grpc.aio`` channels, implied by a
+        ``loop``.
+        """
+        aio = aio or loop is not None
+        key = (key, aio, loop)
+        with self._lock:
+            stale = self._expire(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._hits += 1
+                entry.refs += 1
+                channel = entry.channel
+            else:
+                self._misses += 1
+                if len(self._entries) >= self.maxsize:
+                    stale += self._evict_one()
+                channel = None
+        _close_all(stale)
+
+        if channel is not None:
+            return channel
+
+        channel = factory()
+        if aio and loop is None:
+            # created outside a running loop, grpc bound it to its working loop
+            loop = getattr(channel, "_loop", None)
+        with self._lock:
+            # another thread may have beaten us to it
+            entry = self._entries.get(key)
+            if entry is None and len(self._entries) < self.maxsize:
+                entry = _Entry(key, channel, aio, loop)
+                self._entries[key] = entry
+                self._by_channel[id(channel)] = entry
+            elif entry is None:
+                self._unpooled[id(channel)] = (aio, loop)
+                return channel
+            else:
+                _close_all([(channel, aio, loop)])
+                channel = entry.channel
+            entry.refs += 1
+            return channel
+
+    def release(self, channel: Channel) -> None:
+        """Hand back a channel obtained from :meth:`acquire`."""
+        with self._lock:
+            entry = self._by_channel.get(id(channel))
+            if entry is None:
+                if id(channel) not in self._unpooled:
+                    raise ValueError("channel does not belong to this pool")
+                aio, loop = self._unpooled.pop(id(channel))
+                stale = [(channel, aio, loop)]
+            else:
+                entry.refs = max(entry.refs - 1, 0)
+                if entry.refs == 0:
+                    entry.idle_since = time.monotonic()
+                stale = self._expire(time.monotonic())
+        _close_all(stale)
+
+    def prune(self) -> int:
+        """Close channels idle for longer than ``idle_timeout`` now."""
+        with self._lock:
+            stale = self._expire(time.monotonic())
+        _close_all(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Close and drop every idle channel, busy ones are kept."""
+        with self._lock:
+            stale = [self._drop(e) for e in list(self._entries.values()) if e.refs == 0]
+        _close_all(stale)
+
+    def info(self) -> PoolInfo:
+        with self._lock:
+            return PoolInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._entries),
+                sum(1 for e in self._entries.values() if e.refs),
+            )
+
+    def _drop(self, entry: _Entry) -> _Stale:
+        del self._entries[entry.key]
+        del self._by_channel[id(entry.channel)]
+        self._evictions += 1
+        return entry.channel, entry.aio, entry.loop
+
+    def _expire(self, now: float) -> list[_Stale]:
+        return [
+            self._drop(e)
+            for e in list(self._entries.values())
+            if e.refs == 0 and now - e.idle_since >= self.idle_timeout
+        ]
+
+    def _evict_one(self) -> list[_Stale]:
+        idle = [e for e in self._entries.values() if e.refs == 0]
+        if not idle:
+            return []
+        return [self._drop(min(idle, key=lambda e: e.idle_since))]
+
+
+# aio channel closes in flight, the loop only keeps weak references to tasks
+_closing: set[asyncio.Task] = set()
+
+
+def _close_on(loop: asyncio.AbstractEventLoop, channel: Any) -> None:
+    task = loop.create_task(channel.close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def _close_all(channels: list[_Stale]) -> None:
+    for channel, aio, loop in channels:
+        if not aio:
+            channel.close()
+            continue
+
+        # aio channels have to be closed, and awaited, on their own loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None:
+            loop = running
+        if loop is None or loop.is_closed():
+            # nothing left to run the close on, the channel is gone with it
+            continue
+        if running is loop:
+            _close_on(loop, channel)
+        elif loop.is_running():
+            loop.call_soon_threadsafe(_close_on, loop, channel)
+        elif running is None:
+            loop.run_until_complete(channel.close())
+        else:
+            # the loop is idle and can't be run from inside another one
+            _close_on(running, channel)
+
+
+_pool: ChannelPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_channel_pool() -> ChannelPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ChannelPool()
+        return _pool
+
+
+PoolLike = ChannelPool | bool | None
+
+
+def channel_key(target, insecure: bool, tls, options) -> tuple:
+    """Pool key for a channel to ``target`` with the given credentials."""
+    material = None
+    if tls is not None:
+        material = (
+            tls.ca_cert,
+            tls.client_cert,
+            tls.client_key,
+            tls.get_server_cert,
+            tls.no_verify,
+        )
+    return (str(target), insecure, material, tuple(sorted(options)))
+
+
+def pool_factory(pool: PoolLike) -> ChannelPool | None:
+    """Resolve a session's ``pool`` argument.
+
+    ``None`` follows ``GNMIP_CHANNEL_POOL``, ``True`` is the process-wide
+    pool and ``False`` disables pooling.
+    """
+    if isinstance(pool, ChannelPool):
+        return pool
+    if pool is None:
+        pool = env.GNMIP_CHANNEL_POOL
+    return get_channel_pool() if pool else None
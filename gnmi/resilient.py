@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+"""Subscriptions that survive dropped streams.
+
+:class:`ResilientSubscription` (and :class:`AsyncResilientSubscription` for
+:class:`~gnmi.async_session.AsyncSession`) re-sends the subscription when
+the stream fails with a retryable status, backing off exponentially with
+full jitter so a fleet of collectors losing the same link doesn't
+reconnect in lockstep. Iterating yields the responses interleaved with
+:class:`SubscriptionEvent` markers::
+
+    sub = ResilientSubscription(sess, ["/interfaces"], prefix="/")
+    for item in sub:
+        if isinstance(item, SubscriptionEvent):
+            if item.kind is EventKind.DISCONNECTED:
+                cache.mark_stale()
+            elif item.kind is EventKind.SYNCED:
+                cache.mark_consistent()
+            continue
+        cache.apply(item)
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Iterable, Iterator, NamedTuple, Sequence
+
+import grpc
+
+from gnmi.async_session import AsyncSession
+from gnmi.models.path import Path
+from gnmi.models.subscribe import SubscribeResponse, peek_response
+from gnmi.models.subscription import Subscription
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.session import Session
+
+# status codes after which the subscription is sent again. Everything else
+# (bad paths, auth failures, an expired ``timeout``) is raised as is
+RECONNECT_CODES = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+        grpc.StatusCode.ABORTED,
+        grpc.StatusCode.INTERNAL,
+        grpc.StatusCode.UNKNOWN,
+    }
+)
+
+
+class EventKind(str, Enum):
+    #: the stream ended, data received so far is stale until ``SYNCED``
+    DISCONNECTED = "disconnected"
+    #: a new stream delivered its first response after a drop
+    RECONNECTED = "reconnected"
+    #: the current stream sent ``sync_response``, data is consistent again
+    SYNCED = "synced"
+
+
+class SubscriptionEvent(NamedTuple):
+    """A change in the state of a resilient subscription.
+
+    ``attempt`` numbers the stream the event belongs to, starting at 1.
+    ``error`` and ``delay`` (seconds until the next attempt) are only set
+    for ``DISCONNECTED``; ``error`` is ``None`` when the server closed the
+    stream cleanly.
+    """
+
+    kind: EventKind
+    attempt: int
+    error: BaseException | None = None
+    delay: float = 0.0
+
+
+@dataclass
+class ReconnectPolicy:
+    """When and how fast to reconnect.
+
+    :param backoff: base delay in seconds before the first reconnect,
+        doubled for every consecutive failure up to ``max_backoff``. The
+        actual delay is drawn uniformly between zero and that value
+    :param max_retries: consecutive failed streams tolerated before giving
+        up, ``None`` retries forever. A stream counts as successful once it
+        reaches ``sync_response``, so a link that drops mid-sync keeps
+        backing off
+    :param retry_codes: gRPC status codes worth reconnecting after
+    """
+
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_retries: int | None = None
+    retry_codes: frozenset[grpc.StatusCode] = RECONNECT_CODES
+
+    def delay(self, failures: int) -> float:
+        cap = min(self.max_backoff, self.backoff * 2 ** (failures - 1))
+        return random.uniform(0, cap)
+
+    def retryable(self, exc: BaseException) -> bool:
+        if isinstance(exc, grpc.RpcError):
+            return exc.code() in self.retry_codes  # type: ignore[attr-defined]
+        return False
+
+
+@dataclass
+class SubscriptionStats:
+    """Counters of a resilient subscription.
+
+    ``last_sync`` is the wall clock time of the latest ``sync_response``.
+    """
+
+    streams: int = 0
+    reconnects: int = 0
+    disconnects: int = 0
+    syncs: int = 0
+    responses: int = 0
+    consecutive_failures: int = 0
+    last_error: BaseException | None = None
+    last_sync: float | None = None
+
+
+class _Subscription:
+    """Reconnect bookkeeping shared by the sync and async subscriptions.
+
+    ``synced`` tells whether the current stream has reached
+    ``sync_response``.
+    """
+
+    def __init__(
+        self,
+        subscriptions: Sequence[str | Path | Subscription],
+        policy: ReconnectPolicy | None,
+        kwargs: dict[str, Any],
+    ):
+        self.subscriptions = subscriptions
+        self.policy = policy or ReconnectPolicy()
+        self.kwargs = kwargs
+        self.stats = SubscriptionStats()
+        self.synced = False
+        self._attempt = 0
+        self._fresh = False
+
+    @property
+    def once(self) -> bool:
+        return str(self.kwargs.get("mode", "stream")).lower() == "once"
+
+    def _start(self) -> None:
+        self._attempt += 1
+        self._fresh = True
+        self.synced = False
+        self.stats.streams += 1
+
+    def _on_response(
+        self, resp: SubscribeResponse | pb.SubscribeResponse | bytes
+    ) -> Iterable[SubscriptionEvent]:
+        events = []
+        if self._fresh:
+            self._fresh = False
+            if self._attempt > 1:
+                self.stats.reconnects += 1
+                events.append(SubscriptionEvent(EventKind.RECONNECTED, self._attempt))
+
+        self.stats.responses += 1
+        if _is_sync(resp):
+            self.synced = True
+            self.stats.syncs += 1
+            self.stats.consecutive_failures = 0
+            self.stats.last_sync = time.time()
+            events.append(SubscriptionEvent(EventKind.SYNCED, self._attempt))
+        return events
+
+    def _on_drop(self, error: BaseException | None) -> SubscriptionEvent | None:
+        """Account for an ended stream, ``None`` means stop."""
+        if error is not None and not self.policy.retryable(error):
+            raise error
+        if error is None and self.once:
+            return None
+
+        self.synced = False
+        stats = self.stats
+        stats.disconnects += 1
+        stats.consecutive_failures += 1
+        stats.last_error = error
+
+        retries = self.policy.max_retries
+        if retries is not None and stats.consecutive_failures > retries:
+            if error is not None:
+                raise error
+            return None
+
+        delay = self.policy.delay(stats.consecutive_failures)
+        return SubscriptionEvent(EventKind.DISCONNECTED, self._attempt, error, delay)
+
+
+def _is_sync(resp: SubscribeResponse | pb.SubscribeResponse | bytes) -> bool:
+    if isinstance(resp, SubscribeResponse):
+        return resp.sync_response
+    return peek_response(resp).sync_response
+
+
+class ResilientSubscription(_Subscription):
+    """Subscribe on ``session`` and reconnect when the stream drops.
+
+    ``subscribe_kwargs`` are passed on to :meth:`Session.subscribe`. The
+    iterator ends when a ``once`` subscription completes or ``max_retries``
+    runs out after a clean close, it raises the last error when retries run
+    out after a failure or the failure is not retryable.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        subscriptions: Sequence[str | Path | Subscription],
+        policy: ReconnectPolicy | None = None,
+        **subscribe_kwargs: Any,
+    ):
+        super().__init__(subscriptions, policy, subscribe_kwargs)
+        self._session = session
+
+    def __iter__(
+        self,
+    ) -> Iterator[SubscribeResponse | pb.SubscribeResponse | bytes | SubscriptionEvent]:
+        while True:
+            self._start()
+            error = None
+            stream = self._session.subscribe(self.subscriptions, **self.kwargs)
+            try:
+                for resp in stream:
+                    events = self._on_response(resp)
+                    yield resp
+                    yield from events
+            except grpc.RpcError as exc:
+                error = exc
+            finally:
+                stream.close()  # type: ignore[attr-defined]
+
+            event = self._on_drop(error)
+            if event is None:
+                return
+            yield event
+            time.sleep(event.delay)
+
+
+class AsyncResilientSubscription(_Subscription):
+    """Async :class:`ResilientSubscription` on an :class:`AsyncSession`."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        subscriptions: Sequence[str | Path | Subscription],
+        policy: ReconnectPolicy | None = None,
+        **subscribe_kwargs: Any,
+    ):
+        super().__init__(subscriptions, policy, subscribe_kwargs)
+        self._session = session
+
+    async def __aiter__(
+        self,
+    ) -> AsyncIterator[
+        SubscribeResponse | pb.SubscribeResponse | bytes | SubscriptionEvent
+    ]:
+        while True:
+            self._start()
+            error = None
+            stream = self._session.subscribe(self.subscriptions, **self.kwargs)
+            try:
+                async for resp in stream:
+                    events = self._on_response(resp)
+                    yield resp
+                    for event in events:
+                        yield event
+            except grpc.RpcError as exc:
+                error = exc
+            finally:
+                await stream.aclose()  # type: ignore[attr-defined]
+
+            event = self._on_drop(error)
+            if event is None:
+                return
+            yield event
+            await asyncio.sleep(event.delay)
@@ -12,21 +12,42 @@ from typing import Sequence, Iterable
 
 from grpc import ssl_channel_credentials, secure_channel, insecure_channel, Channel
 
+from gnmi.proto import gnmi_pb2 as pb
 from gnmi.proto import gnmi_ext_pb2 as ext_pb
 from gnmi.proto import gnmi_pb2_grpc
 
 
 from gnmi import util
 
-from gnmi.tls import get_server_certificate, TLSConfig
+from gnmi.tls import (
+    TLSConfig,
+    get_server_certificate,
+    server_cert_key,
+    server_certificates,
+)
+from gnmi.get_planner import PlannerLike, planner_factory
+from gnmi.matcher import MatcherLike, matcher_factory
+from gnmi.set_batch import SetBatch
+from gnmi.polling import PollSubscription
+from gnmi.pool import PoolLike, channel_key, pool_factory
 
 from gnmi.models.capabilities import CapabilityRequest, CapabilityResponse
 from gnmi.models.get import DataType, GetRequest, GetResponse
 from gnmi.models.encoding import Encoding
 from gnmi.models.model_data import ModelData
 from gnmi.models.path import PathLike, Path
-from gnmi.models.set import SetRequest, SetResponse
-from gnmi.models.subscribe import SubscribeRequest, SubscribeResponse
+from gnmi.models.set import (
+    SetRequest,
+    SetRequestLike,
+    SetResponse,
+    set_request_factory,
+)
+from gnmi.models.subscribe import (
+    SUBSCRIBE_RPC,
+    SubscribeRequest,
+    SubscribeResponse,
+    decode_mode_factory,
+)
 from gnmi.models.subscription import Subscription
 from gnmi.models.subscription_list import SubscriptionList
 from gnmi.models.target import TargetLike, target_factory
@@ -44,6 +65,9 @@ class Session:
         In [2]: sess = Session(("veos3", 6030),
         ...:     metadata=[("username", "admin"), ("password", "")])
 
+    With ``pool=True`` (or a :class:`gnmi.pool.ChannelPool`) the channel is
+    borrowed from a pool of warm channels and handed back on exit instead
+    of being closed.
     """
 
     def __init__(
@@ -53,6 +77,7 @@ class Session:
         insecure: bool = False,
         tls: TLSConfig | None = None,
         grpc_options: dict | None = None,
+        pool: PoolLike = None,
     ):
         self.target = target_factory(target)
         self._tls = tls
@@ -65,7 +90,11 @@ class Session:
         self._insecure = insecure
         self.metadata = util.prepare_metadata(metadata)
 
-        self._channel = self._new_channel()
+        self._pool = pool_factory(pool)
+        if self._pool is not None:
+            self._channel = self._pool.acquire(self._channel_key(), self._new_channel)
+        else:
+            self._channel = self._new_channel()
 
         self._stub = gnmi_pb2_grpc.gNMIStub(self._channel)  # type: ignore
 
@@ -73,7 +102,15 @@ class Session:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._channel.close()
+        if self._pool is not None:
+            self._pool.release(self._channel)
+        else:
+            self._channel.close()
+
+    def _channel_key(self) -> tuple:
+        return channel_key(
+            self.target, self._insecure, self._tls, self._grpc_options.items()
+        )
 
     def _new_channel(self) -> Channel:
         if self._insecure:
@@ -87,8 +124,11 @@ class Session:
         private_key = self._tls.client_key or None
 
         if self._tls.get_server_cert:
-            trusted_cert = get_server_certificate(
-                self.target, self._tls.context, pem=True
+            trusted_cert = server_certificates.fetch(
+                server_cert_key(self.target, self._tls),
+                lambda: get_server_certificate(
+                    self.target, self._tls.context, pem=True
+                ),
             )
 
         creds = ssl_channel_credentials(
@@ -141,6 +181,8 @@ class Session:
         data_type: DataType | str | int = DataType.ALL,
         models: list[ModelData] = [],
         extensions: list[ext_pb.Extension] = [],
+        lazy: bool = False,
+        planner: PlannerLike = None,
     ) -> GetResponse:
         r"""Get snapshot of state from the target
 
@@ -174,9 +216,30 @@ class Session:
         :type models: list[ModelData]
         :param extensions:
         :type extensions: list[ext_pb.Extension]
+        :param lazy: return notifications as lazily decoded views
+        :type lazy: bool
+        :param planner: split ``paths`` into chunks requested concurrently
+            and merge the responses, see :class:`gnmi.get_planner.GetPlanner`.
+            ``True`` uses a default planner
+        :type planner: GetPlanner | bool
         :rtype: gnmi.models.get.GetResponse
         """
 
+        _planner = planner_factory(planner)
+        if _planner is not None:
+            return _planner.execute(
+                lambda chunk: self.get(
+                    chunk,
+                    prefix=prefix,
+                    encoding=encoding,
+                    data_type=data_type,
+                    models=models,
+                    extensions=extensions,
+                    lazy=lazy,
+                ),
+                paths,
+            )
+
         _gr = GetRequest(
             prefix=prefix,
             paths=paths,
@@ -187,7 +250,7 @@ class Session:
         )
 
         resp = self._stub.Get(_gr.encode(), metadata=self.metadata)
-        return GetResponse.decode(resp)
+        return GetResponse.decode(resp, lazy=lazy)
 
     def set(
         self,
@@ -196,6 +259,7 @@ class Session:
         replacements: UpdateList = [],
         updates: UpdateList = [],
         union_replacements: UpdateList = [],
+        request: SetRequestLike | None = None,
     ) -> SetResponse:
         r"""Set: set, update or delete value from specified path
 
@@ -216,18 +280,57 @@ class Session:
         :type deletes: list
         :param union_replacements: union replacements
         :type union_replacements: list
+        :param request: a prebuilt request, e.g. from
+            :class:`gnmi.models.set.SetRequestBuilder`, sent as is. Can't be
+            combined with the other arguments.
+        :type request: SetRequestBuilder | SetRequest | pb.SetRequest
         :rtype: gnmi.models.set.SetResponse
         """
 
-        _sr = SetRequest(
-            prefix=prefix,
-            deletes=deletes,
-            replacements=replacements,
-            updates=updates,
-            union_replacements=union_replacements,
-        )
+        if request is not None:
+            if prefix or deletes or replacements or updates or union_replacements:
+                raise ValueError("request can't be combined with other set arguments")
+            req = set_request_factory(request)
+        else:
+            req = SetRequest(
+                prefix=prefix,
+                deletes=deletes,
+                replacements=replacements,
+                updates=updates,
+                union_replacements=union_replacements,
+            ).encode()
+
+        return SetResponse.decode(self._stub.Set(req, metadata=self.metadata))
+
+    def batch(
+        self,
+        prefix: PathLike | None = None,
+        max_ops: int | None = None,
+        max_bytes: int | None = None,
+    ) -> SetBatch:
+        r"""Queue set operations and send them together
+
+        Usage::
 
-        return SetResponse.decode(self._stub.Set(_sr.encode(), metadata=self.metadata))
+            In [5]: with sess.batch() as batch:
+                ...:     batch.update("/system/config/hostname", "r1")
+                ...:     banner = batch.delete("/system/config/login-banner")
+                ...:
+            In [6]: banner.response.op
+            Out[6]: <Operation.DELETE: 1>
+
+        :param prefix: prefix of every request
+        :type prefix: str
+        :param max_ops: most operations in one ``SetRequest``
+        :type max_ops: int
+        :param max_bytes: rough upper bound of the encoded size of one
+            ``SetRequest``
+        :type max_bytes: int
+        :rtype: gnmi.set_batch.SetBatch
+        """
+        return SetBatch(
+            lambda request: self.set(request=request), prefix, max_ops, max_bytes
+        )
 
     def subscribe(
         self,
@@ -238,7 +341,10 @@ class Session:
         qos: int = 0,
         aggregate: bool = False,
         timeout: int | None = None,
-    ) -> Iterable[SubscribeResponse]:
+        lazy: bool = False,
+        decode: str = "model",
+        filter: MatcherLike = None,
+    ) -> Iterable[SubscribeResponse | pb.SubscribeResponse | bytes]:
         r"""Subscribe to state updates from the target
 
         Usage::
@@ -293,9 +399,25 @@ class Session:
         :type: bool
         :param timeout:
         :type: int
+        :param lazy: decode notifications on first access
+            (see :class:`gnmi.models.notification.LazyNotification`)
+        :type: bool
+        :param decode: ``"model"`` yields ``SubscribeResponse`` objects,
+            ``"proto"`` the raw ``pb.SubscribeResponse`` messages and
+            ``"none"`` the serialized bytes. Use
+            :func:`gnmi.models.subscribe.peek_response` to route raw
+            responses by target without decoding them.
+        :type: str
+        :param filter: only pass on the updates and deletes matching these
+            path patterns, dropping responses left empty (see
+            :class:`gnmi.matcher.PathMatcher`)
+        :type: PathMatcher | list
         :rtype: gnmi.models.subscribe.SubscribeResponse
         """
 
+        decode = decode_mode_factory(decode)
+        matcher = matcher_factory(filter)
+
         def _sr():
             yield SubscribeRequest(
                 subscribe=SubscriptionList(
@@ -308,5 +430,81 @@ class Session:
                 )
             ).encode()
 
+        if decode == "none":
+            # skip the generated stub so gRPC hands back the undecoded bytes
+            call = self._channel.stream_stream(
+                SUBSCRIBE_RPC,
+                request_serializer=pb.SubscribeRequest.SerializeToString,
+                response_deserializer=None,
+            )
+            for raw in call(_sr(), timeout=timeout, metadata=self.metadata):
+                if matcher is not None:
+                    raw = matcher.filter_bytes(raw)
+                    if raw is None:
+                        continue
+                yield raw
+            return
+
         for r in self._stub.Subscribe(_sr(), timeout=timeout, metadata=self.metadata):
-            yield SubscribeResponse.decode(r)
+            if matcher is not None and not matcher.filter_response(r):
+                continue
+            if decode == "proto":
+                yield r
+            else:
+                yield SubscribeResponse.decode(r, lazy=lazy)
+
+    def subscribe_poll(
+        self,
+        subscriptions: Sequence[str | Path | Subscription],
+        prefix: PathLike | None = None,
+        encoding: Encoding | str | int = "json",
+        aggregate: bool = False,
+        timeout: int | None = None,
+        lazy: bool = False,
+        initial: bool = True,
+    ) -> PollSubscription:
+        r"""Open a POLL mode subscription
+
+        The stream stays open and every ``poll()`` returns the target's
+        notifications up to the next ``sync_response``.
+
+        Usage::
+
+            In [61]: with sess.subscribe_poll(paths, prefix="/interfaces") as sub:
+                ...:     for notifs in sub.every(10, count=3):
+                ...:         print(len(notifs))
+
+        :param subscriptions: List of paths or Subscription objects
+        :type subscriptions: list
+        :param prefix:
+        :type: t.Optional[str]
+        :param encoding:
+        :type: str
+        :param aggregate:
+        :type: bool
+        :param timeout: deadline of the whole stream
+        :type: int
+        :param lazy: decode notifications on first access
+        :type: bool
+        :param initial: read the data the target sends after the
+            subscription, up to the first ``sync_response``, into
+            ``initial``. Pass ``False`` for targets that only answer polls
+        :type: bool
+        :rtype: gnmi.polling.PollSubscription
+        """
+        request = SubscribeRequest(
+            subscribe=SubscriptionList(
+                subscriptions=subscriptions,
+                prefix=prefix,
+                mode="poll",
+                allow_aggregation=aggregate,
+                encoding=encoding,
+            )
+        ).encode()
+
+        def open_stream(requests):
+            return self._stub.Subscribe(
+                requests, timeout=timeout, metadata=self.metadata
+            )
+
+        return PollSubscription(open_stream, request, lazy=lazy, initial=initial)
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+"""Accumulate many small sets into few Set RPCs.
+
+Inside a batch, set operations are queued instead of sent one RPC each.
+When the batch exits they go out as one ``SetRequest``, or as several if
+``max_ops`` / ``max_bytes`` is set::
+
+    with sess.batch() as batch:
+        for name, desc in descriptions.items():
+            path = f"/interfaces/interface[name={name}]/config/description"
+            batch.update(path, desc)
+        batch.delete("/system/config/login-banner")
+
+Operations made redundant by a later one are dropped before sending:
+anything under a path that is later deleted or replaced, a repeated
+replace of the same path, and a repeated update of the same path with a
+scalar value. Repeated updates of a path with JSON objects are merged into
+one, other repeated updates (lists, typed JSON) are all sent. An update
+is only dropped or merged if nothing queued since touched its path. Each
+operation returns a :class:`SetResult` that holds the matching
+``UpdateResult`` once the batch is flushed.
+"""
+
+import enum
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from gnmi.models.path import PathLike, path_factory
+from gnmi.models.set import _SCALAR_FIELDS, SetRequestBuilder, SetResponse
+from gnmi.models.update_result import UpdateResult
+from gnmi.models.value import Value, ValueType, value_type_factory
+from gnmi.proto import gnmi_pb2 as pb
+
+
+class BatchOp(enum.Enum):
+    DELETE = "delete"
+    REPLACE = "replace"
+    UPDATE = "update"
+    UNION_REPLACE = "union_replace"
+
+
+# the order a target applies the operations of one request in
+_REQUEST_ORDER = (
+    BatchOp.DELETE,
+    BatchOp.REPLACE,
+    BatchOp.UPDATE,
+    BatchOp.UNION_REPLACE,
+)
+_RANK = {op: i for i, op in enumerate(_REQUEST_ORDER)}
+
+
+class _Key(NamedTuple):
+    origin: str
+    target: str
+    elem: tuple
+
+    def covers(self, other: "_Key") -> bool:
+        n = len(self.elem)
+        return (
+            self.origin == other.origin
+            and self.target == other.target
+            and other.elem[:n] == self.elem
+        )
+
+
+class SetResult:
+    """Outcome of one batched operation.
+
+    ``response`` is the target's ``UpdateResult`` after the flush. An
+    operation dropped in favour of a later one reports the result of that
+    one, and ``superseded`` is set.
+    """
+
+    __slots__ = ("_by", "_response", "done", "op", "path")
+
+    def __init__(self, op: BatchOp, path: PathLike):
+        self.op = op
+        self.path = path
+        self.done = False
+        self._response: UpdateResult | None = None
+        self._by: "SetResult | None" = None
+
+    def __repr__(self) -> str:
+        return f"SetResult({self.op.value}, {str(self.path)!r}, done={self.done})"
+
+    @property
+    def superseded(self) -> bool:
+        return self._by is not None
+
+    @property
+    def response(self) -> UpdateResult | None:
+        if self._by is not None:
+            return self._by.response
+        if not self.done:
+            raise ValueError("batch has not been flushed")
+        return self._response
+
+
+class _Pending:
+    __slots__ = ("barrier", "key", "live", "result", "value")
+
+    def __init__(self, key: _Key, value: Any, result: SetResult):
+        self.key = key
+        self.value = value
+        self.result = result
+        self.live = True
+        # must go in a later request than the operations queued before it
+        self.barrier = False
+
+
+class _SetBatch:
+    def __init__(
+        self,
+        prefix: PathLike | None = None,
+        max_ops: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.prefix = prefix
+        self.max_ops = max_ops
+        self.max_bytes = max_bytes
+        self._ops: list[_Pending] = []
+
+    def __len__(self) -> int:
+        """Number of operations that will be sent."""
+        return sum(1 for p in self._ops if p.live)
+
+    def delete(self, path: PathLike) -> SetResult:
+        return self._add(BatchOp.DELETE, path, None)
+
+    def replace(self, path: PathLike, value: Any) -> SetResult:
+        return self._add(BatchOp.REPLACE, path, value)
+
+    def update(self, path: PathLike, value: Any) -> SetResult:
+        return self._add(BatchOp.UPDATE, path, value)
+
+    def union_replace(self, path: PathLike, value: Any) -> SetResult:
+        return self._add(BatchOp.UNION_REPLACE, path, value)
+
+    def clear(self) -> None:
+        """Drop the queued operations without sending them."""
+        self._ops.clear()
+
+    def _add(self, op: BatchOp, path: PathLike, value: Any) -> SetResult:
+        p = path_factory(path)
+        key = _Key(p.origin, p.target, tuple(p.elem))
+        result = SetResult(op, path)
+        pending = _Pending(key, value, result)
+
+        overrides = op is BatchOp.DELETE or op is BatchOp.REPLACE
+        rank = _RANK[op]
+        # latest first: an operation on an overlapping path queued after
+        # ``prev`` keeps ``prev`` from being merged into this one
+        touched = False
+        for prev in reversed(self._ops):
+            if not prev.live:
+                continue
+            if key.covers(prev.key):
+                # a delete or replace makes anything queued for the same
+                # path, or below it, moot
+                if overrides or (
+                    not touched
+                    and prev.result.op is op
+                    and prev.key == key
+                    and _supersedes(prev, pending)
+                ):
+                    self._drop(prev, result)
+                    continue
+            elif not prev.key.covers(key):
+                continue
+            touched = True
+            # overlapping paths whose order would be swapped by the
+            # request's fixed delete/replace/update order
+            if _RANK[prev.result.op] > rank:
+                pending.barrier = True
+
+        self._ops.append(pending)
+        return result
+
+    def _drop(self, prev: _Pending, by: SetResult) -> None:
+        prev.live = False
+        prev.result._by = by
+
+    def _chunks(self) -> list[tuple[SetRequestBuilder, list[_Pending]]]:
+        """Split the live operations into requests, in the order queued."""
+        chunks: list[tuple[SetRequestBuilder, list[_Pending]]] = []
+        builder, ops, size = SetRequestBuilder(self.prefix), [], 0
+
+        for pending in self._ops:
+            if not pending.live:
+                continue
+            if ops and (
+                pending.barrier
+                or (self.max_ops is not None and len(ops) >= self.max_ops)
+            ):
+                chunks.append((builder, ops))
+                builder, ops, size = SetRequestBuilder(self.prefix), [], 0
+
+            field = _add_to(builder, pending)
+            # an element's size plus its tag and length prefix, roughly
+            op_size = field[-1].ByteSize() + 4
+            if self.max_bytes is not None and ops and size + op_size > self.max_bytes:
+                del field[-1]
+                chunks.append((builder, ops))
+                builder, ops, size = SetRequestBuilder(self.prefix), [], 0
+                _add_to(builder, pending)
+            ops.append(pending)
+            size += op_size
+
+        if ops:
+            chunks.append((builder, ops))
+        return chunks
+
+    def _resolve(self, ops: list[_Pending], response: SetResponse) -> None:
+        # the request (and so the response) lists operations grouped by type
+        ordered = [p for op in _REQUEST_ORDER for p in ops if p.result.op is op]
+        results = response.responses
+        positional = len(results) == len(ordered)
+        by_path = {}
+        if not positional:
+            by_path = {(r.op.name, str(r.path)): r for r in results}
+
+        for i, pending in enumerate(ordered):
+            result = pending.result
+            if positional:
+                result._response = results[i]
+            else:
+                path = str(path_factory(result.path))
+                result._response = by_path.get((result.op.name, path))
+            result.done = True
+
+    def _sent(self, sent: list[_Pending]) -> None:
+        done = {id(p) for p in sent}
+        self._ops = [p for p in self._ops if id(p) not in done and p.live]
+
+
+def _supersedes(prev: _Pending, pending: _Pending) -> bool:
+    """Whether ``pending`` makes ``prev``, on the same path, redundant.
+
+    A later update only overwrites the leaf of an earlier scalar one; two
+    JSON objects are merged into ``pending``, anything else is kept.
+    """
+    if pending.result.op is not BatchOp.UPDATE:
+        return True
+    if isinstance(prev.value, dict) and isinstance(pending.value, dict):
+        pending.value = _merge(prev.value, pending.value)
+        return True
+    return _is_scalar(prev.value) and _is_scalar(pending.value)
+
+
+def _is_scalar(value: Any) -> bool:
+    if isinstance(value, pb.TypedValue):
+        return value.WhichOneof("value") in _SCALAR_FIELDS.values()
+    if isinstance(value, Value):
+        return value.val_type in _SCALAR_FIELDS
+    if isinstance(value, tuple):
+        return len(value) == 2 and value_type_factory(value[1]) in _SCALAR_FIELDS
+    return ValueType.from_val(value) in _SCALAR_FIELDS
+
+
+def _merge(old: dict, new: dict) -> dict:
+    out = dict(old)
+    for k, v in new.items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            v = _merge(out[k], v)
+        out[k] = v
+    return out
+
+
+def _add_to(builder: SetRequestBuilder, pending: _Pending):
+    req = builder.build()
+    op = pending.result.op
+    path = pending.result.path
+    if op is BatchOp.DELETE:
+        builder.delete([path])
+        return req.delete
+    if op is BatchOp.REPLACE:
+        builder.replace([(path, pending.value)])
+        return req.replace
+    if op is BatchOp.UPDATE:
+        builder.update([(path, pending.value)])
+        return req.update
+    builder.union_replace([(path, pending.value)])
+    return req.union_replace
+
+
+class SetBatch(_SetBatch):
+    """Batch of set operations sent with ``set``, see :meth:`Session.batch`.
+
+    Leaving the ``with`` block flushes the batch, unless it is left with an
+    exception, in which case the queued operations are discarded.
+    """
+
+    def __init__(
+        self,
+        set: Callable[[SetRequestBuilder], SetResponse],
+        prefix: PathLike | None = None,
+        max_ops: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        super().__init__(prefix, max_ops, max_bytes)
+        self._set = set
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.clear()
+
+    def flush(self) -> list[SetResponse]:
+        """Send the queued operations, one response per request.
+
+        If a request fails its error is raised and the operations of it and
+        of the requests after it stay queued.
+        """
+        responses = []
+        for builder, ops in self._chunks():
+            response = self._set(builder)
+            self._resolve(ops, response)
+            self._sent(ops)
+            responses.append(response)
+        self.clear()
+        return responses
+
+
+class AsyncSetBatch(_SetBatch):
+    """Async :class:`SetBatch`, see :meth:`AsyncSession.batch`."""
+
+    def __init__(
+        self,
+        set: Callable[[SetRequestBuilder], Awaitable[SetResponse]],
+        prefix: PathLike | None = None,
+        max_ops: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        super().__init__(prefix, max_ops, max_bytes)
+        self._set = set
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.clear()
+
+    async def flush(self) -> list[SetResponse]:
+        """Async :meth:`SetBatch.flush`."""
+        responses = []
+        for builder, ops in self._chunks():
+            response = await self._set(builder)
+            self._resolve(ops, response)
+            self._sent(ops)
+            responses.append(response)
+        self.clear()
+        return responses
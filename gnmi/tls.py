@@ -1,6 +1,12 @@
+import asyncio
 import socket
 import ssl
+import threading
+import time
 from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from gnmi._env import env
 from gnmi.models.target import Target
 
 
@@ -38,3 +44,117 @@ def get_server_certificate(
             if pem:
                 return ssl.DER_cert_to_PEM_cert(cert).encode()
             return cert
+
+
+async def aget_server_certificate(
+    t: Target,
+    context: ssl.SSLContext | None = None,
+    pem: bool = False,
+    timeout: float | None = None,
+) -> bytes | None:
+    """Asyncio version of :func:`get_server_certificate`.
+
+    The connect and handshake run on the event loop instead of blocking it.
+    """
+    hostaddr, port = t.hostaddr, t.port
+    context = context if context else ssl.create_default_context()
+    _, writer = await asyncio.wait_for(
+        asyncio.open_connection(hostaddr, port, ssl=context, server_hostname=hostaddr),
+        timeout,
+    )
+    try:
+        sslobj = writer.get_extra_info("ssl_object")
+        cert = sslobj.getpeercert(binary_form=True) if sslobj else None
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, ssl.SSLError):
+            pass
+
+    if not cert:
+        return None
+    if pem:
+        return ssl.DER_cert_to_PEM_cert(cert).encode()
+    return cert
+
+
+def server_cert_key(t: Target, tls: TLSConfig) -> tuple:
+    """Cache key for the certificate fetched from ``t`` under ``tls``.
+
+    The trust settings are part of the key: the fetch doubles as a
+    validation against them.
+    """
+    return (t.hostaddr, t.port, tls.ca_cert, tls.no_verify)
+
+
+class CertificateCache:
+    """Fetched server certificates, kept for ``ttl`` seconds.
+
+    A ``ttl`` of 0 disables caching. Concurrent async fetches for the same
+    key on the same event loop share a single handshake.
+    """
+
+    def __init__(self, ttl: float = env.GNMIP_TLS_CERT_CACHE_TTL):
+        self.ttl = ttl
+        self._certs: dict[Hashable, tuple[float, bytes]] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._certs)
+
+    def get(self, key: Hashable) -> bytes | None:
+        with self._lock:
+            item = self._certs.get(key)
+            if item is None:
+                return None
+            expires, cert = item
+            if time.monotonic() >= expires:
+                del self._certs[key]
+                return None
+            return cert
+
+    def put(self, key: Hashable, cert: bytes | None) -> None:
+        if not cert or self.ttl <= 0:
+            return
+        with self._lock:
+            self._certs[key] = (time.monotonic() + self.ttl, cert)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._certs.clear()
+
+    def fetch(self, key: Hashable, fetch: Callable[[], bytes | None]) -> bytes | None:
+        """Return the cached certificate for ``key`` or ``fetch()`` it."""
+        cert = self.get(key)
+        if cert is None:
+            cert = fetch()
+            self.put(key, cert)
+        return cert
+
+    async def afetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        """Async :meth:`fetch`, joining a fetch already in flight."""
+        cert = self.get(key)
+        if cert is not None:
+            return cert
+
+        flight = (key, asyncio.get_running_loop())
+        pending = self._inflight.get(flight)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        pending = asyncio.ensure_future(fetch())
+        self._inflight[flight] = pending
+        try:
+            cert = await asyncio.shield(pending)
+        finally:
+            if self._inflight.get(flight) is pending:
+                del self._inflight[flight]
+        self.put(key, cert)
+        return cert
+
+
+server_certificates = CertificateCache()
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+"""Path-keyed trie with wildcard queries.
+
+:class:`PathTrie` maps paths to values and answers wildcard patterns by
+walking only the branches that can match, instead of comparing every
+stored path::
+
+    trie = PathTrie()
+    trie.insert("/interfaces/interface[name=Ethernet1]/state/mtu", 1500)
+    for path, value in trie.match("/interfaces/interface[name=*]/.../mtu"):
+        ...
+
+Patterns may use ``*`` for an element name, ``*`` for a key value (the key
+must be present) and ``...`` for any number of levels, including none. A
+pattern element without keys matches every key set of its name, as in
+subscription paths.
+
+Elements are stored by name, and keyed elements by their key values
+below that, so an exact element is a dict lookup and ``[name=*]`` only
+visits the entries of that name. Origin and target are not part of the
+key, keep one trie per origin.
+"""
+
+import sys
+from typing import Any, Generic, Iterator, Sequence, TypeVar
+
+from gnmi.models.path import Path, PathElem, PathLike, path_factory
+
+T = TypeVar("T")
+
+WILDCARD = "*"
+MULTI_LEVEL = "..."
+
+# key of a node's own value, for paths that hold a value and have children
+_SELF = None
+
+
+class _Node(dict):
+    """Children of a path, by element name."""
+
+    __slots__ = ()
+
+
+class _Keyed(dict):
+    """Children sharing an element name, by key values (``()`` if none).
+
+    ``width`` is the largest number of keys an entry was stored with, a
+    pattern naming that many keys can only match its exact key set.
+    """
+
+    __slots__ = ("width",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.width = 0
+
+
+_CONTAINERS = (_Node, _Keyed)
+
+TriePath = PathLike | Sequence[PathElem]
+
+
+def _elems(path: TriePath) -> Sequence[PathElem]:
+    if isinstance(path, (tuple, list)):
+        return path
+    return path_factory(path).elem
+
+
+class PathTrie(Generic[T]):
+    """Mapping of paths to values, queried by prefix or wildcard pattern.
+
+    Paths are given as anything ``path_factory`` accepts or as a sequence
+    of :class:`~gnmi.models.path.PathElem`. A path can hold a value and
+    have children at the same time. ``None`` is not a storable value, it
+    stands for a missing path.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, path: TriePath) -> bool:
+        return self._find(_elems(path)) is not None
+
+    def __iter__(self) -> Iterator[tuple[Path, T]]:
+        return self.items()
+
+    def clear(self) -> None:
+        self._root = _Node()
+        self._len = 0
+
+    def insert(self, path: TriePath, value: T) -> bool:
+        """Set the value at ``path``, return ``True`` if it is new."""
+        elem = _elems(path)
+        if not elem:
+            raise ValueError("cannot insert a value at the root path")
+        return self._set(self._root, elem, value)
+
+    def insert_many(
+        self, items: Sequence[tuple[TriePath, T]], prefix: TriePath = ()
+    ) -> int:
+        """Insert ``(path, value)`` pairs below ``prefix``.
+
+        The prefix is walked once for all of them, as for the updates of a
+        notification. Returns the number of new paths.
+        """
+        node = _container(self._root, _elems(prefix))
+        n = 0
+        for path, value in items:
+            n += self._set(node, path if type(path) is tuple else _elems(path), value)
+        return n
+
+    def get(self, path: TriePath, default: Any = None) -> T | Any:
+        value = self._find(_elems(path))
+        return default if value is None else value
+
+    def delete(self, path: TriePath) -> int:
+        """Remove the value at ``path`` and everything below it.
+
+        Returns the number of values removed. The root path clears the
+        trie. An element without keys naming a list removes all of its
+        entries, as a gNMI delete does.
+        """
+        elem = tuple(_elems(path))
+        if not elem:
+            n = self._len
+            self.clear()
+            return n
+
+        n = 0
+        # trail is the (container, key) of every step, to prune what the
+        # delete empties
+        for _, node, trail in list(_expand(self._root, elem, 0, (), ())):
+            steps = list(trail)
+            container, key = steps.pop()
+            del container[key]
+            n += _count(node)
+            while not container and steps:
+                container, key = steps.pop()
+                del container[key]
+        self._len -= n
+        return n
+
+    def prune(self, predicate) -> int:
+        """Remove every value ``predicate(value)`` is true for."""
+        n = _prune(self._root, predicate)
+        self._len -= n
+        return n
+
+    def items(self, prefix: TriePath = ()) -> Iterator[tuple[Path, T]]:
+        """Every ``(path, value)`` at or below ``prefix``, depth first.
+
+        An element of ``prefix`` without keys naming a list covers all of
+        its entries.
+        """
+        for path, node, _ in _expand(self._root, tuple(_elems(prefix)), 0, (), ()):
+            yield from _walk(node, path)
+
+    def match(self, pattern: PathLike) -> Iterator[tuple[Path, T]]:
+        """Every ``(path, value)`` matching the wildcard ``pattern``."""
+        elem = tuple(path_factory(pattern).elem)
+        matches = _match(self._root, elem, 0, ())
+        if sum(1 for e in elem if e.name == MULTI_LEVEL) < 2:
+            yield from matches
+            return
+        # several ``...`` can match the same path more than one way
+        seen = set()
+        for path, value in matches:
+            if path not in seen:
+                seen.add(path)
+                yield path, value
+
+    def _find(self, elem: Sequence[PathElem]) -> T | None:
+        node: Any = self._root
+        for e in elem:
+            node = _child(node, e)
+            if node is None:
+                return None
+        if type(node) is _Node:
+            return node.get(_SELF)
+        return node if elem else None
+
+    def _set(self, node: _Node, elem: Sequence[PathElem], value: T) -> bool:
+        if len(elem) > 1:
+            node = _container(node, elem[:-1])
+        e = elem[-1]
+
+        entry = node.get(e.name)
+        if e.keys or type(entry) is _Keyed:
+            if type(entry) is not _Keyed:
+                entry = node[sys.intern(e.name)] = _keyed(entry)
+            entry.width = max(entry.width, len(e.keys))
+            holder: dict = entry
+            key: Any = e.keys
+        else:
+            holder, key = node, e.name
+        current = holder.get(key)
+
+        if type(current) is _Node:
+            holder, key = current, _SELF
+            current = current.get(_SELF)
+        if current is None:
+            if holder is node:
+                key = sys.intern(key)
+            holder[key] = value
+            self._len += 1
+            return True
+        holder[key] = value
+        return False
+
+
+def _keyed(entry: Any) -> _Keyed:
+    # a keyless child already stored under the name moves to key ``()``
+    return _Keyed() if entry is None else _Keyed({(): entry})
+
+
+def _child(node: Any, e: PathElem) -> Any:
+    if type(node) is not _Node:
+        return None
+    entry = node.get(e.name)
+    if type(entry) is _Keyed:
+        return entry.get(e.keys)
+    return None if e.keys else entry
+
+
+def _expand(
+    node: Any, elem: tuple, i: int, path: tuple, trail: tuple
+) -> Iterator[tuple[tuple, Any, tuple]]:
+    """``(path, node, trail)`` of what ``elem`` names below ``node``.
+
+    Exact but for elements without keys over a list, which stand for every
+    entry of it. ``trail`` holds the ``(container, key)`` of each step.
+    """
+    if i == len(elem):
+        yield path, node, trail
+        return
+    if type(node) is not _Node:
+        return
+    e = elem[i]
+    entry = node.get(e.name)
+    if type(entry) is _Keyed:
+        step = trail + ((node, e.name),)
+        keys = [e.keys] if e.keys else list(entry)
+        for k in keys:
+            child = entry.get(k)
+            if child is not None:
+                yield from _expand(
+                    child,
+                    elem,
+                    i + 1,
+                    path + (PathElem._make(e.name, k),),
+                    step + ((entry, k),),
+                )
+    elif entry is not None and not e.keys:
+        yield from _expand(entry, elem, i + 1, path + (e,), trail + ((node, e.name),))
+
+
+def _container(node: _Node, elem: Sequence[PathElem]) -> _Node:
+    """The node at ``elem`` below ``node``, created as needed."""
+    for e in elem:
+        entry = node.get(e.name)
+        if e.keys or type(entry) is _Keyed:
+            if type(entry) is not _Keyed:
+                entry = node[sys.intern(e.name)] = _keyed(entry)
+            entry.width = max(entry.width, len(e.keys))
+            holder: dict = entry
+            key: Any = e.keys
+        else:
+            holder, key = node, sys.intern(e.name)
+        child = holder.get(key)
+        if type(child) is not _Node:
+            # a value stored here becomes the new node's own value
+            child = holder[key] = _Node() if child is None else _Node({_SELF: child})
+        node = child
+    return node
+
+
+def _count(node: Any) -> int:
+    if type(node) not in _CONTAINERS:
+        return 1
+    n = 0
+    stack = [node]
+    while stack:
+        for child in stack.pop().values():
+            if type(child) in _CONTAINERS:
+                stack.append(child)
+            else:
+                n += 1
+    return n
+
+
+def _prune(node: dict, predicate) -> int:
+    n = 0
+    for key, child in list(node.items()):
+        if type(child) in _CONTAINERS:
+            n += _prune(child, predicate)
+            if not child:
+                del node[key]
+        elif predicate(child):
+            del node[key]
+            n += 1
+    return n
+
+
+def _children(node: _Node, name: str | None = None) -> Iterator[tuple[PathElem, Any]]:
+    """``(element, child)`` pairs of ``node``, of one name or of all."""
+    names = node.items() if name is None else [(name, node.get(name))]
+    for n, entry in names:
+        if n is _SELF or entry is None:
+            continue
+        if type(entry) is _Keyed:
+            for keys, child in entry.items():
+                yield PathElem._make(n, keys), child
+        else:
+            yield PathElem._make(n, ()), entry
+
+
+def _walk(node: Any, elem: tuple) -> Iterator[tuple[Path, Any]]:
+    stack = [(elem, node)]
+    while stack:
+        elem, node = stack.pop()
+        if type(node) is not _Node:
+            yield Path._make(elem, "", ""), node
+            continue
+        if _SELF in node:
+            yield Path._make(elem, "", ""), node[_SELF]
+        children = [(elem + (e,), child) for e, child in _children(node)]
+        stack.extend(reversed(children))
+
+
+def _keys_match(pattern: tuple, keys: tuple) -> bool:
+    for k, v in pattern:
+        for dk, dv in keys:
+            if dk == k:
+                if v != WILDCARD and v != dv:
+                    return False
+                break
+        else:
+            return False
+    return True
+
+
+def _match(
+    node: Any, pattern: tuple, i: int, elem: tuple
+) -> Iterator[tuple[Path, Any]]:
+    if i == len(pattern):
+        if type(node) is not _Node:
+            yield Path._make(elem, "", ""), node
+        elif _SELF in node:
+            yield Path._make(elem, "", ""), node[_SELF]
+        return
+    if type(node) is not _Node:
+        # only trailing ``...`` can still match, with zero levels
+        if all(p.name == MULTI_LEVEL for p in pattern[i:]):
+            yield Path._make(elem, "", ""), node
+        return
+
+    p = pattern[i]
+    if p.name == MULTI_LEVEL:
+        yield from _match(node, pattern, i + 1, elem)
+        for e, child in _children(node):
+            yield from _match(child, pattern, i, elem + (e,))
+        return
+
+    if p.name != WILDCARD and not any(v == WILDCARD for _, v in p.keys):
+        entry = node.get(p.name)
+        if type(entry) is _Keyed and len(p.keys) >= entry.width:
+            child = entry.get(p.keys)
+            if child is not None:
+                yield from _match(
+                    child, pattern, i + 1, elem + (PathElem._make(p.name, p.keys),)
+                )
+            return
+        if type(entry) is not _Keyed:
+            if entry is not None and not p.keys:
+                yield from _match(
+                    entry, pattern, i + 1, elem + (PathElem._make(p.name, ()),)
+                )
+            return
+        # the pattern leaves out some keys, they may take any value
+
+    for e, child in _children(node, None if p.name == WILDCARD else p.name):
+        if _keys_match(p.keys, e.keys):
+            yield from _match(child, pattern, i + 1, elem + (e,))
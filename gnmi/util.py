@@ -107,3 +107,45 @@ def oneof(*args) -> int:
         raise ValueError("There must be one and only be one; you have none")
 
     return the[0]
+
+
+def varint(buf: bytes, pos: int) -> tuple[int, int]:
+    """Protobuf varint at ``pos`` of ``buf``, and the position after it."""
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def wire_fields(
+    buf: bytes, pos: int, end: int
+) -> t.Iterator[tuple[int, int | tuple[int, int] | None]]:
+    """Fields of the protobuf message in ``buf[pos:end]``, unparsed.
+
+    Yields ``(field number, value)``: the value of varints, the ``(start,
+    end)`` span of length-delimited fields (nested messages, strings) and
+    ``None`` for fixed-size ones.
+    """
+    while pos < end:
+        tag, pos = varint(buf, pos)
+        wire_type = tag & 0x07
+        if wire_type == 0:
+            val, pos = varint(buf, pos)
+            yield tag >> 3, val
+        elif wire_type == 2:
+            size, pos = varint(buf, pos)
+            yield tag >> 3, (pos, pos + size)
+            pos += size
+        elif wire_type == 1:
+            pos += 8
+            yield tag >> 3, None
+        elif wire_type == 5:
+            pos += 4
+            yield tag >> 3, None
+        else:
+            raise ValueError(f"unsupported wire type {wire_type}")
@@ -7,7 +7,9 @@ import grpc
 from gnmi.proto import gnmi_pb2 as pb
 from gnmi.proto import gnmi_pb2_grpc
 from gnmi.session import TLSConfig
+from gnmi import codec
 from gnmi._env import env
+from gnmi.tls import server_certificates
 
 # When no live gNMI device is provided, fall back to the in-process stub
 # server below. Tests that fundamentally need a real device (state
@@ -37,6 +39,23 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def _clear_server_cert_cache():
+    # fetched server certificates are cached process-wide, keep tests apart
+    server_certificates.clear()
+    yield
+    server_certificates.clear()
+
+
+@pytest.fixture
+def stdlib_json():
+    """Encode JSON values with the stdlib, for tests of its exact output."""
+    prev = codec.get_backend()
+    codec.set_backend("json")
+    yield
+    codec.set_backend(prev)
+
+
 def _path_key(p: pb.Path) -> bytes:
     """Stable, hashable key for a proto Path."""
     return p.SerializeToString(deterministic=True)
@@ -108,11 +127,14 @@ class StubGNMIServicer(gnmi_pb2_grpc.gNMIServicer):
 
     def _default_subscribe(self, request_iterator, context):
         # Echo each subscribed path as a single update, then send sync.
+        # A poll repeats that for the last subscription list.
+        sl = None
         for req in request_iterator:
             self.last_subscribe_requests.append(req)
-            if not req.HasField("subscribe"):
+            if req.HasField("subscribe"):
+                sl = req.subscribe
+            elif not req.HasField("poll") or sl is None:
                 continue
-            sl = req.subscribe
             for sub in sl.subscription:
                 val = self.store.get(
                     _path_key(sub.path),
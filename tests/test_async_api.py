@@ -46,3 +46,17 @@ async def test_asubscribe(stub_server):
     ):
         notifs.append(notif)
     assert len(notifs) >= 1
+
+
+async def test_asubscribe_raw(stub_server):
+    raw = []
+    async for resp in asubscribe(
+        stub_server.target,
+        ["/system/config/hostname"],
+        insecure=True,
+        mode="once",
+        decode="none",
+    ):
+        raw.append(resp)
+    assert len(raw) == 1
+    assert isinstance(raw[0], bytes)
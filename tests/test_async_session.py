@@ -74,6 +74,20 @@ async def test_async_set_round_trips_all_ops(stub_server):
     assert [r.op.name for r in resp.responses] == ["DELETE", "REPLACE", "UPDATE"]
 
 
+async def test_async_set_request_builder(stub_server):
+    from gnmi.models import SetRequestBuilder
+
+    b = SetRequestBuilder().replace({"/c/d": "v"})
+    sess = AsyncSession(stub_server.target, insecure=True)
+    try:
+        resp = await sess.set(request=b)
+    finally:
+        await sess._channel.close(None)
+
+    assert [r.op.name for r in resp.responses] == ["REPLACE"]
+    assert stub_server.servicer.last_set_request == b.build()
+
+
 async def test_async_subscribe_streams_then_sync(stub_server):
 
     sess = AsyncSession(stub_server.target, insecure=True)
@@ -93,6 +107,22 @@ async def test_async_subscribe_streams_then_sync(stub_server):
     assert set(seen) == {"/a", "/b"}
 
 
+async def test_async_subscribe_decode_modes(stub_server):
+    from gnmi.models.subscribe import peek_response
+    from gnmi.proto import gnmi_pb2 as pb
+
+    sess = AsyncSession(stub_server.target, insecure=True)
+    try:
+        protos = [r async for r in sess.subscribe(["/a"], mode="once", decode="proto")]
+        raw = [r async for r in sess.subscribe(["/a"], mode="once", decode="none")]
+    finally:
+        await sess._channel.close(None)
+
+    assert all(isinstance(r, pb.SubscribeResponse) for r in protos)
+    assert all(isinstance(r, bytes) for r in raw)
+    assert [peek_response(r) for r in raw] == [peek_response(r) for r in protos]
+
+
 async def test_async_session_string_target_now_accepted(stub_server):
     """Regression for the prior API mismatch — AsyncSession now wraps a
     string target the way sync Session does."""
@@ -174,6 +204,51 @@ def test_async_session_get_server_cert_fetches_pem(stub_server):
     assert captured["root"] == fetched_pem
 
 
+async def test_async_session_get_server_cert_fetches_without_blocking_loop():
+    """Inside a running loop the certificate is fetched on the loop, once
+    per target, instead of with a blocking handshake in __init__."""
+    fetched_pem = b"-----BEGIN CERTIFICATE-----FETCHED-----END CERTIFICATE-----"
+    tls = AsyncTLSConfig(
+        ca_cert=b"user-ca", client_cert=None, client_key=None, get_server_cert=True
+    )
+
+    captured: list = []
+
+    def fake_creds(root_certificates, private_key, certificate_chain):
+        captured.append(root_certificates)
+        return mock.sentinel.creds
+
+    channel = mock.MagicMock()
+    channel.close = mock.AsyncMock()
+
+    with (
+        mock.patch.object(
+            AsyncTLSConfig,
+            "context",
+            new_callable=mock.PropertyMock,
+            return_value=mock.sentinel.ctx,
+        ),
+        mock.patch.object(async_mod, "get_server_certificate") as sync_fetch,
+        mock.patch.object(
+            async_mod, "aget_server_certificate", return_value=fetched_pem
+        ) as async_fetch,
+        mock.patch.object(async_mod, "ssl_channel_credentials", side_effect=fake_creds),
+        mock.patch.object(async_mod, "secure_channel", return_value=channel),
+    ):
+        sess = AsyncSession("r1.lab:6030", tls=tls)
+        assert sess._channel is None
+
+        async with sess:
+            pass
+        async with AsyncSession("r1.lab:6030", tls=tls):
+            pass
+
+    sync_fetch.assert_not_called()
+    async_fetch.assert_awaited_once()
+    assert async_fetch.call_args.kwargs.get("pem") is True
+    assert captured == [fetched_pem, fetched_pem]
+
+
 def test_async_session_tls_branch_builds_secure_channel():
     tls = AsyncTLSConfig(ca_cert=b"ca", client_cert=b"crt", client_key=b"key")
 
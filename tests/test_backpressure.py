@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import grpc
+import pytest
+
+from gnmi.async_session import AsyncSession
+from gnmi.backpressure import (
+    BackpressureQueue,
+    OverflowPolicy,
+    coalesce_key,
+)
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+
+
+def _resp(path: str, value: int, delete: bool = False) -> pb.SubscribeResponse:
+    p = pb.Path(elem=[pb.PathElem(name=path)])
+    notif = pb.Notification(timestamp=value)
+    if delete:
+        notif.delete.append(p)
+    else:
+        notif.update.append(pb.Update(path=p, val=pb.TypedValue(int_val=value)))
+    return pb.SubscribeResponse(update=notif)
+
+
+async def _fill(q: BackpressureQueue, items) -> None:
+    for item in items:
+        await q.put(item)
+
+
+async def _drain(q: BackpressureQueue) -> list:
+    await q.close()
+    out = []
+    while True:
+        try:
+            out.append(await q.get())
+        except StopAsyncIteration:
+            return out
+
+
+async def test_drop_newest_and_drop_oldest():
+    newest = BackpressureQueue(2, "drop_newest")
+    await _fill(newest, [1, 2, 3, 4])
+    assert await _drain(newest) == [1, 2]
+    assert newest.stats.dropped == 2
+
+    oldest = BackpressureQueue(2, OverflowPolicy.DROP_OLDEST)
+    await _fill(oldest, [1, 2, 3, 4])
+    assert await _drain(oldest) == [3, 4]
+    assert oldest.stats.dropped == 2
+    assert oldest.stats.high_water == 2
+
+
+async def test_coalesce_keeps_latest_value_per_path_in_place():
+    q = BackpressureQueue(3, "coalesce")
+    await _fill(
+        q,
+        [_resp("a", 1), _resp("b", 1), _resp("a", 2), _resp("a", 3), _resp("b", 4)],
+    )
+    # full: "a" and "b" took the latest values in place
+    assert [r.update.timestamp for r in await _drain(q)] == [1, 4, 3]
+    assert q.stats.coalesced == 2
+    assert q.stats.received == 5
+    assert q.stats.delivered == 3
+
+
+async def test_coalesce_only_when_full():
+    keyed = []
+
+    def key(item):
+        keyed.append(item)
+        return coalesce_key(item)
+
+    q = BackpressureQueue(2, "coalesce", key=key)
+    await _fill(q, [_resp("a", 1), _resp("a", 2)])
+    assert keyed == []
+
+    # deletes and sync responses are not merged, the put waits for room
+    put = asyncio.create_task(q.put(_resp("a", 3, delete=True)))
+    await asyncio.sleep(0)
+    assert not put.done()
+    assert (await q.get()).update.timestamp == 1
+    await put
+
+    await q.put(_resp("a", 4).SerializeToString())
+    got = await _drain(q)
+    assert len(keyed) == 3
+    assert got[0] == _resp("a", 4).SerializeToString()
+    assert got[1].update.delete
+
+
+async def test_block_waits_for_consumer():
+    q = BackpressureQueue(1)
+    await q.put(1)
+    put = asyncio.create_task(q.put(2))
+    await asyncio.sleep(0)
+    assert not put.done()
+
+    assert await q.get() == 1
+    await put
+    assert await q.get() == 2
+
+
+def test_coalesce_key_forms_agree_on_sync_and_deletes():
+    assert coalesce_key(pb.SubscribeResponse(sync_response=True)) is None
+    assert coalesce_key(_resp("a", 1, delete=True)) is None
+
+    assert coalesce_key(_resp("a", 1, delete=True).SerializeToString()) is None
+    assert coalesce_key(b"\x18\x01") is None  # sync_response
+
+    raw = _resp("a", 1)
+    raw.update.prefix.target = "t"
+    raw.update.update.add(val=pb.TypedValue(int_val=2))
+    assert coalesce_key(raw) == coalesce_key(raw.SerializeToString())
+    model = SubscribeResponse.decode(raw)
+    assert coalesce_key(model) == coalesce_key(SubscribeResponse.decode(raw))
+    assert coalesce_key(SubscribeResponse.decode(raw, lazy=True)) == coalesce_key(raw)
+
+
+def test_overflow_policy_from_str():
+    assert OverflowPolicy.from_str("drop-oldest") is OverflowPolicy.DROP_OLDEST
+    with pytest.raises(ValueError):
+        OverflowPolicy.from_str("sometimes")
+
+
+async def test_stream_propagates_source_error_after_queued_items():
+    async def source():
+        yield 1
+        yield 2
+        raise RuntimeError("stream broke")
+
+    q = BackpressureQueue(10)
+    got = []
+    with pytest.raises(RuntimeError):
+        async for item in q.stream(source()):
+            got.append(item)
+    assert got == [1, 2]
+
+
+async def test_async_session_subscribe_with_buffer(stub_server):
+    buf = BackpressureQueue(4, "drop_oldest")
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        got = [
+            r
+            async for r in sess.subscribe(
+                ["/system/config/hostname"], mode="once", buffer=buf
+            )
+        ]
+
+    assert [r.sync_response for r in got] == [False, True]
+    assert buf.stats.delivered == 2
+
+
+async def test_async_session_subscribe_buffer_raises_stream_errors(stub_server):
+    def handler(request_iterator, context):
+        context.abort(grpc.StatusCode.UNAVAILABLE, "gone")
+        yield
+
+    stub_server.servicer.subscribe_handler = handler
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        with pytest.raises(grpc.RpcError):
+            async for _ in sess.subscribe(["/system"], buffer=8):
+                pass
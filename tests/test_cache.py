@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+from gnmi.cache import StateCache
+from gnmi.models.path import Path
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.resilient import EventKind, SubscriptionEvent
+from gnmi.session import Session
+
+
+def _path(s: str) -> pb.Path:
+    return Path.from_str(s).encode()
+
+
+def _resp(
+    updates=(), deletes=(), prefix: str | None = None, target: str = "", ts: int = 1
+) -> pb.SubscribeResponse:
+    notif = pb.Notification(
+        timestamp=ts,
+        update=[
+            pb.Update(path=_path(p), val=pb.TypedValue(string_val=v))
+            for p, v in updates
+        ],
+        delete=[_path(p) for p in deletes],
+    )
+    if prefix is not None or target:
+        notif.prefix.CopyFrom(_path(prefix or "/"))
+        notif.prefix.target = target
+    return pb.SubscribeResponse(update=notif)
+
+
+SYNC = pb.SubscribeResponse(sync_response=True)
+
+
+def test_updates_lookups_and_snapshots():
+    cache = StateCache()
+    cache.apply(
+        _resp(
+            [("state/oper-status", "UP"), ("state/mtu", "1500")],
+            prefix="/interfaces/interface[name=Ethernet1]",
+        ),
+        target="leaf1",
+    )
+    cache.apply(_resp([("/system/state/hostname", "leaf1")], ts=5), target="leaf1")
+    cache.apply(_resp([("/system/state/hostname", "leaf2")]), target="leaf2")
+
+    assert len(cache) == 4
+    assert cache.count("leaf1") == 3
+    assert sorted(cache.targets()) == ["leaf1", "leaf2"]
+
+    entry = cache.get("/system/state/hostname", target="leaf1")
+    assert entry.value.value == "leaf1"
+    assert entry.timestamp == 5
+    assert entry.path.target == "leaf1"
+    assert cache.get("/system/state/hostname", target="leaf3") is None
+    assert cache.get("/system/state", target="leaf1") is None
+
+    intf = cache.snapshot("/interfaces", target="leaf1")
+    assert [str(e.path.elem[-1]) for e in intf] == ["oper-status", "mtu"]
+    assert {e.path.target for e in cache.snapshot("/system")} == {"leaf1", "leaf2"}
+
+    # same leaf again: overwritten, not added
+    cache.apply(_resp([("/system/state/hostname", "leaf1-re")]), target="leaf1")
+    assert cache.count("leaf1") == 3
+    assert cache.get("/system/state/hostname", "leaf1").value.value == "leaf1-re"
+
+
+def test_deletes_are_prefix_scoped_subtrees():
+    cache = StateCache()
+    cache.apply(
+        _resp(
+            [
+                ("/interfaces/interface[name=e1]/state/mtu", "1500"),
+                ("/interfaces/interface[name=e1]/state/name", "e1"),
+                ("/interfaces/interface[name=e2]/state/mtu", "9000"),
+            ]
+        )
+    )
+    cache.apply(_resp(deletes=["interface[name=e1]"], prefix="/interfaces"))
+
+    assert len(cache) == 1
+    assert cache.get("/interfaces/interface[name=e1]/state/mtu") is None
+    assert cache.get("/interfaces/interface[name=e2]/state/mtu") is not None
+
+    # deleting the prefix itself
+    cache.apply(_resp(deletes=["/"], prefix="/interfaces"))
+    assert len(cache) == 0
+    assert cache.snapshot() == []
+
+
+def test_keyless_list_path_covers_every_entry():
+    updates = [
+        ("/interfaces/interface[name=e1]/state/mtu", "1500"),
+        ("/interfaces/interface[name=e2]/state/mtu", "9000"),
+        ("/interfaces/config/enabled", "true"),
+    ]
+    cache = StateCache()
+    cache.apply(_resp(updates))
+    assert len(cache.snapshot("/interfaces/interface")) == 2
+
+    cache.apply(_resp(deletes=["interface"], prefix="/interfaces"))
+    assert [str(e.path) for e in cache.snapshot()] == ["/interfaces/config/enabled"]
+
+    cache.apply(_resp(updates))
+    cache.apply(_resp(deletes=["/interfaces/interface"]))
+    assert len(cache) == 1
+
+
+def test_wildcard_query_across_targets():
+    cache = StateCache()
+    for target in ("leaf1", "leaf2"):
+        cache.apply(
+            _resp(
+                [
+                    ("interface[name=e1]/state/counters/in-octets", "1"),
+                    ("interface[name=e2]/state/counters/in-octets", "2"),
+                    ("interface[name=e2]/state/mtu", "1500"),
+                ],
+                prefix="/interfaces",
+            ),
+            target=target,
+        )
+
+    pattern = "/interfaces/interface[name=*]/state/counters/in-octets"
+    entries = cache.query(pattern)
+    assert len(entries) == 4
+    assert {e.path.target for e in entries} == {"leaf1", "leaf2"}
+    assert [e.value.value for e in cache.query(pattern, target="leaf2")] == ["1", "2"]
+    star = Path.from_str(".../mtu").replace(target="*")
+    assert len(cache.query(star)) == 2
+
+
+def test_leaf_and_container_at_the_same_path():
+    cache = StateCache()
+    cache.apply(_resp([("/a", "leaf"), ("/a/b", "child")]))
+    assert len(cache) == 2
+    assert cache.get("/a").value.value == "leaf"
+    assert [str(e.path) for e in cache.snapshot("/a")] == ["/a", "/a/b"]
+
+    cache.apply(_resp(deletes=["/a/b"]))
+    assert cache.get("/a").value.value == "leaf"
+    assert len(cache) == 1
+
+
+def test_target_from_prefix_and_sync():
+    cache = StateCache()
+    cache.apply(_resp([("x", "1")], prefix="/", target="spine1"))
+    assert cache.get(Path.from_str("/x").replace(target="spine1")) is not None
+    assert not cache.synced("spine1")
+
+    cache.apply(SubscribeResponse.decode(SYNC), target="spine1")
+    assert cache.synced("spine1")
+    assert not cache.synced("spine2")
+
+
+def test_sync_without_target_follows_prefix_target():
+    cache = StateCache()
+    cache.consume([_resp([("/a", "1")], target="spine1"), SYNC])
+    cache.apply(_resp([("/a", "1")], target="spine2"))
+    cache.apply(SubscriptionEvent(EventKind.SYNCED, 1))
+    cache.apply(SYNC)
+
+    assert cache.synced("spine1")
+    assert cache.synced("spine2")
+    assert cache.targets() == ["spine1", "spine2"]
+
+    cache.apply(SubscriptionEvent(EventKind.DISCONNECTED, 1))
+    assert not cache.synced("spine2")
+
+
+def test_resync_purges_leaves_that_were_not_refreshed():
+    cache = StateCache()
+    cache.consume([_resp([("/a", "1"), ("/b", "2")]), SYNC], target="t")
+    assert cache.synced("t")
+
+    cache.apply(SubscriptionEvent(EventKind.DISCONNECTED, 1), target="t")
+    assert not cache.synced("t")
+    # stale data stays readable until the resync completes
+    cache.apply(_resp([("/a", "1")]), target="t")
+    assert cache.get("/b", "t") is not None
+
+    cache.apply(SYNC, target="t")
+    assert cache.synced("t")
+    assert cache.get("/a", "t") is not None
+    assert cache.get("/b", "t") is None
+    assert len(cache) == 1
+
+
+def test_resync_purge_can_be_disabled():
+    cache = StateCache(purge_on_resync=False)
+    cache.consume([_resp([("/a", "1"), ("/b", "2")]), SYNC], target="t")
+    cache.mark_stale("t")
+    cache.consume([_resp([("/a", "1")]), SYNC], target="t")
+    assert len(cache) == 2
+
+
+def test_consume_stream(stub_server):
+    cache = StateCache()
+    with Session(stub_server.target, insecure=True) as sess:
+        cache.consume(sess.subscribe(["/system"], mode="once"), target="stub")
+
+    assert cache.synced("stub")
+    assert len(cache) > 0
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+import io
+
+import pytest
+from click.testing import CliRunner
+
+from gnmi.capture import MAGIC, CaptureReader, CaptureWriter
+from gnmi.cli import cli
+from gnmi.models.path import Path
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+
+
+def _response(i: int) -> pb.SubscribeResponse:
+    return pb.SubscribeResponse(
+        update=pb.Notification(
+            timestamp=i,
+            update=[
+                pb.Update(
+                    path=Path.from_str(f"/counters/c{i}").encode(),
+                    val=pb.TypedValue(uint_val=i),
+                )
+            ],
+        )
+    )
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "gzip"])
+def test_round_trip(tmp_path, compression):
+    path = tmp_path / "stream.cap"
+    with CaptureWriter(path, compression, block_size=100) as cap:
+        for i in range(50):
+            cap.write(_response(i).SerializeToString(), f"leaf{i % 2}", timestamp=i)
+        cap.write(pb.SubscribeResponse(sync_response=True), "leaf0", timestamp=50)
+    assert cap.records == 51
+
+    records = list(CaptureReader(path, decode="proto"))
+    assert len(records) == 51
+    assert [r.timestamp for r in records] == list(range(51))
+    assert records[3].target == "leaf1"
+    assert records[3].response == _response(3)
+    assert records[-1].response.sync_response
+
+    raw = [r.response for r in CaptureReader(path, decode="none")]
+    assert raw[7] == _response(7).SerializeToString()
+
+
+def test_models_and_append(tmp_path):
+    path = tmp_path / "stream.cap"
+    with CaptureWriter(path) as cap:
+        cap.write(SubscribeResponse.decode(_response(1)), "leaf1")
+    # a second writer appends blocks, even with another compression
+    with CaptureWriter(path, "zlib") as cap:
+        cap.write(_response(2), "leaf2")
+    assert path.read_bytes().count(MAGIC) == 1
+
+    with CaptureReader(path) as reader:
+        records = list(reader)
+    assert [r.target for r in records] == ["leaf1", "leaf2"]
+    assert isinstance(records[0].response, SubscribeResponse)
+    assert records[1].response.update.timestamp == 2
+    assert records[0].timestamp > 0
+
+
+def test_buffered_until_flush():
+    buf = io.BytesIO()
+    cap = CaptureWriter(buf, flush_interval=None)
+    cap.write(_response(1))
+    assert buf.getvalue() == MAGIC
+    cap.flush()
+    assert len(list(CaptureReader(io.BytesIO(buf.getvalue())))) == 1
+
+    cap.flush_interval = 0
+    cap.write(_response(2))
+    assert len(list(CaptureReader(io.BytesIO(buf.getvalue())))) == 2
+    cap.close()
+    assert not buf.closed
+
+
+def test_truncated_and_invalid(tmp_path):
+    buf = io.BytesIO()
+    with CaptureWriter(buf, block_size=1) as cap:
+        cap.write(_response(1))
+        cap.write(_response(2))
+        data = buf.getvalue()
+
+    # a writer killed mid-block loses that block only
+    records = list(CaptureReader(io.BytesIO(data[:-3])))
+    assert [r.response.update.timestamp for r in records] == [1]
+
+    with pytest.raises(ValueError, match="capture"):
+        CaptureReader(io.BytesIO(b'{"json": true}'))
+    with pytest.raises(ValueError):
+        CaptureWriter(buf, "lz4")
+
+
+def test_append_checks_the_file(tmp_path):
+    path = tmp_path / "stream.cap"
+    with CaptureWriter(path, block_size=1) as cap:
+        cap.write(_response(1))
+        cap.write(_response(2))
+    # a writer killed mid-block left half of the last one
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with CaptureWriter(path) as cap:
+        cap.write(_response(3))
+    records = list(CaptureReader(path, decode="proto"))
+    assert [r.response.update.timestamp for r in records] == [1, 3]
+
+    other = tmp_path / "other.json"
+    other.write_bytes(b'{"json": true}')
+    with pytest.raises(ValueError, match="not a gNMI capture"):
+        CaptureWriter(other)
+    assert other.read_bytes() == b'{"json": true}'
+
+    with open(path, "ab") as fh, pytest.raises(ValueError, match="readable"):
+        CaptureWriter(fh)
+
+
+def test_cli_subscribe_record(stub_server, tmp_path):
+    path = tmp_path / "out.cap"
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--insecure",
+            "-t",
+            stub_server.target,
+            "subscribe",
+            "--mode",
+            "once",
+            "--record",
+            str(path),
+            "--record-compression",
+            "gzip",
+            "/a",
+            "/b/c",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output == ""
+
+    records = list(CaptureReader(path))
+    assert {r.target for r in records} == {stub_server.target}
+    assert [str(r.response.update.updates[0].path) for r in records[:2]] == [
+        "/a",
+        "/b/c",
+    ]
+    assert records[-1].response.sync_response
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import socket
 import ssl
 from unittest import mock
@@ -111,3 +112,98 @@ def test_get_server_certificate_default_context_when_none_provided():
         tls_mod.get_server_certificate(Target("r1.lab", 6030))
 
     cdc.assert_called_once()
+
+
+def _fake_open_connection(der):
+    sslobj = mock.MagicMock()
+    sslobj.getpeercert.return_value = der
+
+    writer = mock.MagicMock()
+    writer.get_extra_info.return_value = sslobj
+    writer.wait_closed = mock.AsyncMock()
+
+    return mock.AsyncMock(return_value=(mock.MagicMock(), writer)), writer
+
+
+async def test_aget_server_certificate_uses_event_loop_connection():
+    fake_der = b"\x30\x82DERBYTES"
+    opener, writer = _fake_open_connection(fake_der)
+    ctx = mock.MagicMock(spec=ssl.SSLContext)
+
+    with mock.patch.object(asyncio, "open_connection", opener):
+        got = await tls_mod.aget_server_certificate(Target("r1.lab", 6030), context=ctx)
+
+    assert got == fake_der
+    opener.assert_awaited_once_with("r1.lab", 6030, ssl=ctx, server_hostname="r1.lab")
+    writer.get_extra_info.assert_called_once_with("ssl_object")
+    writer.close.assert_called_once()
+
+
+async def test_aget_server_certificate_pem_and_missing_cert():
+    opener, _ = _fake_open_connection(b"\x30\x82DERBYTES")
+    with (
+        mock.patch.object(asyncio, "open_connection", opener),
+        mock.patch.object(ssl, "DER_cert_to_PEM_cert", return_value="PEM\n") as conv,
+    ):
+        got = await tls_mod.aget_server_certificate(
+            Target("r1.lab", 6030), context=mock.sentinel.ctx, pem=True
+        )
+    conv.assert_called_once_with(b"\x30\x82DERBYTES")
+    assert got == b"PEM\n"
+
+    opener, _ = _fake_open_connection(None)
+    with mock.patch.object(asyncio, "open_connection", opener):
+        got = await tls_mod.aget_server_certificate(
+            Target("r1.lab", 6030), context=mock.sentinel.ctx
+        )
+    assert got is None
+
+
+def test_certificate_cache_ttl():
+    cache = tls_mod.CertificateCache(ttl=10)
+    fetch = mock.Mock(return_value=b"PEM")
+
+    with mock.patch.object(tls_mod.time, "monotonic", return_value=100.0):
+        assert cache.fetch("k", fetch) == b"PEM"
+        assert cache.fetch("k", fetch) == b"PEM"
+    assert fetch.call_count == 1
+
+    with mock.patch.object(tls_mod.time, "monotonic", return_value=110.0):
+        assert cache.get("k") is None
+        assert cache.fetch("k", fetch) == b"PEM"
+    assert fetch.call_count == 2
+
+
+def test_certificate_cache_skips_empty_results_and_zero_ttl():
+    cache = tls_mod.CertificateCache(ttl=10)
+    cache.put("k", None)
+    assert len(cache) == 0
+
+    disabled = tls_mod.CertificateCache(ttl=0)
+    fetch = mock.Mock(return_value=b"PEM")
+    disabled.fetch("k", fetch)
+    disabled.fetch("k", fetch)
+    assert fetch.call_count == 2
+
+
+async def test_certificate_cache_shares_inflight_fetch():
+    cache = tls_mod.CertificateCache(ttl=10)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"PEM"
+
+    got = await asyncio.gather(*(cache.afetch("k", fetch) for _ in range(5)))
+    assert got == [b"PEM"] * 5
+    assert calls == 1
+    assert cache.get("k") == b"PEM"
+
+
+def test_server_cert_key_includes_trust_settings():
+    t = Target("r1.lab", 6030)
+    a = tls_mod.TLSConfig(b"ca-a", None, None, get_server_cert=True)
+    b = tls_mod.TLSConfig(b"ca-b", None, None, get_server_cert=True)
+    assert tls_mod.server_cert_key(t, a) != tls_mod.server_cert_key(t, b)
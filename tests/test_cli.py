@@ -430,3 +430,24 @@ def test_cli_flag_overrides_config_file_and_rc(stub_server, tmp_path):
     )
     assert result.exit_code == 0, result.output
     assert "gNMI Version:" in result.output
+
+
+def test_cli_get_reports_failed_targets(stub_server):
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--json",
+            "--insecure",
+            "-t",
+            stub_server.target,
+            "-t",
+            "127.0.0.1:1",
+            "get",
+            "--timeout",
+            "5",
+            "/system/config/hostname",
+        ],
+    )
+    assert result.exit_code == 1
+    assert "127.0.0.1:1: UNAVAILABLE" in result.stderr
+    assert json.loads(result.stdout.splitlines()[0])["updates"]
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+
+import pytest
+
+from gnmi import codec
+from gnmi.models.value import Value, ValueType
+
+DOCS = [
+    {"a": 1, "b": [1, 2.5, "x"], "c": {"d": None, "e": True, "f": False}},
+    {"nested": [[], {}, [{}], {"k": [1, [2, [3]]]}], "s": "a,\n: b"},
+    ["é", "a/b", " ", "\x00", 'q"uote', "back\\slash"],
+    -(2**63),
+    2**64 - 1,
+    0.1,
+    "",
+    [],
+    {},
+]
+
+
+def _available():
+    names = []
+    for name in codec.BACKENDS:
+        try:
+            codec._FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.fixture(params=_available())
+def backend(request):
+    prev = codec.get_backend()
+    codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend(prev)
+
+
+@pytest.mark.parametrize("doc", DOCS)
+def test_codec_round_trips(backend, doc):
+    assert codec.loads(codec.dumpb(doc)) == doc
+    assert codec.loads(codec.dumps(doc)) == doc
+    assert codec.loads(json.dumps(doc)) == doc
+    if backend == "json":
+        assert codec.dumps(doc) == json.dumps(doc)
+    else:
+        assert codec.dumpb(doc) == json.dumps(
+            doc, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+
+FLOATS = [
+    0.1,
+    -0.0,
+    123.456,
+    1e15,
+    1e16,
+    1e20,
+    1e-4,
+    1e-5,
+    1e-7,
+    5e-324,
+    1.7976931348623157e308,
+    12345678901234567.0,
+]
+
+
+@pytest.mark.parametrize("f", FLOATS)
+def test_codec_floats_round_trip(backend, f):
+    for doc in ([f], {"v": f}):
+        assert codec.loads(codec.dumps(doc)) == doc
+    if backend == "json":
+        assert codec.dumps(f) == json.dumps(f)
+
+
+def test_codec_non_finite_floats(backend):
+    got = codec.loads(codec.dumps([math.inf, -math.inf, math.nan]))
+    if backend == "orjson":
+        # documented: orjson writes them as null
+        assert got == [None, None, None]
+    else:
+        assert got[:2] == [math.inf, -math.inf]
+        assert math.isnan(got[2])
+
+
+def test_codec_falls_back_to_stdlib(backend):
+    # wider than 64 bits and non-string keys are rejected by orjson
+    assert codec.dumps([2**70]) == "[1180591620717411303424]"
+    assert codec.loads(codec.dumps({1: "a"})) == {"1": "a"}
+    assert codec.loads(b"[1180591620717411303424]") == [2**70]
+    assert codec.loads("NaN") != codec.loads("NaN")
+
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+    with pytest.raises(TypeError):
+        codec.dumps(object())
+
+
+def test_codec_fast_backends_are_compact(backend):
+    if backend == "json":
+        assert codec.dumps({"a": [1, "é"]}) == '{"a": [1, "\\u00e9"]}'
+    else:
+        assert codec.dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'
+
+
+def test_codec_default_hook(backend):
+    v = Value({"x": Value(1, ValueType.INT_VAL)}, ValueType.JSON_VAL)
+    assert json.loads(v.encode().json_val) == {"x": 1}
+
+
+def test_codec_set_backend():
+    prev = codec.get_backend()
+    try:
+        assert codec.set_backend("json") == "json"
+        assert codec.get_backend() == "json"
+        assert codec.set_backend("auto") == _available()[0]
+        with pytest.raises(ValueError):
+            codec.set_backend("simplejson")
+    finally:
+        codec.set_backend(prev)
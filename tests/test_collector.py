@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import io
+import json
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from gnmi.cache import StateCache
+from gnmi.cli import cli
+from gnmi.collector import (
+    CacheSink,
+    CallbackSink,
+    Collector,
+    JsonLinesSink,
+    NullSink,
+    configured_targets,
+    load_configuration,
+    parse_configuration,
+    sink_factory,
+)
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.resilient import EventKind, ReconnectPolicy
+
+
+def _config(target: str, mode: str = "ONCE", **target_extra) -> dict:
+    return {
+        "request": {
+            "system": {
+                "subscribe": {
+                    "prefix": "/system",
+                    "mode": mode,
+                    "subscription": [
+                        {"path": "state/hostname"},
+                        {"path": "state/domain-name", "sampleInterval": "10s"},
+                    ],
+                }
+            }
+        },
+        "target": {"leaf1": {"addresses": [target], **target_extra}},
+    }
+
+
+def test_parse_configuration():
+    config = parse_configuration(
+        _config("h:6030", credentials={"username": "admin", "password": "pw"})
+    )
+    (target,) = configured_targets(config)
+    assert target.name == "leaf1"
+    assert target.address == "h:6030"
+    assert target.metadata == {"username": "admin", "password": "pw"}
+
+    sl = target.request.subscribe
+    assert [e.name for e in sl.prefix.elem] == ["system"]
+    assert sl.subscription[1].sample_interval == 10_000_000_000
+
+
+def test_configured_targets_errors():
+    data = _config("h:6030")
+    data["request"]["other"] = data["request"]["system"]
+    with pytest.raises(ValueError, match="must name"):
+        configured_targets(parse_configuration(data))
+
+    data["target"]["leaf1"]["request"] = "nope"
+    with pytest.raises(ValueError, match="unknown request"):
+        configured_targets(parse_configuration(data))
+
+    data["target"]["leaf1"] = {"request": "system"}
+    with pytest.raises(ValueError, match="no address"):
+        configured_targets(parse_configuration(data))
+
+    data["target"]["leaf1"]["addresses"] = ["h:6030", "h2:6030"]
+    with pytest.raises(ValueError, match="more than one address"):
+        configured_targets(parse_configuration(data))
+
+
+def test_configured_targets_rejects_unsupported_fields():
+    data = _config("h:6030")
+    data["request"]["system"]["subscribe"]["updatesOnly"] = True
+    data["request"]["system"]["subscribe"]["useModels"] = [{"name": "m"}]
+    with pytest.raises(ValueError, match="unsupported updates_only, use_models"):
+        configured_targets(parse_configuration(data))
+
+
+@pytest.mark.parametrize("suffix", [".json", ".yaml", ".toml"])
+def test_load_configuration(tmp_path, suffix):
+    data = _config("h:6030")
+    path = tmp_path / f"collector{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps(data))
+    elif suffix == ".yaml":
+        yaml = pytest.importorskip("yaml")
+        path.write_text(yaml.safe_dump(data))
+    else:
+        toml = pytest.importorskip("toml")
+        path.write_text(toml.dumps(data))
+
+    (target,) = configured_targets(load_configuration(str(path)))
+    assert len(target.request.subscribe.subscription) == 2
+
+
+async def test_sink_factory(tmp_path):
+    assert isinstance(sink_factory("jsonl"), JsonLinesSink)
+    assert isinstance(sink_factory("null"), NullSink)
+    assert isinstance(sink_factory("gnmi.collector:NullSink"), NullSink)
+    sink = sink_factory(f"jsonl:{tmp_path / 'out.jsonl'}")
+    assert sink.stream.name.endswith("out.jsonl")
+    # the sink closes the file it opened, not a stream it was given
+    await sink.close()
+    assert sink.stream.closed
+    stream = io.StringIO()
+    await JsonLinesSink(stream).close()
+    assert not stream.closed
+    with pytest.raises(ValueError):
+        sink_factory("kafka")
+
+
+async def test_collect_once(stub_server):
+    stream = io.StringIO()
+    cache = StateCache()
+    config = parse_configuration(_config(stub_server.target))
+    collector = Collector(
+        config, [JsonLinesSink(stream), CacheSink(cache)], insecure=True
+    )
+    await collector.run()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["updates"][0]["path"] for line in lines] == [
+        "/state/hostname",
+        "/state/domain-name",
+    ]
+    assert {line["target"] for line in lines} == {"leaf1"}
+    assert cache.count("leaf1") == 2
+
+    stats = collector.snapshot()
+    assert stats.responses == 3
+    assert stats.updates == 2
+    assert stats.bytes > 0
+    assert stats.targets["leaf1"].lag is not None
+
+
+async def test_stop_and_stats(stub_server):
+    default = stub_server.servicer.subscribe_handler
+
+    def keep_open(request_iterator, context):
+        yield from default(iter([next(request_iterator)]), context)
+        while context.is_active():
+            time.sleep(0.01)
+
+    stub_server.servicer.subscribe_handler = keep_open
+    items: list = []
+    reports: list = []
+
+    def on_stats(stats):
+        reports.append(stats)
+        collector.stop()
+
+    config = parse_configuration(_config(stub_server.target, mode="STREAM"))
+    collector = Collector(
+        config,
+        [CallbackSink(lambda target, item: items.append(item))],
+        stats_interval=0.05,
+        on_stats=on_stats,
+        insecure=True,
+    )
+    await asyncio.wait_for(collector.run(), 5)
+
+    assert isinstance(items[0], SubscribeResponse)
+    assert items[-1].kind is EventKind.SYNCED
+    (stats,) = reports
+    assert stats.updates == 2
+    assert stats.updates_per_sec > 0
+    assert stats.bytes_per_sec > 0
+    assert stats.targets["leaf1"].synced
+    assert "1/1 targets" in stats.format()
+
+
+async def test_unreachable_target_reports_error(stub_server):
+    errors: list = []
+    data = _config(stub_server.target)
+    data["target"]["down"] = {"addresses": ["127.0.0.1:1"]}
+    collector = Collector(
+        parse_configuration(data),
+        [NullSink()],
+        concurrency=1,
+        policy=ReconnectPolicy(backoff=0.01, max_retries=0),
+        on_error=lambda target, exc: errors.append(target),
+        insecure=True,
+    )
+    await asyncio.wait_for(collector.run(), 10)
+
+    assert errors == ["down"]
+    assert collector.stats["leaf1"].updates == 2
+
+
+async def test_sink_error_stops_the_collector(stub_server):
+    def boom(target, item):
+        raise RuntimeError("sink down")
+
+    config = parse_configuration(_config(stub_server.target, mode="STREAM"))
+    collector = Collector(config, [CallbackSink(boom)], insecure=True)
+    with pytest.raises(RuntimeError, match="sink down"):
+        await asyncio.wait_for(collector.run(), 5)
+
+
+def test_cli_collector(stub_server, tmp_path):
+    config = tmp_path / "collector.json"
+    config.write_text(
+        json.dumps(_config(stub_server.target, credentials={"username": "collector"}))
+    )
+    result = CliRunner().invoke(
+        cli,
+        ["--insecure", "collector", "--stats-interval", "0", str(config)],
+    )
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["target"] == "leaf1"
+
+    # credentials of the configuration win over --username
+    assert dict(stub_server.servicer.last_metadata)["username"] == "collector"
+
+    # targets with other metadata but no credentials still get --username
+    config.write_text(json.dumps(_config(stub_server.target, meta={"x-site": "lab"})))
+    result = CliRunner().invoke(
+        cli,
+        ["--insecure", "-u", "cli", "collector", "--stats-interval", "0", str(config)],
+    )
+    assert result.exit_code == 0, result.output
+    metadata = dict(stub_server.servicer.last_metadata)
+    assert (metadata["username"], metadata["x-site"]) == ("cli", "lab")
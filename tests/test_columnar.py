@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from gnmi.models.path import Path, PathTable
+from gnmi.models.value import Value, ValueType
+from gnmi.proto import gnmi_pb2 as pb
+
+np = pytest.importorskip("numpy")
+columnar = pytest.importorskip("gnmi.columnar")
+ColumnarDecoder = columnar.ColumnarDecoder
+decode_columnar = columnar.decode_columnar
+
+
+def _resp(ts, updates, target="dut"):
+    return pb.SubscribeResponse(
+        update=pb.Notification(
+            timestamp=ts,
+            prefix=Path.from_str("/interfaces").replace(target=target).encode(),
+            update=[
+                pb.Update(path=Path.from_str(p).encode(), val=val) for p, val in updates
+            ],
+        )
+    )
+
+
+def test_decode_columnar_rows():
+    responses = [
+        _resp(
+            1,
+            [
+                ("a/in", pb.TypedValue(uint_val=10)),
+                ("a/name", pb.TypedValue(string_val="eth1")),
+            ],
+        ),
+        pb.SubscribeResponse(sync_response=True),
+        _resp(2, [("a/in", pb.TypedValue(uint_val=15))]).SerializeToString(),
+    ]
+    batch = decode_columnar(responses)
+
+    assert len(batch) == 3
+    assert batch.timestamp.dtype == np.int64
+    assert batch.timestamp.tolist() == [1, 1, 2]
+    assert batch.path_id.tolist() == [0, 1, 0]
+    assert batch.path(0) == Path.from_str("/interfaces/a/in").replace(target="dut")
+    assert batch.value.dtype == np.uint64
+    assert batch.value.tolist() == [10, 0, 15]
+    assert batch.numeric.tolist() == [True, False, True]
+    assert batch.objects.tolist() == [
+        None,
+        Value("eth1", ValueType.STRING_VAL),
+        None,
+    ]
+
+    counters = batch.value[batch.numeric]
+    assert np.diff(counters).tolist() == [5]
+
+
+@pytest.mark.parametrize(
+    "vals,dtype,want",
+    [
+        ([pb.TypedValue(int_val=-1)], np.int64, [-1]),
+        ([pb.TypedValue(int_val=-1), pb.TypedValue(uint_val=2)], np.int64, [-1, 2]),
+        (
+            [pb.TypedValue(int_val=-1), pb.TypedValue(uint_val=2**64 - 1)],
+            np.float64,
+            [-1.0, float(2**64 - 1)],
+        ),
+        (
+            [pb.TypedValue(uint_val=2**64 - 1)],
+            np.uint64,
+            [2**64 - 1],
+        ),
+        (
+            [pb.TypedValue(int_val=3), pb.TypedValue(double_val=0.5)],
+            np.float64,
+            [3.0, 0.5],
+        ),
+    ],
+)
+def test_decode_columnar_value_dtype(vals, dtype, want):
+    batch = decode_columnar([_resp(1, [(f"x{i}", v) for i, v in enumerate(vals)])])
+    assert batch.value.dtype == dtype
+    assert batch.value.tolist() == want
+
+
+def test_decode_columnar_float_fills_nan():
+    batch = decode_columnar(
+        [
+            _resp(
+                1,
+                [
+                    ("a", pb.TypedValue(float_val=1.5)),
+                    ("b", pb.TypedValue(bool_val=True)),
+                ],
+            )
+        ]
+    )
+    assert batch.value[0] == 1.5
+    assert np.isnan(batch.value[1])
+    assert batch.objects[1] == Value(True, ValueType.BOOL_VAL)
+
+
+def test_columnar_ids_stable_across_batches():
+    table = PathTable()
+    dec = ColumnarDecoder(table)
+    first = dec.decode([_resp(1, [("a", pb.TypedValue(int_val=1))], target="r1")])
+    second = dec.decode(
+        [
+            _resp(2, [("a", pb.TypedValue(int_val=2))], target="r2"),
+            _resp(3, [("a", pb.TypedValue(int_val=3))], target="r1"),
+        ]
+    )
+    assert first.path_id.tolist() == [0]
+    assert second.path_id.tolist() == [1, 0]
+    assert len(table) == 2
+
+    # a second decoder sharing the table agrees on the IDs
+    other = ColumnarDecoder(table).decode(
+        [_resp(4, [("a", pb.TypedValue(int_val=4))], target="r2")]
+    )
+    assert other.path_id.tolist() == [1]
+
+
+def test_decode_columnar_empty():
+    batch = decode_columnar([])
+    assert len(batch) == 0
+    assert batch.value.dtype == np.int64
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import pickle
+
+import pytest
+from google.protobuf.message import DecodeError
+
+from gnmi.async_session import AsyncSession
+from gnmi.decode_pool import DecodedResponse, DecodePool, decode_response
+from gnmi.proto import gnmi_pb2 as pb
+from tests.conftest import STUB_HOSTNAME
+
+
+def _raw(ts: int, name: str = "counter") -> bytes:
+    return pb.SubscribeResponse(
+        update=pb.Notification(
+            timestamp=ts,
+            prefix=pb.Path(target="r1", elem=[pb.PathElem(name="system")]),
+            update=[
+                pb.Update(
+                    path=pb.Path(elem=[pb.PathElem(name=name)]),
+                    val=pb.TypedValue(uint_val=ts),
+                )
+            ],
+            delete=[pb.Path(elem=[pb.PathElem(name="gone")])],
+        )
+    ).SerializeToString()
+
+
+async def _stream(raws, pause_after=None):
+    for i, raw in enumerate(raws):
+        if i == pause_after:
+            await asyncio.sleep(0.05)
+        yield raw
+
+
+def test_decode_response_is_compact_and_picklable():
+    resp = decode_response(_raw(7))
+    assert resp == DecodedResponse(
+        timestamp=7,
+        target="r1",
+        prefix="/system",
+        updates=[("/counter", 7)],
+        deletes=["/gone"],
+        sync_response=False,
+    )
+    assert pickle.loads(pickle.dumps(resp)) == resp
+
+    sync = decode_response(pb.SubscribeResponse(sync_response=True).SerializeToString())
+    assert sync.sync_response is True
+    assert sync.updates == []
+
+
+@pytest.fixture(scope="module")
+def decode_pool():
+    with DecodePool(processes=2, batch_size=8, max_delay=0.01) as pool:
+        yield pool
+
+
+async def test_decode_pool_preserves_stream_order(decode_pool):
+    raws = [_raw(i) for i in range(100)]
+    got = [r.timestamp async for r in decode_pool.decode(_stream(raws, pause_after=3))]
+    assert got == list(range(100))
+
+
+async def test_decode_pool_streams_interleave(decode_pool):
+    async def collect(offset):
+        raws = [_raw(offset + i) for i in range(40)]
+        return [r.timestamp async for r in decode_pool.decode(_stream(raws))]
+
+    a, b = await asyncio.gather(collect(0), collect(1000))
+    assert a == list(range(40))
+    assert b == list(range(1000, 1040))
+
+
+async def test_decode_pool_raises_decode_errors(decode_pool):
+    with pytest.raises(DecodeError):
+        async for _ in decode_pool.decode(_stream([_raw(1), b"\xff\xff\xff"])):
+            pass
+
+
+async def test_decode_pool_delivers_batch_before_source_error(decode_pool):
+    async def broken():
+        for i in range(3):
+            yield _raw(i)
+        raise ConnectionError("stream broke")
+
+    got = []
+    with pytest.raises(ConnectionError):
+        async for r in decode_pool.decode(broken()):
+            got.append(r.timestamp)
+    assert got == [0, 1, 2]
+
+
+async def test_decode_pool_with_raw_subscribe(decode_pool, stub_server):
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        raw = sess.subscribe(["/system/config/hostname"], mode="once", decode="none")
+        got = [r async for r in decode_pool.decode(raw)]
+
+    assert got[0].updates == [("/system/config/hostname", STUB_HOSTNAME)]
+    assert got[-1].sync_response is True
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+
+import grpc
+import pytest
+
+from gnmi.fleet import Fleet, FleetResult
+
+from tests.conftest import STUB_GNMI_VERSION
+
+UNREACHABLE = "127.0.0.1:1"
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+class FakeSession:
+    def __init__(self, target):
+        self.target = target
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+async def test_fleet_get_isolates_failures(stub_target):
+    fleet = Fleet([stub_target, UNREACHABLE, stub_target], timeout=5, insecure=True)
+    results = [r async for r in fleet.get(["/system/config/hostname"])]
+
+    assert len(results) == 3
+    ok = [r for r in results if r.ok]
+    bad = [r for r in results if not r.ok]
+    assert len(ok) == 2
+    assert all(r.value.notifications for r in ok)
+    assert [r.target for r in bad] == [UNREACHABLE]
+    assert bad[0].attempts == 1
+
+
+async def test_fleet_capabilities(stub_target):
+    results = [r async for r in Fleet([stub_target], insecure=True).capabilities()]
+    assert results[0].value.gnmi_version == STUB_GNMI_VERSION
+
+
+async def test_fleet_bounded_concurrency():
+    running = peak = 0
+
+    async def op(sess):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return sess.target
+
+    fleet = Fleet(range(20), concurrency=4, session_factory=FakeSession)
+    results = [r async for r in fleet.run(op)]
+
+    assert sorted(r.value for r in results) == list(range(20))
+    assert peak == 4
+
+
+async def test_fleet_streams_results_as_completed():
+    async def op(sess):
+        await asyncio.sleep(0.05 if sess.target == "slow" else 0)
+        return sess.target
+
+    fleet = Fleet(["slow", "fast"], session_factory=FakeSession)
+    assert [r.value async for r in fleet.run(op)] == ["fast", "slow"]
+
+
+async def test_fleet_retries_retryable_errors():
+    calls: dict = {}
+
+    async def op(sess):
+        calls[sess.target] = calls.get(sess.target, 0) + 1
+        if sess.target == "flaky" and calls["flaky"] < 3:
+            raise FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+        if sess.target == "denied":
+            raise FakeRpcError(grpc.StatusCode.PERMISSION_DENIED)
+        return "ok"
+
+    fleet = Fleet(
+        ["flaky", "denied"], retries=3, backoff=0.001, session_factory=FakeSession
+    )
+    results = {r.target: r async for r in fleet.run(op)}
+
+    assert results["flaky"].ok
+    assert results["flaky"].attempts == 3
+    assert not results["denied"].ok
+    assert results["denied"].attempts == 1
+
+
+async def test_fleet_timeout():
+    async def op(sess):
+        await asyncio.sleep(10)
+
+    fleet = Fleet(
+        ["t"], timeout=0.01, retries=1, backoff=0.001, session_factory=FakeSession
+    )
+    (res,) = [r async for r in fleet.run(op)]
+    assert isinstance(res.error, asyncio.TimeoutError)
+    assert res.attempts == 2
+
+
+async def test_fleet_early_close_cancels_work():
+    cancelled = 0
+
+    async def op(sess):
+        nonlocal cancelled
+        if sess.target == 0:
+            return 0
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+
+    gen = Fleet(range(5), concurrency=5, session_factory=FakeSession).run(op)
+    assert (await gen.__anext__()).value == 0
+    await gen.aclose()
+    assert cancelled == 4
+
+
+def test_fleet_run_sync(stub_target):
+    fleet = Fleet([stub_target, UNREACHABLE], timeout=5, insecure=True)
+    results = list(fleet.run_sync(lambda sess: sess.capabilities()))
+    assert {r.target: r.ok for r in results} == {
+        stub_target: True,
+        UNREACHABLE: False,
+    }
+    assert all(isinstance(r, FleetResult) for r in results)
+
+
+def test_fleet_run_sync_bounds_buffering():
+    started = 0
+
+    async def op(sess):
+        nonlocal started
+        started += 1
+        return sess.target
+
+    gen = Fleet(range(100), concurrency=2, session_factory=FakeSession).run_sync(op)
+    assert next(gen).value == 0
+    time.sleep(0.2)
+    # a slow consumer holds back the fleet instead of piling up results
+    assert started <= 8
+    assert len(list(gen)) == 99
+
+
+def test_fleet_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        Fleet([], concurrency=0)
@@ -131,3 +131,28 @@ def test_json_lines_notification_send(capsys):
     assert len(lines) == 2
     parsed = json.loads(lines[0])
     assert parsed["path"] == "/a"
+
+
+def test_json_formatters_splice_raw_json_without_parsing(capsys):
+    from gnmi.proto import gnmi_pb2 as pb
+
+    upd = Update.decode(
+        pb.Update(
+            path=pb.Path(elem=[pb.PathElem(name="a")]),
+            val=pb.TypedValue(
+                json_ietf_val=b'{\n  "x": [1, "\\u0000"],\n  "y": null\n}'
+            ),
+        )
+    )
+    n = _notif(updates=[upd, Update(path="/b", value=("v", ValueType.STRING_VAL))])
+
+    JsonNotification().send(n)
+    JsonLinesNotification().send(n)
+    assert not upd.value.parsed
+
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 3
+    doc = json.loads(lines[0])
+    assert doc["updates"][0]["val"] == {"x": [1, "\u0000"], "y": None}
+    assert doc["updates"][1]["val"] == "v"
+    assert json.loads(lines[1])["val"] == {"x": [1, "\u0000"], "y": None}
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import grpc
+import pytest
+
+from gnmi.async_session import AsyncSession
+from gnmi.get_planner import GetPlanner, planner_factory
+from gnmi.models.get import GetResponse
+from gnmi.session import Session
+
+
+def _names(resp: GetResponse) -> list[str]:
+    return [str(u.path) for n in resp.notifications for u in n.updates]
+
+
+def test_plan_chunks_by_subtree():
+    planner = GetPlanner(max_paths=2)
+    paths = ["/b/y", "/a/x", "/b/x", "/a/y", "/c"]
+
+    assert planner.plan(paths) == [["/a/x", "/a/y"], ["/b/x", "/b/y"], ["/c"]]
+    assert GetPlanner(max_paths=2, by_subtree=False).plan(paths) == [
+        ["/b/y", "/a/x"],
+        ["/b/x", "/a/y"],
+        ["/c"],
+    ]
+
+
+def test_plan_chunks_by_size():
+    paths = ["/a/x", "/a/yyyyyyyyyyyyyyyyyyyy", "/b", "/c"]
+    # /a/x counts 14 bytes, the long path 33 and /b or /c 9 each
+    assert GetPlanner(max_bytes=40).plan(paths) == [
+        ["/a/x"],
+        ["/a/yyyyyyyyyyyyyyyyyyyy"],
+        ["/b", "/c"],
+    ]
+    assert GetPlanner(max_paths=1, max_bytes=1000).plan(paths[2:]) == [["/b"], ["/c"]]
+
+
+def test_planner_factory():
+    planner = GetPlanner()
+    assert planner_factory(planner) is planner
+    assert isinstance(planner_factory(True), GetPlanner)
+    assert planner_factory(None) is None
+    assert planner_factory(False) is None
+
+    with pytest.raises(ValueError):
+        GetPlanner(max_paths=0)
+
+
+def test_session_get_with_planner_merges_chunks(stub_server):
+    seen = []
+    default = stub_server.servicer.get_handler
+
+    def handler(request, context):
+        seen.append(len(request.path))
+        return default(request, context)
+
+    stub_server.servicer.get_handler = handler
+    paths = [f"/interfaces/interface[name=Ethernet{i:02}]/state" for i in range(10)]
+
+    with Session(stub_server.target, insecure=True) as sess:
+        resp = sess.get(paths, planner=GetPlanner(max_paths=3, concurrency=4))
+
+    assert sorted(seen) == [1, 3, 3, 3]
+    assert _names(resp) == paths
+
+
+def _exhausted_over(limit: int, default):
+    def handler(request, context):
+        if len(request.path) > limit:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "too big")
+        return default(request, context)
+
+    return handler
+
+
+def test_session_get_planner_splits_exhausted_chunks(stub_server):
+    servicer = stub_server.servicer
+    servicer.get_handler = _exhausted_over(1, servicer.get_handler)
+    paths = [f"/system/p{i}" for i in range(4)]
+
+    with Session(stub_server.target, insecure=True) as sess:
+        assert _names(sess.get(paths, planner=GetPlanner(max_paths=4))) == paths
+
+        no_split = GetPlanner(max_paths=4, split_on_exhausted=False)
+        with pytest.raises(grpc.RpcError) as exc:
+            sess.get(paths, planner=no_split)
+    assert exc.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+
+async def test_async_session_get_with_planner(stub_server):
+    servicer = stub_server.servicer
+    servicer.get_handler = _exhausted_over(2, servicer.get_handler)
+    paths = [f"/system/p{i}" for i in range(7)]
+
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        resp = await sess.get(paths, planner=GetPlanner(max_paths=4, concurrency=2))
+
+    assert _names(resp) == paths
+
+
+async def test_async_planner_cancels_pending_chunks_on_error():
+    cancelled = []
+
+    async def get(chunk):
+        if chunk == ["/a"]:
+            raise RuntimeError("chunk failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(chunk)
+            raise
+
+    with pytest.raises(RuntimeError):
+        await GetPlanner(max_paths=1).aexecute(get, ["/a", "/b", "/c"])
+    assert cancelled == [["/b"], ["/c"]]
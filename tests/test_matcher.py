@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from gnmi.async_session import AsyncSession
+from gnmi.cli import cli
+from gnmi.matcher import PathMatcher, matcher_factory
+from gnmi.models.path import Path
+from gnmi.models.subscribe import SubscribeResponse
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.session import Session
+
+PATTERNS = [
+    "/interfaces/interface[name=Ethernet*]/state/counters",
+    "/interfaces/interface[name=Management1]",
+    "/*/state/hostname",
+    ".../mtu",
+    "/lldp/interfaces/interface[name=*]",
+]
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/interfaces/interface[name=Ethernet1]/state/counters/in-octets", [0]),
+        ("/interfaces/interface[name=Ethernet1]/state/counters", [0]),
+        ("/interfaces/interface[name=Ethernet1]/state", []),
+        ("/interfaces/interface[name=Management1]/state/counters/in-octets", [1]),
+        ("/interfaces/interface[name=Management1]/config/mtu", [1, 3]),
+        ("/system/state/hostname", [2]),
+        ("/system/config/hostname", []),
+        ("/mtu", [3]),
+        ("/lldp/interfaces/interface[name=Ethernet1]/state", [4]),
+        # the key must be present for ``[name=*]``
+        ("/lldp/interfaces/interface/state", []),
+        # keys the pattern doesn't name may take any value
+        ("/interfaces/interface[name=Management1][unit=0]/state", [1]),
+    ],
+)
+def test_match(path, expected):
+    matcher = PathMatcher(PATTERNS)
+    p = Path.from_str(path)
+    assert matcher.match(p) == expected
+    assert matcher.match(p.encode()) == expected
+    assert matcher.matches(p) is bool(expected)
+    assert matcher.matches(p.encode()) is bool(expected)
+
+
+def test_match_relative_to_a_prefix():
+    matcher = PathMatcher(PATTERNS)
+    prefix = Path.from_str("/interfaces/interface[name=Ethernet7]")
+    assert matcher.match(Path.from_str("state/counters/x"), prefix) == [0]
+    assert not matcher.matches(
+        Path.from_str("state/oper-status").encode(), prefix.encode()
+    )
+    # a pattern ending at the prefix matches everything below it
+    prefix = Path.from_str("/interfaces/interface[name=Management1]")
+    assert matcher.matches(Path.from_str("state/oper-status"), prefix)
+
+
+def test_many_exact_patterns():
+    names = [f"Ethernet{i}" for i in range(5000)]
+    matcher = PathMatcher(f"/interfaces/interface[name={n}]/state" for n in names)
+    assert matcher.match(
+        Path.from_str("/interfaces/interface[name=Ethernet4321]/state/mtu")
+    ) == [4321]
+    assert not matcher.matches(
+        Path.from_str("/interfaces/interface[name=Ethernet5000]/state")
+    )
+
+
+def test_filter_notification_in_place():
+    matcher = PathMatcher(PATTERNS)
+    notif = pb.Notification(
+        prefix=Path.from_str("/interfaces/interface[name=Ethernet1]").encode(),
+        update=[
+            pb.Update(path=Path.from_str("state/counters/in-octets").encode()),
+            pb.Update(path=Path.from_str("state/oper-status").encode()),
+        ],
+        delete=[
+            Path.from_str("state/counters").encode(),
+            Path.from_str("config").encode(),
+        ],
+    )
+    assert matcher.filter_notification(notif)
+    assert len(notif.update) == 1
+    # deleting config also deletes config/mtu, which ``.../mtu`` matches
+    assert len(notif.delete) == 2
+
+    resp = pb.SubscribeResponse(update=pb.Notification(update=[notif.update[0]]))
+    assert not matcher.filter_response(resp)
+    assert matcher.filter_response(pb.SubscribeResponse(sync_response=True))
+
+    raw = pb.SubscribeResponse(
+        update=pb.Notification(update=[pb.Update(path=Path.from_str("/mtu").encode())])
+    ).SerializeToString()
+    assert matcher.filter_bytes(raw) is raw
+
+
+def test_filter_notification_keeps_subtrees_above_a_pattern():
+    matcher = PathMatcher(["/interfaces/interface[name=Ethernet1]/state/counters"])
+    subtree = pb.TypedValue(json_ietf_val=b'{"counters": {"in-octets": 1}}')
+    notif = pb.Notification(
+        prefix=Path.from_str("/interfaces").encode(),
+        update=[
+            pb.Update(
+                path=Path.from_str("interface[name=Ethernet1]").encode(), val=subtree
+            ),
+            pb.Update(
+                path=Path.from_str("interface[name=Ethernet2]").encode(), val=subtree
+            ),
+            pb.Update(
+                path=Path.from_str("interface[name=Ethernet1]/state/name").encode(),
+                val=pb.TypedValue(string_val="Ethernet1"),
+            ),
+            # a scalar can't hold the pattern's leaves
+            pb.Update(
+                path=Path.from_str("interface[name=Ethernet1]/state").encode(),
+                val=pb.TypedValue(string_val="x"),
+            ),
+        ],
+        delete=[
+            Path.from_str("interface[name=Ethernet1]/state").encode(),
+            Path.from_str("interface[name=Ethernet1]/config").encode(),
+        ],
+    )
+    assert matcher.filter_notification(notif)
+    assert [str(Path.decode(u.path)) for u in notif.update] == [
+        "/interface[name=Ethernet1]"
+    ]
+    assert notif.update[0].val == subtree
+    assert [str(Path.decode(d)) for d in notif.delete] == [
+        "/interface[name=Ethernet1]/state"
+    ]
+    # match() looks at the path alone
+    assert not matcher.matches(Path.from_str("/interfaces/interface[name=Ethernet1]"))
+
+
+def test_matcher_factory():
+    assert matcher_factory(None) is None
+    assert matcher_factory([]) is None
+    m = PathMatcher(["/a"])
+    assert matcher_factory(m) is m
+    assert len(matcher_factory("/a")) == 1
+
+
+def test_session_subscribe_filter(stub_server):
+    with Session(stub_server.target, insecure=True) as sess:
+        resps = list(sess.subscribe(["/a", "/b/c"], mode="once", filter=["/b"]))
+        raws = list(
+            sess.subscribe(["/a", "/b/c"], mode="once", decode="none", filter=["/b"])
+        )
+
+    updates = [r for r in resps if not r.sync_response]
+    assert [str(u.path) for r in updates for u in r.update.updates] == ["/b/c"]
+    assert resps[-1].sync_response
+    assert len(raws) == 2
+
+
+async def test_async_session_subscribe_filter(stub_server):
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        resps = [
+            r
+            async for r in sess.subscribe(
+                ["/a", "/b/c"], mode="once", filter=["/a"], buffer=8
+            )
+        ]
+
+    assert len(resps) == 2
+    assert isinstance(resps[0], SubscribeResponse)
+    assert str(resps[0].update.updates[0].path) == "/a"
+
+
+def test_cli_subscribe_filter(stub_server):
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--json",
+            "--insecure",
+            "-t",
+            stub_server.target,
+            "subscribe",
+            "--mode",
+            "once",
+            "--filter",
+            "/b/*",
+            "/a",
+            "/b/c",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    lines = result.output.strip().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["updates"][0]["path"] == "/b/c"
@@ -2,6 +2,8 @@
 
 import time
 
+import pytest
+
 from gnmi.proto import gnmi_pb2 as pb
 
 from gnmi.models.get import GetRequest, GetResponse, DataType
@@ -52,6 +54,7 @@ def test_get_request():
         assert GetRequest.decode(have) == want
 
 
+@pytest.mark.usefixtures("stdlib_json")
 def test_get_response():
     now = time.time_ns()
     tests = [
@@ -2,10 +2,14 @@
 
 
 import time
-from gnmi.models import Notification
+
+import pytest
+
+from gnmi.models import LazyNotification, Notification
 from gnmi.proto import gnmi_pb2 as pb
 
 
+@pytest.mark.usefixtures("stdlib_json")
 def test_notification():
     now = time.time_ns()
     tests = [
@@ -121,3 +125,71 @@ def test_notification():
         assert Notification.decode(want) == notif
         assert notif.encode() == want
         # assert Notification.decode(want) == notif
+
+
+def _pb_notification() -> pb.Notification:
+    return pb.Notification(
+        timestamp=42,
+        prefix=pb.Path(elem=[pb.PathElem(name="system")], target="r1"),
+        update=[
+            pb.Update(
+                path=pb.Path(elem=[pb.PathElem(name="a")]),
+                val=pb.TypedValue(uint_val=7),
+            ),
+            pb.Update(
+                path=pb.Path(elem=[pb.PathElem(name="b")]),
+                val=pb.TypedValue(string_val="x"),
+            ),
+        ],
+        delete=[pb.Path(elem=[pb.PathElem(name="c")])],
+    )
+
+
+def test_lazy_notification_matches_eager_decode():
+    want = Notification.decode(_pb_notification())
+    lazy = LazyNotification(_pb_notification())
+
+    assert lazy.timestamp == want.timestamp
+    assert lazy.prefix == want.prefix
+    assert lazy.deletes == want.deletes
+    assert lazy.updates == want.updates
+    assert lazy.to_notification() == want
+
+
+def test_lazy_notification_decodes_on_access():
+    lazy = LazyNotification(_pb_notification())
+    assert lazy._prefix is None
+    assert lazy._updates is None
+
+    first = lazy.updates[0]
+    assert first._path is None and first._value is None
+    assert first.value.value == 7
+    assert first._path is None
+    # cached on subsequent access
+    assert lazy.updates[0] is first
+    assert first.value is first.value
+
+
+def test_lazy_notification_encode_is_passthrough():
+    msg = _pb_notification()
+    assert LazyNotification.decode(msg).encode() is msg
+
+
+def test_lazy_notification_without_prefix():
+    assert LazyNotification(pb.Notification(timestamp=1)).prefix is None
+
+
+def test_notification_decode_matches_constructed_state():
+    want = Notification(
+        timestamp=7,
+        prefix="/a[k=v]",
+        updates=[("b", 1), ("c", "x")],
+        deletes=["d"],
+        atomic=True,
+    )
+    have = Notification.decode(want.encode())
+
+    assert have == want
+    assert vars(have) == vars(want)
+    assert have.atomic is True
+    assert Notification.decode(pb.Notification(timestamp=1)).prefix is None
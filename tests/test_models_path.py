@@ -242,3 +242,176 @@ def test_path_add():
         base, path, want = t
         p = base + path
         assert p.encode() == want
+
+
+# ---------------------------------------------------------------------------
+# PathCache
+# ---------------------------------------------------------------------------
+
+
+def test_path_cache_counts_hits_and_misses():
+    from gnmi.models.path import PathCache
+
+    cache = PathCache(maxsize=2)
+    assert cache.get("/a") is None
+    cache.put("/a", Path([PathElem("a")]))
+    assert cache.get("/a") == Path([PathElem("a")])
+    assert cache.info() == (1, 1, 2, 1)
+
+
+def test_path_cache_evicts_least_recently_used():
+    from gnmi.models.path import PathCache
+
+    cache = PathCache(maxsize=2)
+    cache.put("/a", Path())
+    cache.put("/b", Path())
+    cache.get("/a")
+    cache.put("/c", Path())
+    assert cache.get("/b") is None
+    assert cache.get("/a") is not None
+    assert cache.get("/c") is not None
+
+    cache.resize(1)
+    assert cache.info().currsize == 1
+
+
+def test_path_cache_disabled_with_zero_size():
+    from gnmi.models.path import PathCache
+
+    cache = PathCache(maxsize=0)
+    cache.put("/a", Path())
+    assert cache.get("/a") is None
+
+
+def test_path_from_str_uses_cache_and_shares_paths():
+    from gnmi.models.path import path_cache
+
+    path_cache.clear()
+    first = Path.from_str("/interfaces/interface[name=Ethernet1]/state")
+    second = Path.from_str("/interfaces/interface[name=Ethernet1]/state")
+
+    assert first is second
+    info = path_cache.info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+# ---------------------------------------------------------------------------
+# Immutability / hashing
+# ---------------------------------------------------------------------------
+
+
+def test_path_is_immutable():
+    import pytest
+
+    p = Path.from_str("/a[name=x]/b")
+    with pytest.raises(AttributeError):
+        p.target = "r1"  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        p.elem[0].name = "z"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        p.elem[0].key["name"] = "y"  # type: ignore[index]
+    assert isinstance(p.elem, tuple)
+
+
+def test_path_is_hashable_and_usable_as_key():
+    a = Path.from_str("/interfaces/interface[name=Ethernet1][unit=0]/state")
+    b = Path.decode(a.encode())
+    assert a == b
+    assert hash(a) == hash(b)
+    assert {a: 1}[b] == 1
+    assert len({a, b, Path.from_str("/interfaces")}) == 2
+
+
+def test_path_elem_keys_are_sorted():
+    e = PathElem(name="protocol", key={"name": "65497", "identifier": "ISIS"})
+    assert e.keys == (("identifier", "ISIS"), ("name", "65497"))
+    assert e == PathElem(
+        name="protocol", key=[("name", "65497"), ("identifier", "ISIS")]
+    )
+    assert str(e) == "protocol[identifier=ISIS][name=65497]"
+
+
+def test_path_has_no_instance_dict():
+    p = Path.from_str("/a/b")
+    assert not hasattr(p, "__dict__")
+    assert not hasattr(p.elem[0], "__dict__")
+
+
+def test_path_pickle_round_trip():
+    import copy
+    import pickle
+
+    p = Path.from_str("oc:/a[k=v]/b")
+    p = p.replace(target="r1")
+    assert pickle.loads(pickle.dumps(p)) == p
+    assert copy.deepcopy(p) == p
+    assert p.target == "r1"
+
+
+# ---------------------------------------------------------------------------
+# PathTable interning
+# ---------------------------------------------------------------------------
+
+
+def test_path_table_shares_identical_paths():
+    from gnmi.models.path import PathTable
+
+    table = PathTable()
+    wire = pb.Path(
+        elem=[
+            pb.PathElem(name="interfaces"),
+            pb.PathElem(name="interface", key={"name": "Ethernet1"}),
+        ]
+    )
+    a = table.decode(wire)
+    b = table.decode(pb.Path.FromString(wire.SerializeToString()))
+    c = table.intern("/interfaces/interface[name=Ethernet1]")
+
+    assert a is b is c
+    assert table.path_id(a) == table.decode_id(wire) == 0
+    assert table.lookup(0) is a
+    assert len(table) == 1
+
+
+def test_path_table_assigns_dense_ids_and_shares_elems():
+    from gnmi.models.path import PathTable
+
+    table = PathTable()
+    ids = [table.path_id(p) for p in ("/a/b", "/a/c", "/a/b", "/a/c/d")]
+    assert ids == [0, 1, 0, 2]
+
+    b, c = table.lookup(0), table.lookup(1)
+    assert b.elem[0] is c.elem[0]
+    assert Path.from_str("/a/c") in table
+
+
+def test_enable_path_interning_routes_path_decode():
+    from gnmi.models.path import (
+        PathTable,
+        disable_path_interning,
+        enable_path_interning,
+        get_path_table,
+    )
+
+    wire = pb.Path(elem=[pb.PathElem(name="system")], target="r1")
+    table = enable_path_interning(PathTable())
+    try:
+        assert get_path_table() is table
+        assert Path.decode(wire) is Path.decode(wire)
+    finally:
+        disable_path_interning()
+
+    assert get_path_table() is None
+    assert Path.decode(wire) is not Path.decode(wire)
+    assert Path.decode(wire) == table.lookup(0)
+
+
+def test_path_decode_matches_constructed_state():
+    want = Path.from_str("origin:/a[z=1][k=v]/b")
+    have = Path.decode(want.encode())
+
+    assert have == want
+    assert hash(have) == hash(want)
+    assert have.elem[0].keys == (("k", "v"), ("z", "1"))
+    assert type(have.elem) is tuple
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import pytest
+
 from gnmi.proto import gnmi_pb2 as pb
 
-from gnmi.models.set import SetRequest, SetResponse
+from gnmi.models.path import Path
+from gnmi.models.set import SetRequest, SetRequestBuilder, SetResponse
+from gnmi.models.update import Update
+from gnmi.models.value import Value, ValueType
 from gnmi.models.update_result import UpdateResult, Operation
 
 
@@ -62,3 +67,92 @@ def test_model_set_response_decode_empty():
     decoded = SetResponse.decode(pb.SetResponse())
     assert decoded.responses == []
     assert decoded.message is None
+
+
+BUILDER_UPDATES = [
+    ("/a/b[k=v]", "str"),
+    ("/a/c", 1),
+    ("/a/d", 1.5),
+    ("/a/e", True),
+    ("/a/f", b"\x00"),
+    ("/a/g", {"json": [1, 2]}),
+    ("/a/h", ["x", 2]),
+    ("/a/i", ("up", "ascii_val")),
+    ("/a/j", (2**40, ValueType.UINT_VAL)),
+    ("/a/k", Value(2.5, ValueType.DOUBLE_VAL)),
+    ("oc:/a/m", "origin", 3),
+    (Path.from_str("/a/n"), "path"),
+]
+
+
+def test_set_request_builder_matches_model_encoding():
+    want = SetRequest(
+        prefix="/root",
+        deletes=["/x/y", "/x/z[k=v]"],
+        replacements=BUILDER_UPDATES,
+        updates=BUILDER_UPDATES,
+        union_replacements=BUILDER_UPDATES[:2],
+    ).encode()
+
+    have = (
+        SetRequestBuilder(prefix="/root")
+        .update(BUILDER_UPDATES)
+        .delete(["/x/y", Path.from_str("/x/z[k=v]")])
+        .union_replace(BUILDER_UPDATES[:2])
+        .replace(BUILDER_UPDATES)
+        .build()
+    )
+    assert have == want
+
+
+def test_set_request_builder_inputs():
+    b = SetRequestBuilder()
+    b.update({"/a": 1, "/b": "x"})
+    b.update([Update(path="/c", value=2), pb.Update(path=Path.from_str("/d").encode())])
+    b.delete([pb.Path(elem=[pb.PathElem(name="e")])])
+
+    want = SetRequest(
+        updates=[("/a", 1), ("/b", "x"), ("/c", 2)],
+        deletes=["/e"],
+    ).encode()
+    want.update.add(path=Path.from_str("/d").encode())
+
+    assert b.build() == want
+    assert len(b) == 5
+    assert b.size == want.ByteSize()
+    assert SetRequestBuilder().size == 0
+
+    with pytest.raises(ValueError):
+        b.update(["/bad"])
+    with pytest.raises(ValueError):
+        b.update([("/bad", ("a", "string_val", 1))])
+
+
+def test_set_request_builder_under_shares_parent():
+    b = SetRequestBuilder()
+    acl = b.under("/acl/acl-set[name=EDGE]/entries")
+    acl.update([(f"entry[seq={i}]/action", "ACCEPT") for i in range(3)])
+    acl.under("entry[seq=9]").delete(["config"])
+    b.update([("/top", 1)])
+
+    want = SetRequest(
+        updates=[
+            (f"/acl/acl-set[name=EDGE]/entries/entry[seq={i}]/action", "ACCEPT")
+            for i in range(3)
+        ]
+        + [("/top", 1)],
+        deletes=["/acl/acl-set[name=EDGE]/entries/entry[seq=9]/config"],
+    ).encode()
+    assert b.build() == want
+    assert acl.build() is b.build()
+
+
+def test_set_request_builder_under_scopes_updates():
+    b = SetRequestBuilder()
+    scoped = b.under("/a/b")
+    scoped.update([Update(path="c", value=1)])
+    scoped.replace([pb.Update(path=Path.from_str("d").encode())])
+
+    want = SetRequest(updates=[("/a/b/c", 1)]).encode()
+    want.replace.add(path=Path.from_str("/a/b/d").encode())
+    assert b.build() == want
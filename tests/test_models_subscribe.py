@@ -122,3 +122,65 @@ def test_subscription_list_decode_round_trip():
     assert decoded.allow_aggregation is True
     assert decoded.updates_only is True
     assert len(list(decoded.subscriptions)) == 2
+
+
+def test_subscribe_response_lazy_decode():
+    from gnmi.models.notification import LazyNotification
+
+    pb_resp = pb.SubscribeResponse(
+        update=pb.Notification(
+            timestamp=1234,
+            update=[
+                pb.Update(
+                    path=pb.Path(elem=[pb.PathElem(name="a")]),
+                    val=pb.TypedValue(string_val="v"),
+                )
+            ],
+        )
+    )
+    decoded = SubscribeResponse.decode(pb_resp, lazy=True)
+    assert isinstance(decoded.update, LazyNotification)
+    assert decoded.update.timestamp == 1234
+    assert str(decoded.update.updates[0].path) == "/a"
+    assert decoded.update.updates[0].value.value == "v"
+
+
+def test_peek_response_reads_bytes_without_decoding():
+    from gnmi.models.subscribe import peek_response
+
+    msg = pb.SubscribeResponse(
+        update=pb.Notification(
+            timestamp=1_700_000_000_000_000_000,
+            prefix=pb.Path(origin="openconfig", target="r1"),
+            update=[
+                pb.Update(
+                    path=pb.Path(elem=[pb.PathElem(name="a", key={"k": "v"})]),
+                    val=pb.TypedValue(double_val=1.5),
+                )
+            ],
+        )
+    )
+    meta = peek_response(msg.SerializeToString())
+    assert meta == peek_response(msg)
+    assert meta.target == "r1"
+    assert meta.origin == "openconfig"
+    assert meta.timestamp == 1_700_000_000_000_000_000
+    assert meta.sync_response is False
+
+    sync = pb.SubscribeResponse(sync_response=True)
+    assert peek_response(sync.SerializeToString()).sync_response is True
+
+
+def test_peek_response_negative_timestamp():
+    from gnmi.models.subscribe import peek_response
+
+    msg = pb.SubscribeResponse(update=pb.Notification(timestamp=-5))
+    assert peek_response(msg.SerializeToString()).timestamp == -5
+
+
+def test_decode_mode_factory_rejects_unknown():
+    from gnmi.models.subscribe import decode_mode_factory
+
+    assert decode_mode_factory("proto") == "proto"
+    with pytest.raises(ValueError):
+        decode_mode_factory("json")
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 
+import pytest
+
 from gnmi.models.value import Value
 from gnmi.proto import gnmi_pb2 as pb
 
@@ -8,6 +10,7 @@ from gnmi.models import Update
 from gnmi.models.path import Path
 
 
+@pytest.mark.usefixtures("stdlib_json")
 def test_update():
     tests = [
         (
@@ -44,3 +47,13 @@ def test_update():
         assert isinstance(have.path, Path)
         assert want == have.encode()
         assert Update.decode(want) == have
+
+
+def test_update_decode_matches_constructed_state():
+    want = Update(path="a/b[k=v]", value=("x", "string_val"), duplicates=2)
+    have = Update.decode(want.encode())
+
+    assert have == want
+    assert vars(have) == vars(want)
+    assert isinstance(have.path, Path)
+    assert isinstance(have.value, Value)
@@ -207,6 +207,51 @@ def test_value_encode_decode_round_trip_json_ietf():
     assert decoded.val_type in (ValueType.JSON_IETF_VAL, ValueType.JSON_VAL)
 
 
+def test_value_decode_dispatches_every_oneof_field():
+    tests = [
+        (pb.TypedValue(ascii_val="a"), "a", ValueType.ASCII_VAL),
+        (pb.TypedValue(bool_val=True), True, ValueType.BOOL_VAL),
+        (pb.TypedValue(bytes_val=b"b"), b"b", ValueType.BYTES_VAL),
+        (pb.TypedValue(double_val=1.5), 1.5, ValueType.DOUBLE_VAL),
+        (pb.TypedValue(float_val=0.5), 0.5, ValueType.FLOAT_VAL),
+        (pb.TypedValue(int_val=-3), -3, ValueType.INT_VAL),
+        (pb.TypedValue(json_val=b'{"a": 1}'), {"a": 1}, ValueType.JSON_VAL),
+        (pb.TypedValue(json_ietf_val=b"[1]"), [1], ValueType.JSON_IETF_VAL),
+        (pb.TypedValue(proto_bytes=b"p"), b"p", ValueType.PROTO_BYTES),
+        (pb.TypedValue(string_val="s"), "s", ValueType.STRING_VAL),
+        (pb.TypedValue(uint_val=2**64 - 1), 2**64 - 1, ValueType.UINT_VAL),
+        (
+            pb.TypedValue(decimal_val=pb.Decimal64(digits=314, precision=2)),
+            Decimal(3.14),
+            ValueType.DECIMAL_VAL,
+        ),
+    ]
+
+    for msg, val, typ in tests:
+        decoded = Value.decode(msg)
+        assert decoded.val == val
+        assert decoded.val_type == typ
+
+
+def test_value_decode_leaflist():
+    msg = pb.TypedValue(
+        leaflist_val=pb.ScalarArray(
+            element=[pb.TypedValue(uint_val=1), pb.TypedValue(string_val="x")]
+        )
+    )
+    decoded = Value.decode(msg)
+    assert decoded.val_type == ValueType.LEAFLIST_VAL
+    assert decoded.val == [
+        Value(1, ValueType.UINT_VAL),
+        Value("x", ValueType.STRING_VAL),
+    ]
+
+
+def test_value_decode_unset_raises():
+    with pytest.raises(ValueError, match="Unhandled typed value"):
+        Value.decode(pb.TypedValue())
+
+
 # ---------------------------------------------------------------------------
 # Existing tests
 # ---------------------------------------------------------------------------
@@ -247,3 +292,45 @@ def test_val():
     for test in tests:
         have, want = test
         assert Value(*have).encode() == want
+
+
+# ---------------------------------------------------------------------------
+# Deferred JSON values
+# ---------------------------------------------------------------------------
+
+
+def test_json_value_defers_parsing():
+    from gnmi.models.value import JsonValue
+
+    v = Value.decode(pb.TypedValue(json_ietf_val=b'{"a": [1, 2]}'))
+    assert isinstance(v, JsonValue)
+    assert not v.parsed
+    assert v.raw_json == b'{"a": [1, 2]}'
+    assert not v.parsed
+
+    assert v.value == {"a": [1, 2]}
+    assert v.parsed
+    assert v.to_json() == {"a": [1, 2]}
+
+
+def test_json_value_equals_parsed_value():
+    v = Value.decode(pb.TypedValue(json_val=b'{"k": "v"}'))
+    assert v == Value({"k": "v"}, ValueType.JSON_VAL)
+    assert Value({"k": "v"}, ValueType.JSON_VAL) == v
+    assert v != Value({"k": "v"}, ValueType.JSON_IETF_VAL)
+
+
+def test_json_value_encode_passes_raw_bytes_through():
+    raw = b'{"b":1,  "a":2}'
+    assert Value.decode(pb.TypedValue(json_ietf_val=raw)).encode() == pb.TypedValue(
+        json_ietf_val=raw
+    )
+    assert Value.decode(pb.TypedValue(json_val=raw)).encode() == pb.TypedValue(
+        json_val=raw
+    )
+
+
+@pytest.mark.usefixtures("stdlib_json")
+def test_value_to_json_plain_dict():
+    assert Value({"a": 1}, ValueType.JSON_VAL).to_json() == {"a": 1}
+    assert Value({"a": 1}, ValueType.JSON_VAL).raw_json == b'{"a": 1}'
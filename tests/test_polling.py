@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from unittest import mock
+
+import pytest
+
+from gnmi import polling as polling_mod
+from gnmi.async_session import AsyncSession
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.session import Session
+from tests.conftest import STUB_HOSTNAME
+
+HOSTNAME = "/system/config/hostname"
+
+
+def _values(batch):
+    return [u.value.value for n in batch for u in n.updates]
+
+
+def test_poll_subscription_polls_on_one_stream(stub_server):
+    with Session(stub_server.target, insecure=True) as sess:
+        with sess.subscribe_poll([HOSTNAME]) as sub:
+            assert _values(sub.initial) == [STUB_HOSTNAME]
+
+            sess.set(updates=[(HOSTNAME, "r1")])
+            assert _values(sub.poll()) == ["r1"]
+
+            sess.set(updates=[(HOSTNAME, "r2")])
+            assert _values(sub.poll()) == ["r2"]
+
+        assert sub.closed
+        with pytest.raises(ValueError):
+            sub.poll()
+
+    reqs = stub_server.servicer.last_subscribe_requests
+    assert reqs[0].subscribe.mode == pb.SubscriptionList.POLL
+    assert [r.HasField("poll") for r in reqs] == [False, True, True]
+
+
+def test_poll_subscription_every_runs_at_fixed_rate(stub_server):
+    clock = iter([0.0, 0.5, 3.5])
+    with (
+        mock.patch.object(polling_mod.time, "monotonic", lambda: next(clock)),
+        mock.patch.object(polling_mod.time, "sleep") as sleep,
+        Session(stub_server.target, insecure=True) as sess,
+        sess.subscribe_poll([HOSTNAME], initial=False) as sub,
+    ):
+        batches = list(sub.every(1.0, count=3))
+
+    assert [_values(b) for b in batches] == [[STUB_HOSTNAME]] * 3
+    # 0.5s left of the first interval, then the ticks at 2.0 and 3.0 were
+    # missed and the schedule moves on to 4.0
+    assert [c.args[0] for c in sleep.call_args_list] == pytest.approx([0.5, 0.5])
+
+
+async def test_async_poll_subscription(stub_server):
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        async with sess.subscribe_poll([HOSTNAME], lazy=True) as sub:
+            assert _values(sub.initial) == [STUB_HOSTNAME]
+
+            await sess.set(updates=[(HOSTNAME, "r3")])
+            assert _values(await sub.poll()) == ["r3"]
+
+            batches = [b async for b in sub.every(0, count=2)]
+            assert [_values(b) for b in batches] == [["r3"], ["r3"]]
+
+    assert len(stub_server.servicer.last_subscribe_requests) == 4
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import grpc
+import grpc.aio
+import pytest
+
+from gnmi import api
+from gnmi.async_session import AsyncSession
+from gnmi.pool import ChannelPool, channel_key, get_channel_pool, pool_factory
+from gnmi.session import Session
+from gnmi.tls import TLSConfig
+
+
+class FakeChannel:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_and_refcounts():
+    pool = ChannelPool(maxsize=4, idle_timeout=60)
+    a = pool.acquire("t1", FakeChannel)
+    b = pool.acquire("t1", FakeChannel)
+    c = pool.acquire("t2", FakeChannel)
+
+    assert a is b
+    assert a is not c
+    info = pool.info()
+    assert (info.hits, info.misses, info.currsize, info.in_use) == (1, 2, 2, 2)
+
+    pool.release(a)
+    pool.release(b)
+    assert not a.closed
+    assert pool.info().in_use == 1
+    assert pool.acquire("t1", FakeChannel) is a
+
+
+def test_pool_idle_expiry():
+    pool = ChannelPool(maxsize=4, idle_timeout=0)
+    a = pool.acquire("t1", FakeChannel)
+    b = pool.acquire("t2", FakeChannel)
+    pool.release(a)
+
+    assert a.closed
+    assert not b.closed
+    assert len(pool) == 1
+    assert pool.acquire("t1", FakeChannel) is not a
+
+    pool = ChannelPool(maxsize=4, idle_timeout=3600)
+    a = pool.acquire("t1", FakeChannel)
+    pool.release(a)
+    assert pool.prune() == 0
+    pool.idle_timeout = 0
+    assert pool.prune() == 1
+    assert a.closed
+
+
+def test_pool_maxsize():
+    pool = ChannelPool(maxsize=2, idle_timeout=60)
+    a = pool.acquire("t1", FakeChannel)
+    b = pool.acquire("t2", FakeChannel)
+
+    # full of busy channels: handed out unpooled, closed on release
+    c = pool.acquire("t3", FakeChannel)
+    assert len(pool) == 2
+    pool.release(c)
+    assert c.closed
+
+    # an idle channel makes room (least recently released first)
+    pool.release(b)
+    pool.release(a)
+    d = pool.acquire("t4", FakeChannel)
+    assert b.closed
+    assert not a.closed
+    assert pool.acquire("t1", FakeChannel) is a
+    assert len(pool) == 2
+    assert pool.info().evictions == 1
+
+    pool.release(d)
+    pool.clear()
+    assert d.closed
+    assert not a.closed  # still held
+    assert len(pool) == 1
+
+
+class FakeAioChannel:
+    def __init__(self, loop=None):
+        self._loop = loop
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_pool_release_unknown_channel():
+    with pytest.raises(ValueError):
+        ChannelPool().release(FakeChannel())
+
+
+def test_pool_key_includes_loop():
+    pool = ChannelPool()
+    assert pool.acquire("t", FakeChannel, loop=1) is not pool.acquire("t", FakeChannel)
+
+
+def test_pool_key_separates_sync_and_aio(stub_target):
+    pool = ChannelPool()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        # built outside a running loop, the async session passes loop=None
+        sess = Session(stub_target, insecure=True, pool=pool)
+        asess = AsyncSession(stub_target, insecure=True, pool=pool)
+        assert isinstance(sess._channel, grpc.Channel)
+        assert isinstance(asess._channel, grpc.aio.Channel)
+        assert pool.info().misses == 2
+        sess.__exit__(None, None, None)
+        pool.release(asess._channel)
+        pool.idle_timeout = 0
+        assert pool.prune() == 2
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def test_pool_closes_idle_aio_channel_on_its_loop():
+    loop = asyncio.new_event_loop()
+    try:
+        pool = ChannelPool(idle_timeout=0)
+        channel = pool.acquire("t", lambda: FakeAioChannel(loop), aio=True)
+        pool.release(channel)
+        assert channel.closed
+    finally:
+        loop.close()
+
+
+async def test_pool_closes_aio_channel_on_running_loop():
+    pool = ChannelPool(idle_timeout=0)
+    loop = asyncio.get_running_loop()
+    channel = pool.acquire("t", FakeAioChannel, loop=loop)
+    pool.release(channel)
+    await asyncio.sleep(0)
+    assert channel.closed
+
+
+def test_channel_key():
+    tls = TLSConfig(ca_cert=b"ca", client_cert=None, client_key=None)
+    assert channel_key("a:1", False, tls, {"x": 1}.items()) == channel_key(
+        "a:1", False, TLSConfig(b"ca", None, None), [("x", 1)]
+    )
+    assert channel_key("a:1", False, tls, ()) != channel_key("a:1", False, None, ())
+    assert channel_key("a:1", True, None, ()) != channel_key("a:2", True, None, ())
+
+
+def test_pool_factory(monkeypatch):
+    from gnmi._env import env
+
+    pool = ChannelPool()
+    assert pool_factory(pool) is pool
+    assert pool_factory(True) is get_channel_pool()
+    assert pool_factory(False) is None
+
+    monkeypatch.setattr(env, "GNMIP_CHANNEL_POOL", False)
+    assert pool_factory(None) is None
+    monkeypatch.setattr(env, "GNMIP_CHANNEL_POOL", True)
+    assert pool_factory(None) is get_channel_pool()
+
+
+def test_session_pool(stub_target):
+    pool = ChannelPool()
+    with Session(stub_target, insecure=True, pool=pool) as one:
+        with Session(stub_target, insecure=True, pool=pool) as two:
+            assert one._channel is two._channel
+            assert one.capabilities().gnmi_version
+        assert pool.info().in_use == 1
+    assert pool.info().in_use == 0
+
+    # the warm channel still works for the next session
+    with Session(stub_target, insecure=True, pool=pool) as three:
+        assert three._channel is one._channel
+        assert three.capabilities().gnmi_version
+
+    with Session(stub_target, insecure=True, pool=False) as unpooled:
+        assert unpooled._channel is not one._channel
+
+
+def test_api_pool(stub_target):
+    pool = ChannelPool()
+    for _ in range(3):
+        notifs = list(
+            api.get(stub_target, ["/system/config/hostname"], insecure=True, pool=pool)
+        )
+        assert notifs
+    info = pool.info()
+    assert (info.misses, info.hits, info.currsize, info.in_use) == (1, 2, 1, 0)
+
+
+async def test_async_session_pool(stub_target):
+    pool = ChannelPool()
+    async with AsyncSession(stub_target, insecure=True, pool=pool) as one:
+        assert (await one.capabilities()).gnmi_version
+    async with AsyncSession(stub_target, insecure=True, pool=pool) as two:
+        assert two._channel is one._channel
+        assert (await two.capabilities()).gnmi_version
+
+    assert pool.info().hits == 1
+    pool.idle_timeout = 0
+    assert pool.prune() == 1
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from unittest import mock
+
+import grpc
+import pytest
+
+from gnmi import resilient as resilient_mod
+from gnmi.async_session import AsyncSession
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.resilient import (
+    AsyncResilientSubscription,
+    EventKind,
+    ReconnectPolicy,
+    ResilientSubscription,
+    SubscriptionEvent,
+)
+from gnmi.session import Session
+
+NO_WAIT = ReconnectPolicy(backoff=0, max_backoff=0)
+
+
+def _flaky(servicer, fail_first: int, code=grpc.StatusCode.UNAVAILABLE):
+    """Abort the first ``fail_first`` streams, serve the default after."""
+    calls = {"n": 0}
+    default = servicer.subscribe_handler
+
+    def handler(request_iterator, context):
+        calls["n"] += 1
+        if calls["n"] <= fail_first:
+            context.abort(code, "link down")
+        yield from default(request_iterator, context)
+
+    servicer.subscribe_handler = handler
+    return calls
+
+
+def _kinds(items):
+    return [i.kind if isinstance(i, SubscriptionEvent) else "resp" for i in items]
+
+
+def _until_synced(sub, count=1):
+    items = []
+    for item in sub:
+        items.append(item)
+        if isinstance(item, SubscriptionEvent) and item.kind is EventKind.SYNCED:
+            count -= 1
+            if not count:
+                break
+    return items
+
+
+def test_resilient_subscription_reconnects_and_resyncs(stub_server):
+    calls = _flaky(stub_server.servicer, fail_first=2)
+
+    with Session(stub_server.target, insecure=True) as sess:
+        sub = ResilientSubscription(sess, ["/system/config/hostname"], policy=NO_WAIT)
+        items = _until_synced(sub)
+
+    assert calls["n"] == 3
+    assert _kinds(items) == [
+        EventKind.DISCONNECTED,
+        EventKind.DISCONNECTED,
+        "resp",
+        EventKind.RECONNECTED,
+        "resp",
+        EventKind.SYNCED,
+    ]
+    assert items[0].error.code() == grpc.StatusCode.UNAVAILABLE
+    assert items[-1].attempt == 3
+    assert sub.synced is True
+    assert sub.stats.streams == 3
+    assert sub.stats.disconnects == 2
+    assert sub.stats.reconnects == 1
+    assert sub.stats.syncs == 1
+    assert sub.stats.consecutive_failures == 0
+    # the stream that got through carried the full subscription again
+    assert len(stub_server.servicer.last_subscribe_requests) == 1
+
+
+def test_resilient_subscription_reconnects_after_clean_close(stub_server):
+    with Session(stub_server.target, insecure=True) as sess:
+        sub = ResilientSubscription(sess, ["/system/config/hostname"], policy=NO_WAIT)
+        items = _until_synced(sub, count=2)
+
+    disconnect = [i for i in items if isinstance(i, SubscriptionEvent)][1]
+    assert disconnect.kind is EventKind.DISCONNECTED
+    assert disconnect.error is None
+    assert sub.stats.syncs == 2
+
+
+def test_resilient_subscription_once_ends_without_reconnect(stub_server):
+    with Session(stub_server.target, insecure=True) as sess:
+        sub = ResilientSubscription(
+            sess, ["/system/config/hostname"], policy=NO_WAIT, mode="once"
+        )
+        items = list(sub)
+
+    assert _kinds(items) == ["resp", "resp", EventKind.SYNCED]
+    assert sub.stats.streams == 1
+
+
+def test_resilient_subscription_raises_non_retryable(stub_server):
+    _flaky(stub_server.servicer, fail_first=1, code=grpc.StatusCode.PERMISSION_DENIED)
+
+    with Session(stub_server.target, insecure=True) as sess:
+        sub = ResilientSubscription(sess, ["/system/config/hostname"], policy=NO_WAIT)
+        with pytest.raises(grpc.RpcError) as exc:
+            list(sub)
+
+    assert exc.value.code() == grpc.StatusCode.PERMISSION_DENIED
+
+
+def test_resilient_subscription_gives_up_after_max_retries(stub_server):
+    calls = _flaky(stub_server.servicer, fail_first=10)
+    policy = ReconnectPolicy(backoff=0, max_retries=2)
+
+    with Session(stub_server.target, insecure=True) as sess:
+        sub = ResilientSubscription(sess, ["/system/config/hostname"], policy=policy)
+        with pytest.raises(grpc.RpcError):
+            list(sub)
+
+    assert calls["n"] == 3
+    assert sub.stats.consecutive_failures == 3
+
+
+def test_reconnect_policy_delay_is_jittered_and_capped():
+    policy = ReconnectPolicy(backoff=1.0, max_backoff=4.0)
+    with mock.patch.object(resilient_mod.random, "uniform", side_effect=lambda a, b: b):
+        assert [policy.delay(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 4.0, 4.0]
+
+
+async def test_async_resilient_subscription_reconnects(stub_server):
+    calls = _flaky(stub_server.servicer, fail_first=1)
+
+    items = []
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        sub = AsyncResilientSubscription(
+            sess, ["/system/config/hostname"], policy=NO_WAIT, decode="proto"
+        )
+        async for item in sub:
+            items.append(item)
+            if isinstance(item, SubscriptionEvent) and item.kind is EventKind.SYNCED:
+                break
+
+    assert calls["n"] == 2
+    assert _kinds(items) == [
+        EventKind.DISCONNECTED,
+        "resp",
+        EventKind.RECONNECTED,
+        "resp",
+        EventKind.SYNCED,
+    ]
+    assert isinstance(items[1], pb.SubscribeResponse)
+    assert sub.stats.reconnects == 1
@@ -82,6 +82,20 @@ def test_session_set_round_trips_all_ops(session, stub_server):
     assert len(req.update) == 1
 
 
+def test_session_set_request_builder(session, stub_server):
+    from gnmi.models import SetRequestBuilder
+
+    b = SetRequestBuilder(prefix="/sys")
+    b.delete(["a/b"]).update([("e/f", "v")])
+    resp = session.set(request=b)
+
+    assert [r.op.name for r in resp.responses] == ["DELETE", "UPDATE"]
+    assert stub_server.servicer.last_set_request == b.build()
+
+    with pytest.raises(ValueError):
+        session.set(updates=[("/x", 1)], request=b)
+
+
 def test_session_subscribe_streams_then_sync(session):
     paths = ["/system/config/hostname", "/system/state/hostname"]
     seen_paths: list[str] = []
@@ -99,6 +113,44 @@ def test_session_subscribe_streams_then_sync(session):
     assert set(seen_paths) == set(paths)
 
 
+def test_session_subscribe_lazy(session):
+    from gnmi.models import LazyNotification
+
+    seen_paths: list[str] = []
+    for resp in session.subscribe(["/system/config/hostname"], mode="once", lazy=True):
+        if resp.sync_response:
+            break
+        assert isinstance(resp.update, LazyNotification)
+        seen_paths.extend(str(u.path) for u in resp.update.updates)
+
+    assert seen_paths == ["/system/config/hostname"]
+
+
+def test_session_subscribe_decode_proto(session):
+    responses = list(session.subscribe(["/a"], mode="once", decode="proto"))
+    assert all(isinstance(r, pb.SubscribeResponse) for r in responses)
+    assert responses[-1].sync_response
+
+
+def test_session_subscribe_decode_none_yields_bytes(session):
+    from gnmi.models.subscribe import peek_response
+
+    responses = list(session.subscribe(["/a"], mode="once", decode="none"))
+    assert all(isinstance(r, bytes) for r in responses)
+    assert peek_response(responses[-1]).sync_response
+    first = pb.SubscribeResponse.FromString(responses[0])
+    assert first.update.update[0].path.elem[0].name == "a"
+
+
+def test_session_get_lazy(session):
+    from gnmi.models import LazyNotification
+
+    resp = session.get(["/system/config/hostname"], lazy=True)
+    notif = resp.notifications[0]
+    assert isinstance(notif, LazyNotification)
+    assert notif.updates[0].value.value == STUB_HOSTNAME
+
+
 # ---------------------------------------------------------------------------
 # High-level api.* wrappers
 # ---------------------------------------------------------------------------
@@ -125,6 +177,20 @@ def test_api_subscribe(stub_target):
     assert len(notifs) == 1
 
 
+def test_api_subscribe_raw(stub_target):
+    notifs = list(
+        api.subscribe(stub_target, ["/a"], insecure=True, mode="once", decode="proto")
+    )
+    assert len(notifs) == 1
+    assert isinstance(notifs[0], pb.Notification)
+
+    raw = list(
+        api.subscribe(stub_target, ["/a"], insecure=True, mode="once", decode="none")
+    )
+    assert len(raw) == 1
+    assert isinstance(raw[0], bytes)
+
+
 def test_api_delete_replace_update(stub_target, stub_server):
     api.delete(stub_target, ["/a"], insecure=True)
     assert stub_server.servicer.last_set_request.delete
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import grpc
+import pytest
+
+from gnmi.async_session import AsyncSession
+from gnmi.models.set import SetResponse
+from gnmi.models.update_result import Operation, UpdateResult
+from gnmi.session import Session
+from gnmi.set_batch import BatchOp, SetBatch
+
+
+def _recording(stub_server):
+    requests = []
+    default = stub_server.servicer.set_handler
+
+    def handler(request, context):
+        requests.append(request)
+        return default(request, context)
+
+    stub_server.servicer.set_handler = handler
+    return requests
+
+
+def _paths(fields) -> list[str]:
+    out = []
+    for f in fields:
+        path = getattr(f, "path", f)
+        out.append("/" + "/".join(e.name for e in path.elem))
+    return out
+
+
+def test_batch_sends_one_request_and_maps_results(stub_server):
+    requests = _recording(stub_server)
+
+    with Session(stub_server.target, insecure=True) as sess, sess.batch() as batch:
+        a = batch.update("/system/a", "1")
+        b = batch.replace("/system/b", "2")
+        c = batch.delete("/system/c")
+        assert len(batch) == 3
+
+    assert len(requests) == 1
+    assert a.response.op == Operation.UPDATE
+    assert str(a.response.path) == "/system/a"
+    assert b.response.op == Operation.REPLACE
+    assert c.response.op == Operation.DELETE
+
+
+def test_batch_drops_redundant_operations(stub_server):
+    requests = _recording(stub_server)
+
+    with Session(stub_server.target, insecure=True) as sess, sess.batch() as batch:
+        first = batch.update("/system/a", "1")
+        batch.update("/system/a", "2")
+        child = batch.update("/interfaces/x/mtu", 1500)
+        batch.replace("/system/b", "3")
+        gone = batch.delete("/interfaces/x")
+        assert len(batch) == 3
+
+    (req,) = requests
+    assert _paths(req.update) == ["/system/a"]
+    assert req.update[0].val.string_val == "2"
+    assert _paths(req.replace) == ["/system/b"]
+    assert _paths(req.delete) == ["/interfaces/x"]
+
+    assert first.superseded
+    assert first.response.op == Operation.UPDATE
+    assert child.response is gone.response
+
+
+def test_batch_keeps_or_merges_non_scalar_updates():
+    requests = []
+
+    def fake_set(builder):
+        requests.append(builder.build())
+        return SetResponse(responses=[])
+
+    batch = SetBatch(fake_set)
+    merged = batch.update("/a", {"x": 1, "n": {"p": 1, "q": 2}})
+    batch.update("/a", {"y": 2, "n": {"q": 3}})
+    kept = batch.update("/b", ["1", "2"])
+    batch.update("/b", ["3"])
+    batch.update("/c", ("v1", "ascii_val"))
+    batch.update("/c", "v2")
+    assert len(batch) == 4
+    batch.flush()
+
+    (req,) = requests
+    assert _paths(req.update) == ["/a", "/b", "/b", "/c"]
+    assert json.loads(req.update[0].val.json_val) == {
+        "x": 1,
+        "y": 2,
+        "n": {"p": 1, "q": 3},
+    }
+    assert req.update[3].val.string_val == "v2"
+    assert merged.superseded
+    assert not kept.superseded
+
+
+@pytest.mark.parametrize(
+    "between, want",
+    [
+        (("delete", "/a/x"), [["/a"], ["/a/x", "/a"]]),
+        (("update", "/a/x", 5), [["/a", "/a/x", "/a"]]),
+    ],
+)
+def test_batch_keeps_updates_with_overlapping_ops_between(between, want):
+    requests = []
+
+    def fake_set(builder):
+        requests.append(builder.build())
+        return SetResponse(responses=[])
+
+    batch = SetBatch(fake_set)
+    first = batch.update("/a", {"x": 1})
+    getattr(batch, between[0])(*between[1:])
+    batch.update("/a", {"y": 2})
+    batch.flush()
+
+    assert not first.superseded
+    assert [_paths(r.delete) + _paths(r.update) for r in requests] == want
+    assert json.loads(requests[-1].update[-1].val.json_val) == {"y": 2}
+
+
+def test_batch_splits_where_request_order_would_reorder(stub_server):
+    requests = _recording(stub_server)
+
+    with Session(stub_server.target, insecure=True) as sess, sess.batch() as batch:
+        batch.update("/system/config", "{}")
+        # sent in one request this delete would be applied first
+        batch.delete("/system/config/hostname")
+
+    assert [(_paths(r.update), _paths(r.delete)) for r in requests] == [
+        (["/system/config"], []),
+        ([], ["/system/config/hostname"]),
+    ]
+
+
+def test_batch_chunks_by_count_and_size(stub_server):
+    requests = _recording(stub_server)
+
+    with Session(stub_server.target, insecure=True) as sess:
+        with sess.batch(max_ops=2) as batch:
+            results = [batch.update(f"/system/p{i}", str(i)) for i in range(5)]
+        assert [len(r.update) for r in requests] == [2, 2, 1]
+        assert all(r.response.op == Operation.UPDATE for r in results)
+
+        requests.clear()
+        with sess.batch(max_bytes=64) as batch:
+            for i in range(4):
+                batch.update(f"/system/p{i}", "x" * 20)
+        assert len(requests) > 1
+        assert sum(len(r.update) for r in requests) == 4
+
+
+def test_batch_discards_on_exception_and_keeps_unsent_on_failure(stub_server):
+    requests = _recording(stub_server)
+
+    with Session(stub_server.target, insecure=True) as sess:
+        with pytest.raises(RuntimeError), sess.batch() as batch:
+            pending = batch.update("/system/a", "1")
+            raise RuntimeError("abort")
+        assert requests == []
+        with pytest.raises(ValueError):
+            _ = pending.response
+
+        def fail(request, context):
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "locked")
+
+        stub_server.servicer.set_handler = fail
+        batch = sess.batch()
+        batch.delete("/system/a")
+        with pytest.raises(grpc.RpcError):
+            batch.flush()
+        assert len(batch) == 1
+
+
+def test_batch_resolves_results_by_path_when_counts_differ():
+    def fake_set(request):
+        return SetResponse(
+            responses=[UpdateResult(path="/system/b", op=Operation.DELETE)]
+        )
+
+    batch = SetBatch(fake_set)
+    a = batch.update("/system/a", "1")
+    b = batch.delete("/system/b")
+    batch.flush()
+
+    assert a.response is None
+    assert b.response.op == Operation.DELETE
+    assert b.op is BatchOp.DELETE
+
+
+async def test_async_batch(stub_server):
+    requests = _recording(stub_server)
+
+    async with AsyncSession(stub_server.target, insecure=True) as sess:
+        async with sess.batch(prefix="/system") as batch:
+            a = batch.update("config/hostname", "r1")
+            batch.update("config/domain-name", "lab")
+
+    assert len(requests) == 1
+    assert _paths([requests[0].prefix]) == ["/system"]
+    assert a.response.op == Operation.UPDATE
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from gnmi.models.path import Path
+from gnmi.trie import PathTrie
+
+
+def _trie() -> PathTrie:
+    trie = PathTrie()
+    for name in ("Ethernet1", "Ethernet2"):
+        base = f"/interfaces/interface[name={name}]"
+        trie.insert(f"{base}/state/counters/in-octets", f"{name}-in")
+        trie.insert(f"{base}/state/counters/out-octets", f"{name}-out")
+        trie.insert(f"{base}/state/mtu", f"{name}-mtu")
+    trie.insert("/interfaces/interface[name=Ethernet1][unit=0]/state/mtu", "unit")
+    trie.insert("/system/state/hostname", "leaf1")
+    return trie
+
+
+def _values(matches) -> list:
+    return sorted(v for _, v in matches)
+
+
+def test_insert_get_and_delete():
+    trie = _trie()
+    assert len(trie) == 8
+    assert (
+        trie.get("/interfaces/interface[name=Ethernet2]/state/mtu") == "Ethernet2-mtu"
+    )
+    assert "/system/state/hostname" in trie
+    assert "/system/state" not in trie
+    assert trie.get("/interfaces/interface/state/mtu") is None
+
+    # replacing is not a new path
+    assert not trie.insert("/system/state/hostname", "leaf2")
+    assert trie.get("/system/state/hostname") == "leaf2"
+
+    assert trie.delete("/interfaces/interface[name=Ethernet1]") == 3
+    assert len(trie) == 5
+    assert trie.get("/interfaces/interface[name=Ethernet1][unit=0]/state/mtu") == "unit"
+    assert trie.delete("/interfaces/interface[name=Ethernet1]") == 0
+
+    assert trie.delete("/") == 5
+    assert len(trie) == 0
+    assert list(trie) == []
+
+    with pytest.raises(ValueError):
+        trie.insert("/", 1)
+
+
+def test_items_below_prefix():
+    trie = _trie()
+    items = list(trie.items("/interfaces/interface[name=Ethernet2]"))
+    assert [str(p) for p, _ in items] == [
+        "/interfaces/interface[name=Ethernet2]/state/counters/in-octets",
+        "/interfaces/interface[name=Ethernet2]/state/counters/out-octets",
+        "/interfaces/interface[name=Ethernet2]/state/mtu",
+    ]
+    assert list(trie.items("/system/state/hostname")) == [
+        (Path.from_str("/system/state/hostname"), "leaf1")
+    ]
+    assert list(trie.items("/nope")) == []
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        (
+            "/interfaces/interface[name=*]/state/counters/in-octets",
+            ["Ethernet1-in", "Ethernet2-in"],
+        ),
+        ("/interfaces/interface[name=Ethernet2]/state/*", ["Ethernet2-mtu"]),
+        # keys left out match every key set
+        (
+            "/interfaces/interface/state/mtu",
+            ["Ethernet1-mtu", "Ethernet2-mtu", "unit"],
+        ),
+        ("/interfaces/interface[unit=*]/state/mtu", ["unit"]),
+        # as are the keys a pattern doesn't name
+        ("/interfaces/interface[name=Ethernet1]/state/mtu", ["Ethernet1-mtu", "unit"]),
+        ("/interfaces/interface[unit=0]/state/mtu", ["unit"]),
+        ("/interfaces/interface[name=Ethernet1][unit=0]/state/mtu", ["unit"]),
+        ("/*/*/state/mtu", ["Ethernet1-mtu", "Ethernet2-mtu", "unit"]),
+        (".../mtu", ["Ethernet1-mtu", "Ethernet2-mtu", "unit"]),
+        (
+            "/interfaces/.../counters/...",
+            ["Ethernet1-in", "Ethernet1-out", "Ethernet2-in", "Ethernet2-out"],
+        ),
+        ("/system/...", ["leaf1"]),
+        ("/system/state/hostname/...", ["leaf1"]),
+        ("/interfaces/interface[name=Ethernet3]/...", []),
+    ],
+)
+def test_match(pattern, expected):
+    assert _values(_trie().match(pattern)) == expected
+
+
+def test_match_paths_are_concrete():
+    paths = [
+        str(p) for p, _ in _trie().match("/interfaces/interface[name=*]/state/mtu")
+    ]
+    # keys the pattern doesn't name may take any value
+    assert sorted(paths) == [
+        "/interfaces/interface[name=Ethernet1]/state/mtu",
+        "/interfaces/interface[name=Ethernet1][unit=0]/state/mtu",
+        "/interfaces/interface[name=Ethernet2]/state/mtu",
+    ]
+
+
+def test_value_and_children_at_the_same_path():
+    trie = PathTrie()
+    trie.insert("/a[k=1]", "leaf")
+    trie.insert("/a[k=1]/b", "child")
+    trie.insert("/a", "keyless")
+
+    assert trie.get("/a[k=1]") == "leaf"
+    assert trie.get("/a") == "keyless"
+    assert _values(trie.match("/a")) == ["keyless", "leaf"]
+    assert _values(trie.match("/a/...")) == ["child", "keyless", "leaf"]
+
+    assert trie.delete("/a[k=1]/b") == 1
+    assert trie.get("/a[k=1]") == "leaf"
+
+
+def test_keyless_element_covers_the_list():
+    trie = _trie()
+    assert len(list(trie.items("/interfaces/interface"))) == 7
+    assert [str(p) for p, _ in trie.items("/interfaces/interface/state/mtu")] == [
+        "/interfaces/interface[name=Ethernet1]/state/mtu",
+        "/interfaces/interface[name=Ethernet2]/state/mtu",
+        "/interfaces/interface[name=Ethernet1][unit=0]/state/mtu",
+    ]
+
+    assert trie.delete("/interfaces/interface/state/counters") == 4
+    assert trie.delete("/interfaces/interface") == 3
+    assert len(trie) == 1
+    assert [str(p) for p, _ in trie] == ["/system/state/hostname"]
+
+
+def test_prune():
+    trie = _trie()
+    assert trie.prune(lambda v: v.endswith("-out")) == 2
+    assert len(trie) == 6
+    assert _values(trie.match(".../out-octets")) == []
@@ -3,7 +3,8 @@
 
 import pytest
 
-from gnmi.util import escape_string, oneof, parse_duration
+from gnmi.proto import gnmi_pb2 as pb
+from gnmi.util import escape_string, oneof, parse_duration, wire_fields
 
 
 def test_parse_duration():
@@ -165,3 +166,13 @@ def test_oneof_single_set_returns_index():
     assert oneof("only", None, None) == 0
     assert oneof(None, "only", None) == 1
     assert oneof(None, None, "only") == 2
+
+
+def test_wire_fields():
+    buf = pb.Notification(
+        timestamp=300, prefix=pb.Path(target="t"), atomic=True
+    ).SerializeToString()
+    fields = list(wire_fields(buf, 0, len(buf)))
+    assert [(num, val) for num, val in fields if num != 2] == [(1, 300), (6, 1)]
+    ((start, end),) = [val for num, val in fields if num == 2]
+    assert pb.Path.FromString(buf[start:end]).target == "t"